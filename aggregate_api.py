@@ -0,0 +1,246 @@
+# aggregate_api.py
+"""소재 확보 리스트 집계 JSON 정적 API (빌드 + 읽기 전용 HTTP 핸들러)
+
+협력 기관이 화면을 긁어 가는 대신 쓰도록, 리스트별 분류군·국명·학명 건수, 교차표, 분양 가능 여부 집계를
+api/<리스트>/<버전>.json 으로 미리 만들어 둔다 (gzip, brotli 모듈이 있으면 brotli 사본도 함께).
+버전은 집계 내용의 해시라서 내용이 같으면 파일을 다시 쓰지 않고, api/index.json 이 리스트별 현재 버전을 가리킨다.
+
+읽기는 serve_api()의 작은 HTTP 서버가 미리 만든 파일을 그대로 돌려준다 (Streamlit 런타임·집계 코드를 거치지 않음).
+  GET /index.json                   전체 목록과 리스트별 현재 버전
+  GET /<리스트>                      현재 버전 (ETag로 재검증, Cache-Control: no-cache)
+  GET /<리스트>/<버전>.json          고정 버전 (immutable)
+Accept-Encoding에 따라 br/gzip 사본을 고르고, If-None-Match가 ETag와 같으면 304를 돌려준다.
+"""
+import datetime
+import gzip
+import hashlib
+import json
+import os
+import pathlib
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from catalog import (CATALOG_FILES, COLUMN_KEYS, NO_SEARCH, clean_table, count_by, cross_counts, find_col,
+                     load_table)
+
+try:
+    import brotli
+except ImportError:  # brotli는 선택 사항: 없으면 gzip 사본만 만든다
+    brotli = None
+
+API_DIR = pathlib.Path(os.environ.get("DASHBOARD_API_DIR", "api"))
+SCHEMA = 1
+KEEP_VERSIONS = 5  # 리스트별로 남겨 둘 이전 버전 수 (현재 버전 포함)
+
+# URL에 쓰는 리스트 이름 (CATALOG_FILES 라벨 → 영문 슬러그)
+SLUGS = {"배양체 균류": "cultures", "유전자원 DNA": "dna", "천연물 추출물": "extracts"}
+
+CROSSES = (("분류군", "국명"), ("분류군", "학명"), ("국명", "학명"))
+VERSION_RE = re.compile(r"^[0-9a-f]{16}$")
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))  # 선호 순서
+
+
+# -----------------------------
+# 빌드
+# -----------------------------
+def _records(df) -> list[dict]:
+    return json.loads(df.to_json(orient="records", force_ascii=False))
+
+
+def collection_payload(label: str) -> dict:
+    """리스트 하나의 집계 (생성 시각 제외: 같은 데이터면 같은 내용)"""
+    path = CATALOG_FILES[label]
+    columns = load_table(path).columns
+    found = {key: find_col(columns, keys) for key, keys in COLUMN_KEYS.items()}
+    found = {key: col for key, col in found.items() if col is not None}
+    clean_cols = tuple(found.values())
+
+    total = len(clean_table(path, clean_cols))  # 전체 행 수 (컬럼별 건수는 빈 값을 빼고 셈)
+    counts = {}
+    for key in ("분류군", "국명", "학명"):
+        if key in found:
+            cnt, _ = count_by(path, clean_cols, NO_SEARCH, found[key])
+            counts[key] = _records(cnt)
+    crosstabs = {
+        f"{a}×{b}": _records(cross_counts(path, clean_cols, NO_SEARCH, (found[a], found[b])))
+        for a, b in CROSSES if a in found and b in found
+    }
+    availability = None
+    if "분양가능여부" in found:
+        avail_col = found["분양가능여부"]
+        cnt, _ = count_by(path, clean_cols, NO_SEARCH, avail_col)
+        availability = {"전체": _records(cnt)}
+        if "분류군" in found:
+            availability["분류군별"] = _records(
+                cross_counts(path, clean_cols, NO_SEARCH, (found["분류군"], avail_col)))
+    return {
+        "schema": SCHEMA,
+        "collection": label,
+        "source": pathlib.Path(path).name,
+        "columns": found,
+        "total": total,
+        "counts": counts,
+        "crosstabs": crosstabs,
+        "availability": availability,
+    }
+
+
+def _write_atomic(path: pathlib.Path, data: bytes):
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _prune(slug_dir: pathlib.Path, keep: list[str]):
+    for f in slug_dir.glob("*.json*"):
+        if f.name.split(".")[0] not in keep:
+            f.unlink(missing_ok=True)
+
+
+def build_aggregates(out_dir=API_DIR) -> dict:
+    """모든 리스트의 집계 파일을 만들고 index.json 갱신, index 내용 반환"""
+    out = pathlib.Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    index_path = out / "index.json"
+    old = json.loads(index_path.read_text(encoding="utf-8")) if index_path.exists() else {"collections": {}}
+    now = datetime.datetime.now().isoformat(timespec="seconds")
+
+    collections = {}
+    for label, slug in SLUGS.items():
+        if not pathlib.Path(CATALOG_FILES[label]).exists():
+            continue
+        body = json.dumps(collection_payload(label), ensure_ascii=False, separators=(",", ":"),
+                          sort_keys=True).encode("utf-8")
+        version = hashlib.blake2b(body, digest_size=8).hexdigest()
+        slug_dir = out / slug
+        slug_dir.mkdir(exist_ok=True)
+        target = slug_dir / f"{version}.json"
+        if not target.exists():
+            _write_atomic(slug_dir / f"{version}.json.gz", gzip.compress(body, 9, mtime=0))
+            if brotli is not None:
+                _write_atomic(slug_dir / f"{version}.json.br", brotli.compress(body, quality=11))
+            _write_atomic(target, body)  # 원본을 마지막에 써서, 원본이 있으면 압축 사본도 있음을 보장
+
+        prev = old["collections"].get(slug, {})
+        history = [version] + [v for v in prev.get("history", []) if v != version]
+        history = history[:KEEP_VERSIONS]
+        _prune(slug_dir, history)
+        collections[slug] = {
+            "label": label,
+            "version": version,
+            "path": f"{slug}/{version}.json",
+            "bytes": len(body),
+            "updated_at": now if prev.get("version") != version else prev.get("updated_at", now),
+            "history": history,
+        }
+
+    index = {"schema": SCHEMA, "generated_at": now, "collections": collections}
+    _write_atomic(index_path, json.dumps(index, ensure_ascii=False, indent=2).encode("utf-8"))
+    return index
+
+
+# -----------------------------
+# 읽기 전용 HTTP 핸들러
+# -----------------------------
+def _negotiate(accept: str, base: pathlib.Path) -> tuple[pathlib.Path, str | None]:
+    """Accept-Encoding에 맞는 사본 (q값이 높은 순, 같으면 br → gzip, q=0은 제외 → 없으면 원본)"""
+    weights = {}
+    for part in accept.split(","):
+        name, *params = [p.strip() for p in part.split(";")]
+        if not name:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name.lower()] = q
+    ranked = sorted(ENCODINGS, key=lambda enc: -weights.get(enc[0], weights.get("*", 0.0)))
+    for name, suffix in ranked:
+        candidate = base.with_name(base.name + suffix)
+        if weights.get(name, weights.get("*", 0.0)) > 0 and candidate.exists():
+            return candidate, name
+    return base, None
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    api_dir = API_DIR
+
+    def _resolve(self) -> tuple[pathlib.Path, str, bool] | None:
+        """요청 경로 → (파일, ETag 기본값, 고정 버전 여부), 없으면 None"""
+        parts = [p for p in self.path.split("?")[0].split("/") if p]
+        index_path = self.api_dir / "index.json"
+        if parts in ([], ["index.json"]):
+            if not index_path.exists():
+                return None
+            st_ = index_path.stat()
+            return index_path, f"index-{st_.st_mtime_ns:x}-{st_.st_size:x}", False
+        collections = json.loads(index_path.read_text(encoding="utf-8"))["collections"] if index_path.exists() else {}
+        slug = parts[0]
+        if slug not in collections:
+            return None
+        if len(parts) == 1:
+            version = collections[slug]["version"]
+            path = self.api_dir / slug / f"{version}.json"
+            return (path, version, False) if path.exists() else None  # 파일이 지워졌으면 404
+        if len(parts) == 2 and parts[1].endswith(".json") and VERSION_RE.match(parts[1][:-5]):
+            version = parts[1][:-5]
+            path = self.api_dir / slug / f"{version}.json"
+            return (path, version, True) if path.exists() else None
+        return None
+
+    def _respond(self, send_body: bool):
+        resolved = self._resolve()
+        if resolved is None:
+            self.send_error(404)
+            return
+        path, tag, immutable = resolved
+        path, encoding = _negotiate(self.headers.get("Accept-Encoding", ""), path)
+        etag = f'"{tag}-{encoding}"' if encoding else f'"{tag}"'
+
+        inm = self.headers.get("If-None-Match", "")
+        if etag in [t.strip() for t in inm.split(",")] or inm.strip() == "*":
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        body = path.read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Cache-Control", "public, max-age=31536000, immutable" if immutable else "no-cache")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def log_message(self, *args):  # 요청마다 stderr에 찍지 않음
+        pass
+
+
+def serve_api(addr: str = "127.0.0.1", port: int = 8600, api_dir=API_DIR, background: bool = False):
+    """api_dir의 집계 파일을 읽기 전용으로 제공 (background=True면 데몬 스레드에서 실행하고 서버 반환)"""
+    handler = type("BoundApiHandler", (ApiHandler,), {"api_dir": pathlib.Path(api_dir)})
+    server = ThreadingHTTPServer((addr, port), handler)
+    server.daemon_threads = True
+    if background:
+        threading.Thread(target=server.serve_forever, name="aggregate-api", daemon=True).start()
+        return server
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+    return server
@@ -2,30 +2,318 @@
 import sqlite3
 import datetime
 import pathlib
+import atexit
+import logging
+import queue
+import threading
+import time
+from collections import Counter, deque
 import streamlit as st
 import pandas as pd
 
+from metrics import SQLITE_WRITE, VISIT_QUEUE_DEPTH, start_render
+
 DB_PATH = pathlib.Path("게시판.db")
 
 
-def _init_db():
-    """visit_logs 테이블이 없으면 생성"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS visit_logs (
+# -----------------------------
+# 방문 로그 저장소: 월별 파티션 + 압축 보관
+#   visit_logs_YYYYMM  월별 테이블 (이번 달에만 기록)
+#   visit_logs         모든 월 파티션을 합친 뷰 (파티션이 바뀔 때 다시 만듦)
+#   log_archives       보관 기간이 지나 Parquet(zstd)로 옮긴 달의 요약 통계
+# -----------------------------
+LOG_PREFIX = "visit_logs_"
+ARCHIVE_DIR = pathlib.Path("log_archive")
+RETENTION_MONTHS = 3  # 이번 달 포함, 이 기간만 SQLite에 유지
+
+_LOG_COLUMNS = """
             id         INTEGER PRIMARY KEY AUTOINCREMENT,
             timestamp  TEXT NOT NULL,
             date       TEXT NOT NULL,
             page       TEXT NOT NULL,
             session_id TEXT
+"""
+
+
+def _partition_name(month: str) -> str:
+    """'2025-11' → 'visit_logs_202511'"""
+    return LOG_PREFIX + month.replace("-", "")
+
+
+def _partition_month(name: str) -> str:
+    """'visit_logs_202511' → '2025-11'"""
+    ym = name[len(LOG_PREFIX):]
+    return f"{ym[:4]}-{ym[4:]}"
+
+
+def partitions(conn) -> list[str]:
+    """월 파티션 테이블 이름 (오래된 달부터)"""
+    rows = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' "
+        "AND name GLOB 'visit_logs_[0-9][0-9][0-9][0-9][0-9][0-9]' ORDER BY name"
+    ).fetchall()
+    return [r[0] for r in rows]
+
+
+def _refresh_view(conn):
+    """visit_logs 뷰를 현재 파티션 목록으로 다시 만듦"""
+    parts = partitions(conn)
+    body = " UNION ALL ".join(f"SELECT id, timestamp, date, page, session_id FROM {p}" for p in parts)
+    conn.execute("DROP VIEW IF EXISTS visit_logs")
+    conn.execute(f"CREATE VIEW visit_logs AS {body}" if body else
+                 "CREATE VIEW visit_logs AS SELECT NULL AS id, NULL AS timestamp, NULL AS date, "
+                 "NULL AS page, NULL AS session_id WHERE 0")
+
+
+def index_partition(conn, name: str):
+    """파티션 인덱스: 날짜 범위, 시각순 페이지 조회(timestamp / page, timestamp), 세션별 경로"""
+    conn.execute(f"CREATE INDEX IF NOT EXISTS {name}_date ON {name}(date)")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS {name}_ts ON {name}(timestamp)")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS {name}_page ON {name}(page, timestamp)")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS {name}_session ON {name}(session_id, timestamp)")
+
+
+def last_log_id(conn) -> int:
+    """월 파티션·보관분 전체에서 가장 큰 로그 id"""
+    return max(
+        conn.execute("SELECT COALESCE(MAX(seq), 0) FROM sqlite_sequence WHERE name GLOB 'visit_logs*'").fetchone()[0],
+        conn.execute("SELECT COALESCE(MAX(max_id), 0) FROM log_archives").fetchone()[0],
+    )
+
+
+def insert_visits(rows):
+    """(timestamp, date, page, session_id) 행들을 월 파티션에 한 트랜잭션으로 기록
+
+    id는 파티션마다 따로 매기지 않고 전체에서 이어지는 번호를 직접 부여한다
+    (월 경계에 이전 달 행이 늦게 들어와도 id 순서 = 기록 순서 → 증분 집계 기준으로 사용).
+    """
+    by_month = {}
+    for row in rows:
+        by_month.setdefault(row[1][:7], []).append(tuple(row))
+    conn = init_db()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        for month in sorted(by_month):
+            _create_partition(conn, month)
+        next_id = last_log_id(conn) + 1
+        for month in sorted(by_month):
+            batch = by_month[month]
+            conn.executemany(
+                f"INSERT INTO {_partition_name(month)} (id, timestamp, date, page, session_id) VALUES (?, ?, ?, ?, ?)",
+                [(next_id + i,) + row for i, row in enumerate(batch)],
+            )
+            next_id += len(batch)
+        conn.execute("COMMIT")
+    except Exception:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+
+def _create_partition(conn, month: str) -> str:
+    """월 파티션 생성 (id는 기존 파티션·보관분 다음 번호부터 이어짐). 트랜잭션 안에서 호출"""
+    name = _partition_name(month)
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)).fetchone():
+        return name
+    conn.execute(f"CREATE TABLE {name} ({_LOG_COLUMNS})")
+    index_partition(conn, name)
+    last_id = last_log_id(conn)
+    if last_id:
+        conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (name, last_id))
+    _refresh_view(conn)
+    return name
+
+
+def _migrate_legacy(conn):
+    """예전 단일 visit_logs 테이블을 월별 파티션으로 옮기고 뷰로 교체"""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        legacy = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'visit_logs'"
+        ).fetchone()
+        if legacy:
+            months = [r[0] for r in conn.execute("SELECT DISTINCT substr(date, 1, 7) FROM visit_logs")]
+            for month in months:
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {_partition_name(month)} ({_LOG_COLUMNS})")
+                index_partition(conn, _partition_name(month))
+                conn.execute(
+                    f"INSERT INTO {_partition_name(month)} (id, timestamp, date, page, session_id) "
+                    "SELECT id, timestamp, date, page, session_id FROM visit_logs "
+                    "WHERE substr(date, 1, 7) = ? ORDER BY id",
+                    (month,),
+                )
+            # 빈 달 파티션도 예전 id 다음 번호부터 시작하도록 시퀀스 유지
+            last_id = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM sqlite_sequence "
+                                   "WHERE name = 'visit_logs'").fetchone()[0]
+            conn.execute("DROP TABLE visit_logs")
+            for p in partitions(conn):
+                conn.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (last_id, p))
+            _refresh_view(conn)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def init_db(month: str | None = None):
+    """로그 저장소 준비: 보관 요약 테이블, 이번(month) 달 파티션, 통합 뷰 (autocommit 연결 반환)"""
+    conn = sqlite3.connect(DB_PATH, isolation_level=None)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS log_archives (
+            month       TEXT PRIMARY KEY,
+            path        TEXT NOT NULL,
+            rows        INTEGER NOT NULL,
+            sessions    INTEGER NOT NULL,
+            first_ts    TEXT,
+            last_ts     TEXT,
+            max_id      INTEGER,
+            page_views  TEXT,
+            bytes       INTEGER,
+            archived_at TEXT NOT NULL
         )
         """
     )
-    conn.commit()
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'visit_logs'").fetchone():
+        _migrate_legacy(conn)
+    month = month or datetime.date.today().isoformat()[:7]
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                        (_partition_name(month),)).fetchone():
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            _create_partition(conn, month)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    elif not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'view' AND name = 'visit_logs'").fetchone():
+        _refresh_view(conn)
     return conn
 
 
+# -----------------------------
+# 실시간 현황: 최근 방문 이벤트 링 버퍼 (프로세스 메모리, SQLite 조회 없음)
+# -----------------------------
+class RecentVisits:
+    """최근 방문 이벤트 고정 크기 링 버퍼 + 분 단위 페이지별 조회수 카운터
+
+    - events: 최근 capacity개 (시각, 페이지, 세션) — 오래된 것부터 밀려남
+    - 분 카운터: minutes개 슬롯을 (분 % minutes) 위치에 재사용
+    """
+
+    def __init__(self, capacity: int = 5000, minutes: int = 60):
+        self.minutes = minutes
+        self._events = deque(maxlen=capacity)
+        self._slot_minute = [None] * minutes
+        self._slot_counts = [Counter() for _ in range(minutes)]
+        self._lock = threading.Lock()
+
+    def add(self, ts: float, page: str, session_id: str):
+        minute = int(ts // 60)
+        slot = minute % self.minutes
+        with self._lock:
+            self._events.append((ts, page, session_id))
+            if self._slot_minute[slot] != minute:  # 한 바퀴 돌아온 슬롯은 비우고 재사용
+                self._slot_minute[slot] = minute
+                self._slot_counts[slot] = Counter()
+            self._slot_counts[slot][page] += 1
+
+    def __len__(self):
+        return len(self._events)
+
+    def active_sessions(self, window_s: int = 300, now: float | None = None) -> int:
+        """최근 window_s초 안에 방문한 세션 수"""
+        since = (now or time.time()) - window_s
+        with self._lock:
+            return len({sid for ts, _, sid in reversed(self._events) if ts >= since} - {None})
+
+    def views_per_minute(self, last: int = 30, now: float | None = None) -> pd.DataFrame:
+        """최근 last분(이번 분 포함)의 분·페이지별 조회수 (방문 없는 분은 0)"""
+        now_min = int((now or time.time()) // 60)
+        last = min(last, self.minutes)
+        rows, pages = [], set()
+        with self._lock:
+            for m in range(now_min - last + 1, now_min + 1):
+                slot = m % self.minutes
+                counts = self._slot_counts[slot] if self._slot_minute[slot] == m else {}
+                rows.append((m, dict(counts)))
+                pages.update(counts)
+        records = [
+            (datetime.datetime.fromtimestamp(m * 60), page, counts.get(page, 0))
+            for m, counts in rows for page in sorted(pages)
+        ]
+        return pd.DataFrame(records, columns=["minute", "page", "views"])
+
+
+@st.cache_resource(show_spinner=False)
+def recent_visits() -> RecentVisits:
+    """프로세스 공용 링 버퍼 (모든 세션이 같은 객체에 기록)"""
+    return RecentVisits()
+
+
+# -----------------------------
+# 방문 로그 기록 큐: 페이지는 큐에 넣기만 하고, 기록 스레드 하나가 묶어서 SQLite에 씀
+# -----------------------------
+_log = logging.getLogger(__name__)
+
+
+class VisitWriter:
+    """방문 로그 (timestamp, date, page, session_id) 행을 모아 insert_visits로 한 번에 기록"""
+
+    def __init__(self, batch_max: int = 500):
+        self.batch_max = batch_max
+        self.queue = queue.Queue()
+        threading.Thread(target=self._run, name="visit-log-writer", daemon=True).start()
+        atexit.register(self.flush)
+
+    def put(self, row: tuple):
+        self.queue.put(row)
+
+    def _write(self, rows):
+        from rollups import update_rollups  # rollups가 analytics를 import하므로 여기서
+
+        with SQLITE_WRITE.time(op="visit_log"):
+            insert_visits(rows)
+        # 방금 기록한 행을 증분 집계에 반영 (관리자 화면의 조회 함수는 집계 테이블을 읽기만 함)
+        try:
+            update_rollups()
+        except Exception:
+            _log.exception("failed to update visit rollups")
+
+    def _run(self):
+        while True:
+            rows = [self.queue.get()]
+            while len(rows) < self.batch_max:
+                try:
+                    rows.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write(rows)
+            except Exception:  # 기록 실패는 페이지 표시를 막지 않도록 로그만 남김
+                _log.exception("failed to write %d visit log rows", len(rows))
+            finally:
+                for _ in rows:
+                    self.queue.task_done()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """대기 중인 로그가 모두 기록될 때까지 최대 timeout초 기다림"""
+        deadline = time.monotonic() + timeout
+        while self.queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return not self.queue.unfinished_tasks
+
+
+@st.cache_resource(show_spinner=False)
+def visit_writer() -> VisitWriter:
+    """프로세스 공용 방문 로그 기록기"""
+    writer = VisitWriter()
+    VISIT_QUEUE_DEPTH.fn = writer.queue.qsize
+    return writer
+
+
 def init_session():
     """세션 ID가 없으면 하나 만들어둠"""
     if "session_id" not in st.session_state:
@@ -34,29 +322,200 @@ def init_session():
 
 
 def log_visit(page_name: str):
-    """각 페이지에서 호출해서 방문 기록 남김"""
+    """각 페이지에서 호출해서 방문 기록 남김 (기록 큐 → 이번 달 파티션), 페이지 실행 시간 측정 시작"""
+    start_render(page_name)
     init_session()
-    conn = _init_db()
 
     now = datetime.datetime.now()
     ts = now.isoformat()
     d = now.date().isoformat()
     sid = st.session_state["session_id"]
 
-    conn.execute(
-        "INSERT INTO visit_logs (timestamp, date, page, session_id) VALUES (?, ?, ?, ?)",
-        (ts, d, page_name, sid),
-    )
-    conn.commit()
-    conn.close()
+    visit_writer().put((ts, d, page_name, sid))
+    recent_visits().add(now.timestamp(), page_name, sid)
+
+
+def _month_in_range(month: str, start_date: str | None, end_date: str | None) -> bool:
+    return (start_date is None or month >= start_date[:7]) and (end_date is None or month <= end_date[:7])
+
+
+def _read_archive(path: str, start_date: str | None, end_date: str | None) -> pd.DataFrame:
+    """보관 파일에서 기간 행만 읽기 (Parquet 행 그룹 통계로 건너뜀)"""
+    import pyarrow.parquet as pq
 
+    filters = [("date", op, v) for op, v in ((">=", start_date), ("<=", end_date)) if v is not None]
+    return pq.read_table(path, filters=filters or None).to_pandas()
 
-def load_logs() -> pd.DataFrame:
-    """관리자 페이지에서 전체 로그 불러오기"""
-    conn = _init_db()
-    df = pd.read_sql_query("SELECT * FROM visit_logs", conn)
+
+def load_logs(start_date: str | None = None, end_date: str | None = None) -> pd.DataFrame:
+    """방문 로그 불러오기 (기간 지정 시 해당 월 파티션·보관 파일만 읽음)"""
+    conn = init_db()
+    parts = [p for p in partitions(conn) if _month_in_range(_partition_month(p), start_date, end_date)]
+    archives = conn.execute("SELECT month, path FROM log_archives ORDER BY month").fetchall()
+
+    where, params = [], []
+    if start_date is not None:
+        where.append("date >= ?")
+    if end_date is not None:
+        where.append("date <= ?")
+    cond = f" WHERE {' AND '.join(where)}" if where else ""
+    frames = [
+        _read_archive(path, start_date, end_date)
+        for month, path in archives
+        if _month_in_range(month, start_date, end_date) and pathlib.Path(path).exists()
+    ]
+    if parts:
+        params = [v for v in (start_date, end_date) if v is not None] * len(parts)
+        sql = " UNION ALL ".join(f"SELECT * FROM {p}{cond}" for p in parts)
+        frames.append(pd.read_sql_query(sql, conn, params=params))
     conn.close()
 
-    if not df.empty:
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame(columns=["id", "timestamp", "date", "page", "session_id"])
+    df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    df["timestamp"] = pd.to_datetime(df["timestamp"], format="ISO8601")
     return df
+
+
+def log_page(start_date: str, end_date: str, page: str | None = None, session_id: str | None = None,
+             before: tuple | None = None, limit: int = 50) -> pd.DataFrame:
+    """원시 로그 한 페이지 (최신순, SQLite 월 파티션만)
+
+    before=(timestamp, id)이면 그보다 오래된 행부터 (키셋 페이지네이션: OFFSET 없이 인덱스에서 바로 시작).
+    월 파티션을 최신 달부터 차례로 읽고 limit개가 차면 멈추므로 페이지마다 비용이 일정하다.
+    """
+    conn = init_db()
+    parts = [p for p in partitions(conn) if _month_in_range(_partition_month(p), start_date, end_date)]
+    where = ["timestamp >= ?", "timestamp < ?"]
+    params = [start_date, end_date + "T99"]  # 종료일 하루 전체 포함
+    if page:
+        where.append("page = ?")
+        params.append(page)
+    if session_id:
+        where.append("session_id = ?")
+        params.append(session_id)
+    if before is not None:
+        where.append("(timestamp, id) < (?, ?)")
+        params += list(before)
+    frames, remaining = [], limit
+    for p in sorted(parts, reverse=True):
+        df = pd.read_sql_query(
+            f"SELECT * FROM {p} WHERE {' AND '.join(where)} ORDER BY timestamp DESC, id DESC LIMIT ?",
+            conn,
+            params=params + [remaining],
+        )
+        if not df.empty:
+            frames.append(df)
+            remaining -= len(df)
+        if remaining <= 0:
+            break
+    conn.close()
+    if not frames:
+        return pd.DataFrame(columns=["id", "timestamp", "date", "page", "session_id"])
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+
+def log_date_range() -> tuple:
+    """로그의 최초/최종 날짜 (월 파티션과 보관 요약만 조회)"""
+    conn = init_db()
+    first, last = conn.execute("SELECT MIN(date), MAX(date) FROM visit_logs").fetchone()
+    a_first, a_last = conn.execute("SELECT MIN(first_ts), MAX(last_ts) FROM log_archives").fetchone()
+    conn.close()
+    firsts = [v for v in (first, a_first and a_first[:10]) if v]
+    lasts = [v for v in (last, a_last and a_last[:10]) if v]
+    return (min(firsts) if firsts else None), (max(lasts) if lasts else None)
+
+
+# -----------------------------
+# 압축 보관 (보관 기간이 지난 월 파티션 → Parquet)
+# -----------------------------
+def _shift_month(month: str, delta: int) -> str:
+    y, m = map(int, month.split("-"))
+    y, m = divmod(y * 12 + (m - 1) + delta, 12)
+    return f"{y:04d}-{m + 1:02d}"
+
+
+def compact_logs(retention_months: int = RETENTION_MONTHS, archive_dir=ARCHIVE_DIR, today=None) -> list[dict]:
+    """보관 기간(이번 달 포함 retention_months개월)이 지난 월 파티션을 압축 보관 후 삭제
+
+    파티션을 zstd 압축 Parquet(컬럼별 최소/최대 통계 포함)으로 쓰고, 행 수·세션 수·기간·
+    페이지별 조회수 요약을 log_archives에 남긴 뒤 테이블을 지운다. 보관한 달의 요약 목록을 반환.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from rollups import update_rollups
+
+    update_rollups()  # 지우기 전에 아직 집계하지 않은 행을 증분 집계에 반영
+    retention_months = max(1, int(retention_months))
+    today = today or datetime.date.today()
+    cutoff = _shift_month(today.isoformat()[:7], -(retention_months - 1))
+    archive_dir = pathlib.Path(archive_dir)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+
+    conn = init_db()
+    done = []
+    for part in partitions(conn):
+        month = _partition_month(part)
+        if month >= cutoff:
+            continue
+        df = pd.read_sql_query(f"SELECT * FROM {part} ORDER BY id", conn)
+        n_read = len(df)
+        prev = conn.execute("SELECT path FROM log_archives WHERE month = ?", (month,)).fetchone()
+        if prev and pathlib.Path(prev[0]).exists():  # 같은 달을 다시 보관하면 기존 파일과 합침
+            df = pd.concat([pq.read_table(prev[0]).to_pandas(), df], ignore_index=True)
+
+        path = archive_dir / f"{part}.parquet"
+        tmp = path.with_suffix(".parquet.tmp")
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp,
+                       compression="zstd", write_statistics=True)
+        tmp.replace(path)
+
+        summary = {
+            "month": month,
+            "path": path.as_posix(),
+            "rows": len(df),
+            "sessions": int(df["session_id"].nunique()),
+            "first_ts": df["timestamp"].min() if len(df) else None,
+            "last_ts": df["timestamp"].max() if len(df) else None,
+            "max_id": int(df["id"].max()) if len(df) else None,
+            "page_views": df["page"].value_counts().to_json(force_ascii=False),
+            "bytes": path.stat().st_size,
+            "archived_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        }
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 보관 파일을 쓰는 동안 새 행이 들어왔으면 이번에는 건너뜀
+            if conn.execute(f"SELECT COUNT(*) FROM {part}").fetchone()[0] != n_read:
+                conn.execute("ROLLBACK")
+                continue
+            conn.execute(
+                "INSERT OR REPLACE INTO log_archives VALUES (:month, :path, :rows, :sessions, :first_ts, "
+                ":last_ts, :max_id, :page_views, :bytes, :archived_at)",
+                summary,
+            )
+            conn.execute(f"DROP TABLE {part}")
+            _refresh_view(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        done.append(summary)
+    conn.close()
+    return done
+
+
+def log_storage_status() -> tuple[pd.DataFrame, pd.DataFrame]:
+    """(월 파티션별 행 수, 보관된 달 요약) — 관리자 화면용"""
+    conn = init_db()
+    parts = pd.DataFrame(
+        [(_partition_month(p), conn.execute(f"SELECT COUNT(*) FROM {p}").fetchone()[0]) for p in partitions(conn)],
+        columns=["월", "행 수"],
+    )
+    archives = pd.read_sql_query(
+        'SELECT month AS 월, rows AS "행 수", sessions AS "세션 수", first_ts AS 시작, last_ts AS 종료, '
+        'bytes AS "파일 크기(bytes)", path AS 파일 FROM log_archives ORDER BY month',
+        conn,
+    )
+    conn.close()
+    return parts, archives
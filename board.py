@@ -0,0 +1,258 @@
+# board.py
+"""건의사항 게시판 저장소 (게시판.db의 posts 테이블)
+
+답변·댓글은 comments 테이블에 두고, 글 목록에는 posts.comment_count(비정규화 카운터)만 보여 준다.
+목록 조회는 comments를 조인하거나 본문을 읽지 않으며, 스레드 본문은 펼칠 때 페이지 단위로 읽는다.
+
+관리자 일괄 처리(상태 변경·삭제)는 apply_changes 한 번으로 한 트랜잭션 안에서 executemany로 반영한다.
+각 글에는 version이 있어, 목록을 읽은 뒤 다른 관리자가 먼저 바꾼 글은 덮어쓰지 않고 충돌로 돌려준다.
+"""
+import datetime
+import pathlib
+import sqlite3
+
+import pandas as pd
+
+from metrics import SQLITE_WRITE
+
+DB_PATH = pathlib.Path("게시판.db")
+ADMIN_PASSWORD = "hnibr1234"  # 관리자 대시보드·게시판 관리자 모드 공용
+STATUSES = ("답변대기", "답변완료")
+LIST_COLUMNS = ["번호", "제목", "작성자", "작성일", "상태", "댓글", "버전"]
+COMMENT_COLUMNS = ["id", "작성자", "내용", "작성일시", "답변"]
+
+
+def _init_db():
+    """posts·comments 테이블 준비 (예전 형식(author, content, timestamp)이면 제목·상태·버전·댓글 수 컬럼 추가)"""
+    conn = sqlite3.connect(DB_PATH, isolation_level=None)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS posts (
+            id        INTEGER PRIMARY KEY AUTOINCREMENT,
+            author    TEXT NOT NULL,
+            content   TEXT NOT NULL,
+            timestamp TEXT NOT NULL
+        )
+        """
+    )
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(posts)")}
+    for name, ddl in (
+        ("title", "title TEXT NOT NULL DEFAULT ''"),
+        ("status", f"status TEXT NOT NULL DEFAULT '{STATUSES[0]}'"),
+        ("version", "version INTEGER NOT NULL DEFAULT 1"),
+        ("comment_count", "comment_count INTEGER NOT NULL DEFAULT 0"),
+    ):
+        if name not in cols:
+            conn.execute(f"ALTER TABLE posts ADD COLUMN {ddl}")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS comments (
+            id        INTEGER PRIMARY KEY AUTOINCREMENT,
+            post_id   INTEGER NOT NULL,
+            author    TEXT NOT NULL,
+            body      TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            is_answer INTEGER NOT NULL DEFAULT 0
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS comments_post ON comments(post_id, id)")
+    return conn
+
+
+def _search_clause(query: str) -> tuple[str, list]:
+    query = query.strip()
+    if not query:
+        return "", []
+    pattern = f"%{query}%"
+    return " WHERE title LIKE ? OR author LIKE ?", [pattern, pattern]
+
+
+# -----------------------------
+# 조회 / 작성
+# -----------------------------
+def count_posts(query: str = "") -> int:
+    """전체 글 수 (제목·작성자 검색 포함)"""
+    where, params = _search_clause(query)
+    conn = _init_db()
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM posts{where}", params).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def list_posts(limit: int, offset: int, query: str = "") -> pd.DataFrame:
+    """최신 글부터 한 페이지 (번호, 제목, 작성자, 작성일, 상태, 댓글 수, 버전) — 본문·댓글은 읽지 않음"""
+    where, params = _search_clause(query)
+    conn = _init_db()
+    try:
+        df = pd.read_sql_query(
+            f"""
+            SELECT id AS 번호, title AS 제목, author AS 작성자,
+                   replace(substr(timestamp, 1, 10), '-', '.') AS 작성일, status AS 상태,
+                   comment_count AS 댓글, version AS 버전
+            FROM posts{where} ORDER BY id DESC LIMIT ? OFFSET ?
+            """,
+            conn,
+            params=params + [limit, offset],
+        )
+    finally:
+        conn.close()
+    return df if not df.empty else pd.DataFrame(columns=LIST_COLUMNS)
+
+
+def add_post(author: str, title: str, content: str) -> int:
+    """글 등록 후 번호 반환"""
+    conn = _init_db()
+    try:
+        with SQLITE_WRITE.time(op="board_post"):
+            cur = conn.execute(
+                "INSERT INTO posts (author, title, content, timestamp, status) VALUES (?, ?, ?, ?, ?)",
+                (author, title, content, datetime.datetime.now().isoformat(), STATUSES[0]),
+            )
+        return cur.lastrowid
+    finally:
+        conn.close()
+
+
+def get_post(post_id: int) -> dict | None:
+    """글 하나의 본문 (스레드를 펼칠 때만 호출)"""
+    conn = _init_db()
+    try:
+        row = conn.execute(
+            "SELECT id, title, author, content, timestamp, status, comment_count FROM posts WHERE id = ?",
+            (post_id,),
+        ).fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        return None
+    keys = ("번호", "제목", "작성자", "내용", "작성일시", "상태", "댓글")
+    return dict(zip(keys, row))
+
+
+# -----------------------------
+# 답변·댓글 스레드
+# -----------------------------
+def list_comments(post_id: int, limit: int = 20, after_id: int = 0) -> pd.DataFrame:
+    """글의 댓글을 오래된 순으로 limit개 (after_id 이후부터: 키셋 페이지네이션, (post_id, id) 인덱스 사용)"""
+    conn = _init_db()
+    try:
+        df = pd.read_sql_query(
+            """
+            SELECT id, author AS 작성자, body AS 내용, timestamp AS 작성일시, is_answer AS 답변
+            FROM comments WHERE post_id = ? AND id > ? ORDER BY id LIMIT ?
+            """,
+            conn,
+            params=(post_id, after_id, limit),
+        )
+    finally:
+        conn.close()
+    if df.empty:
+        return pd.DataFrame(columns=COMMENT_COLUMNS)
+    df["답변"] = df["답변"].astype(bool)
+    return df
+
+
+def add_comment(post_id: int, author: str, body: str, is_answer: bool = False) -> int | None:
+    """댓글(관리자 답변이면 is_answer) 등록 후 id 반환, 글이 없으면 None
+
+    댓글 수 카운터 증가를 같은 트랜잭션에서 처리한다. 답변이면 글 상태를 답변완료로 바꾸고 버전을 올린다
+    (목록을 먼저 읽어 둔 관리자의 일괄 처리가 이 변경을 덮어쓰지 않도록).
+    """
+    conn = _init_db()
+    try:
+        with SQLITE_WRITE.time(op="board_comment"):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if is_answer:
+                    cur = conn.execute(
+                        "UPDATE posts SET comment_count = comment_count + 1, status = ?, version = version + 1 "
+                        "WHERE id = ?",
+                        (STATUSES[1], post_id),
+                    )
+                else:
+                    cur = conn.execute("UPDATE posts SET comment_count = comment_count + 1 WHERE id = ?", (post_id,))
+                if cur.rowcount == 0:
+                    conn.execute("ROLLBACK")
+                    return None
+                cur = conn.execute(
+                    "INSERT INTO comments (post_id, author, body, timestamp, is_answer) VALUES (?, ?, ?, ?, ?)",
+                    (post_id, author, body, datetime.datetime.now().isoformat(), int(is_answer)),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return cur.lastrowid
+    finally:
+        conn.close()
+
+
+# -----------------------------
+# 관리자 일괄 처리
+# -----------------------------
+def apply_changes(status: dict[int, tuple[str, int]], deletes: dict[int, int]) -> dict:
+    """상태 변경 {번호: (새 상태, 읽은 버전)}과 삭제 {번호: 읽은 버전}을 한 트랜잭션으로 반영
+
+    읽은 버전과 현재 버전이 다른 글(다른 관리자가 먼저 변경·삭제)은 건너뛰고 conflicts로 돌려준다.
+    같은 글에 상태 변경과 삭제가 함께 있으면 삭제만 적용한다.
+    반환: {"updated": 수, "deleted": 수, "conflicts": [번호, ...]}
+    """
+    status = {pid: v for pid, v in status.items() if pid not in deletes}
+    bad = [s for s, _ in status.values() if s not in STATUSES]
+    if bad:
+        raise ValueError(f"알 수 없는 상태: {', '.join(map(str, bad))}")
+    expected = {pid: ver for pid, (_, ver) in status.items()} | dict(deletes)
+    if not expected:
+        return {"updated": 0, "deleted": 0, "conflicts": []}
+
+    conn = _init_db()
+    try:
+        with SQLITE_WRITE.time(op="board_moderate"):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # 쓰기 잠금을 잡은 뒤 현재 버전을 한 번에 읽어 충돌 판정 (이후 커밋까지 다른 쓰기 없음)
+                conn.execute("CREATE TEMP TABLE IF NOT EXISTS picked (id INTEGER PRIMARY KEY)")
+                conn.execute("DELETE FROM temp.picked")
+                conn.executemany("INSERT INTO temp.picked (id) VALUES (?)", [(pid,) for pid in expected])
+                current = dict(conn.execute("SELECT id, version FROM posts WHERE id IN (SELECT id FROM temp.picked)"))
+                conflicts = sorted(pid for pid, ver in expected.items() if current.get(pid) != ver)
+                ok = set(expected) - set(conflicts)
+
+                conn.executemany(
+                    "UPDATE posts SET status = ?, version = version + 1 WHERE id = ? AND version = ?",
+                    [(s, pid, ver) for pid, (s, ver) in status.items() if pid in ok],
+                )
+                deleted = [(pid, ver) for pid, ver in deletes.items() if pid in ok]
+                conn.executemany("DELETE FROM posts WHERE id = ? AND version = ?", deleted)
+                conn.executemany("DELETE FROM comments WHERE post_id = ?", [(pid,) for pid, _ in deleted])
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return {
+            "updated": sum(pid in ok for pid in status),
+            "deleted": sum(pid in ok for pid in deletes),
+            "conflicts": conflicts,
+        }
+    finally:
+        conn.close()
+
+
+def editor_changes(shown: pd.DataFrame, edited_rows: dict) -> tuple[dict, dict]:
+    """st.data_editor의 edited_rows({행 위치: {컬럼: 값}}) → apply_changes 인자
+
+    shown은 편집기에 넘긴 표(번호·버전 포함)와 같은 행 순서여야 한다.
+    """
+    ids = shown["번호"].to_numpy()
+    versions = shown["버전"].to_numpy()
+    old_status = shown["상태"].to_numpy()
+    status, deletes = {}, {}
+    for pos, change in edited_rows.items():
+        pid, ver = int(ids[int(pos)]), int(versions[int(pos)])
+        if change.get("선택"):
+            deletes[pid] = ver
+        if "상태" in change and change["상태"] != old_status[int(pos)]:
+            status[pid] = (change["상태"], ver)
+    return status, deletes
@@ -0,0 +1,486 @@
+# cache_store.py
+"""카탈로그 로더·집계 결과(DataFrame) 캐시 백엔드
+
+- memory (기본): 프로세스 메모리에 보관
+- disk: DASHBOARD_CACHE_DIR 환경변수로 지정한 디렉터리에 Arrow IPC 파일로 보관.
+  같은 디렉터리를 쓰는 여러 Streamlit 프로세스가 결과를 공유하고, 각 프로세스는
+  파일을 메모리 매핑(mmap)해 읽으므로 OS 페이지 캐시의 같은 사본을 함께 쓴다.
+
+디스크 구조 (내용 주소 지정):
+    objects/<해시 앞 2자리>/<내용 sha256>.arrow   결과 데이터 (같은 내용은 한 번만 저장)
+    refs/<키 sha256>                              호출 키 → 내용 해시
+    locks/<키 sha256>.lock                        키별 계산 잠금 (프로세스 간 중복 계산 방지)
+
+캐시 키는 함수 이름, 코드 지문, 인자, 그리고 @cached(paths=...)로 지정한 경로 인자 파일의 수정시각·크기로 만든다.
+코드 지문은 CACHE_SCHEMA와 함수가 정의된 모듈 및 CODE_FILES(로더·집계 모듈) 소스의 해시다.
+따라서 데이터 파일이나 코드(상수·호출하는 함수 포함)가 바뀌면 배포 후에도 자동으로 새 키가 된다.
+검색어 같은 다른 문자열 인자는 stat하지 않는다.
+
+메모리에 올라와 있는 DataFrame은 두 백엔드 모두 ResidentSet(크기 기반 LRU)이 관리한다.
+전체 메모리 예산(DASHBOARD_CACHE_BUDGET_MB, 기본 512MB)을 넘으면 가장 오래 안 쓴 항목부터
+내보낸다. memory 백엔드는 다음 요청 때 다시 계산하고, disk 백엔드는 파일을 다시 매핑한다.
+사용량은 컬럼 버퍼 단위로 세므로 load_table·clean_table·search_rows가 함께 쓰는 컬럼은 한 번만 센다.
+
+disk 백엔드는 하루에 한 번(프로세스 시작 시 확인) DASHBOARD_CACHE_MAX_AGE_DAYS(기본 7일) 동안 쓰이지 않은
+refs와, 어떤 ref도 가리키지 않는 objects를 지운다 (DiskStore.prune).
+"""
+import contextlib
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from metrics import CACHE_COMPUTE, CACHE_REQUESTS
+
+CACHE_DIR_ENV = "DASHBOARD_CACHE_DIR"
+BUDGET_ENV = "DASHBOARD_CACHE_BUDGET_MB"
+DEFAULT_BUDGET_MB = 512
+MAX_AGE_ENV = "DASHBOARD_CACHE_MAX_AGE_DAYS"
+DEFAULT_MAX_AGE_DAYS = 7
+GC_INTERVAL_S = 24 * 3600  # disk 캐시 정리 주기 (여러 프로세스가 gc.stamp 파일로 공유)
+GC_GRACE_S = 3600  # 이보다 최근에 쓴 파일은 참조가 없어도 남김 (쓰는 중인 put과 겹치지 않도록)
+REF_TOUCH_S = 24 * 3600  # ref 사용 시각(mtime)은 이 간격으로만 갱신
+MB = 1024 * 1024
+CACHE_SCHEMA = 1  # 소스 해시로 잡히지 않는 결과 변경(의존 패키지 동작 등) 때 올림
+# 캐시 함수가 정의되거나 호출하는 모듈 — 이 중 하나라도 바뀌면 모든 캐시 키가 바뀜
+CODE_FILES = ("cache_store.py", "catalog.py", "csv_ingest.py", "fuzzy.py", "quality.py", "regional.py",
+              "snapshots.py")
+
+_log = logging.getLogger(__name__)
+
+try:  # POSIX
+    import fcntl
+
+    def _lock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+except ImportError:  # Windows
+    import msvcrt
+
+    def _lock_file(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _unlock_file(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _file_stamp(arg):
+    """경로 인자 파일의 (수정시각, 크기), 파일이 없으면 None"""
+    if isinstance(arg, (str, os.PathLike)) and arg:
+        try:
+            st_ = os.stat(arg)
+        except (OSError, ValueError):
+            return None
+        return (st_.st_mtime_ns, st_.st_size)
+    return None
+
+
+@functools.cache
+def code_fingerprint(fn) -> str:
+    """CACHE_SCHEMA + fn이 정의된 모듈과 CODE_FILES 소스의 해시 (프로세스마다 한 번 계산)
+
+    바이트코드(co_code)만으로는 상수·모듈 상수·호출하는 함수의 변경을 알 수 없으므로 소스 파일 전체를 쓴다.
+    """
+    files = {Path(__file__).with_name(name) for name in CODE_FILES} | {Path(fn.__code__.co_filename)}
+    h = hashlib.sha256(f"schema={CACHE_SCHEMA}".encode())
+    for path in sorted(files, key=lambda p: p.name):
+        h.update(path.name.encode("utf-8"))
+        try:
+            h.update(path.read_bytes())
+        except OSError:  # 소스 없이 배포된 모듈 등
+            h.update(b"-")
+    h.update(fn.__code__.co_code)
+    return h.hexdigest()[:16]
+
+
+def make_key(fn, args, path_positions=()) -> str:
+    """함수 이름·코드 지문·인자 + path_positions 위치 인자 파일의 수정시각·크기로 만든 키"""
+    stamps = [_file_stamp(args[i]) for i in path_positions if i < len(args)]
+    raw = repr((fn.__module__, fn.__qualname__, code_fingerprint(fn), args, stamps))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _array_buffers(arr, out: dict):
+    """배열이 쓰는 메모리 버퍼 {주소: 바이트} (같은 버퍼를 가리키는 컬럼은 같은 주소)"""
+    if isinstance(arr, pd.Categorical):
+        _array_buffers(arr.codes, out)
+        _array_buffers(arr.categories.array, out)
+        return
+    if isinstance(arr, pd.arrays.ArrowExtensionArray):
+        for chunk in arr.__arrow_array__().chunks:  # 복사 없이 내부 Arrow 배열
+            for buf in chunk.buffers():
+                if buf is not None:
+                    out[buf.address] = max(out.get(buf.address, 0), buf.size)
+        return
+    data = arr if isinstance(arr, np.ndarray) else getattr(arr, "_ndarray", None)
+    if data is None:  # 그 밖의 확장 배열(Int64 등): 공유 여부를 알 수 없으므로 따로 셈
+        out[id(arr)] = int(arr.nbytes)
+        return
+    n = data.nbytes
+    if data.dtype == object:  # 문자열 등 파이썬 객체 값 포함
+        n += sum(sys.getsizeof(v) for v in data)
+    addr = data.__array_interface__["data"][0]
+    out[addr] = max(out.get(addr, 0), n)
+
+
+def frame_buffers(df: pd.DataFrame) -> dict[int, int]:
+    """DataFrame 컬럼·인덱스가 쓰는 버퍼 {주소: 바이트} — 항목 간 공유 버퍼를 한 번만 세는 데 사용"""
+    out = {}
+    for i in range(df.shape[1]):
+        _array_buffers(df.iloc[:, i].array, out)
+    if not isinstance(df.index, pd.RangeIndex):
+        _array_buffers(df.index.array, out)
+    return out
+
+
+def describe_call(fn, args) -> str:
+    """관리자 화면 표시용 호출 설명 (긴 인자는 생략)"""
+    parts = []
+    for a in args:
+        r = repr(a)
+        parts.append(r if len(r) <= 60 else r[:57] + "...")
+    return f"{fn.__name__}({', '.join(parts)})"
+
+
+class ResidentSet:
+    """메모리 예산 안에서 DataFrame을 보관하는 크기 기반 LRU
+
+    항목을 넣을 때 예산을 넘으면 가장 오래 안 쓴 항목부터 내보낸다.
+    방금 넣은 항목은 예산보다 커도 남긴다 (호출 측이 바로 사용하므로).
+    사용량은 버퍼 단위 참조 수로 세므로 여러 항목이 공유하는 버퍼는 한 번만 더하고,
+    마지막으로 쓰던 항목이 나갈 때 뺀다.
+    """
+
+    def __init__(self, budget_bytes: int):
+        self.budget = budget_bytes
+        self.used = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._buffers: dict = {}  # 버퍼 키 → [참조 수, 바이트]
+        self._lock = threading.Lock()
+
+    def _acquire(self, buffers: dict):
+        for b, n in buffers.items():
+            ref = self._buffers.get(b)
+            if ref is None:
+                self._buffers[b] = [1, n]
+                self.used += n
+            else:
+                ref[0] += 1
+                if n > ref[1]:
+                    self.used += n - ref[1]
+                    ref[1] = n
+
+    def _release(self, buffers: dict):
+        for b in buffers:
+            ref = self._buffers[b]
+            ref[0] -= 1
+            if ref[0] == 0:
+                self.used -= ref[1]
+                del self._buffers[b]
+
+    def get(self, key):
+        with self._lock:
+            e = self._entries.get(key)
+            if e is None:
+                return None
+            self._entries.move_to_end(key)
+            e["hits"] += 1
+            e["last_used"] = time.time()
+            return e["df"]
+
+    def put(self, key, df: pd.DataFrame, buffers: dict, label: str = ""):
+        """buffers: 항목이 쓰는 버퍼 {버퍼 키: 바이트} (frame_buffers 참고)"""
+        now = time.time()
+        with self._lock:
+            old = self._entries.pop(key, None)
+            self._acquire(buffers)  # 교체 시 공유 버퍼가 잠시 0이 되지 않도록 먼저 잡음
+            if old is not None:
+                self._release(old["buffers"])
+            self._entries[key] = {"df": df, "buffers": buffers, "bytes": sum(buffers.values()), "label": label,
+                                  "hits": 0, "loaded_at": now, "last_used": now}
+            while self.used > self.budget and len(self._entries) > 1:
+                _, e = self._entries.popitem(last=False)
+                self._release(e["buffers"])
+                self.evictions += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def rows(self) -> list[dict]:
+        """상주 항목 (최근 사용 순)"""
+        with self._lock:
+            entries = list(self._entries.values())
+            shared = [sum(n for b, n in e["buffers"].items() if self._buffers[b][0] > 1) for e in entries]
+        return [
+            {
+                "항목": e["label"],
+                "행 수": len(e["df"]),
+                "메모리(MB)": round(e["bytes"] / MB, 2),
+                "다른 항목과 공유(MB)": round(sh / MB, 2),
+                "사용 횟수": e["hits"],
+                "적재 시각": time.strftime("%H:%M:%S", time.localtime(e["loaded_at"])),
+                "최근 사용": time.strftime("%H:%M:%S", time.localtime(e["last_used"])),
+            }
+            for e, sh in zip(reversed(entries), reversed(shared))
+        ]
+
+
+class KeyLocks:
+    """키별 threading.Lock — 기다리거나 잡고 있는 스레드가 없어지면 사전에서 지워 키 수만큼 쌓이지 않음"""
+
+    def __init__(self):
+        self._locks: dict[str, list] = {}  # 키 → [Lock, 사용 중인 스레드 수]
+        self._guard = threading.Lock()
+
+    @contextlib.contextmanager
+    def hold(self, key):
+        with self._guard:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._guard:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._locks[key]
+
+    def __len__(self):
+        return len(self._locks)
+
+
+class MemoryStore:
+    """프로세스 메모리 캐시 (예산 초과 시 LRU 제거 → 다음 요청 때 재계산)"""
+
+    name = "memory"
+
+    def __init__(self, budget_bytes: int):
+        self.resident = ResidentSet(budget_bytes)
+        self._locks = KeyLocks()
+
+    def get(self, key, label: str = ""):
+        return self.resident.get(key)
+
+    def put(self, key, df: pd.DataFrame, label: str = "") -> pd.DataFrame:
+        self.resident.put(key, df, frame_buffers(df), label)
+        return df
+
+    def lock(self, key):
+        return self._locks.hold(key)
+
+
+class DiskStore:
+    """여러 프로세스가 공유하는 디스크 캐시 (Arrow IPC + mmap, 내용 주소 지정)"""
+
+    name = "disk"
+
+    def __init__(self, root, budget_bytes: int, max_age_s: float = DEFAULT_MAX_AGE_DAYS * 86400):
+        self.root = Path(root)
+        for sub in ("objects", "refs", "locks"):
+            (self.root / sub).mkdir(parents=True, exist_ok=True)
+        # 내용 해시 → mmap 기반 DataFrame (크기는 Arrow 버퍼 기준, 제거 시 매핑만 해제)
+        self.resident = ResidentSet(budget_bytes)
+        self.max_age_s = max_age_s
+        self._thread_locks = KeyLocks()
+        if self._gc_due():
+            threading.Thread(target=self._prune_quietly, name="cache-gc", daemon=True).start()
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / f"{digest}.arrow"
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def get(self, key, label: str = ""):
+        ref = self.root / "refs" / key
+        try:
+            digest = ref.read_text().strip()
+            if time.time() - ref.stat().st_mtime > REF_TOUCH_S:
+                os.utime(ref)  # 사용 시각 기록 (prune이 오래 안 쓴 ref를 고를 때 사용)
+        except FileNotFoundError:
+            return None
+        df = self.resident.get(digest)
+        if df is None:
+            path = self._object_path(digest)
+            if not path.exists():
+                return None
+            # 매핑은 닫지 않는다 — 반환된 컬럼들이 매핑된 버퍼를 직접 참조함
+            table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+            # 문자열 컬럼도 Arrow 버퍼(mmap)를 그대로 참조하도록 pyarrow 문자열 dtype 사용
+            df = table.to_pandas(types_mapper={
+                pa.string(): pd.StringDtype("pyarrow"),
+                pa.large_string(): pd.StringDtype("pyarrow"),
+            }.get)
+            self.resident.put(digest, df, {digest: table.nbytes}, label)
+        return df
+
+    def put(self, key, df: pd.DataFrame, label: str = "") -> pd.DataFrame:
+        """저장 후 mmap 기반 DataFrame을 반환"""
+        table = pa.Table.from_pandas(df)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        data = sink.getvalue().to_pybytes()
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if path.exists():
+            os.utime(path)  # 참조가 끊겼던 객체를 다시 쓰는 경우 prune의 유예 시간 안으로
+        else:
+            self._atomic_write(path, data)
+        self._atomic_write(self.root / "refs" / key, digest.encode())
+        df = self.get(key, label)
+        if df is None:  # 드물게 그 사이 prune이 객체를 지웠으면 다시 씀
+            self._atomic_write(path, data)
+            df = self.get(key, label)
+        return df
+
+    # -----------------------------
+    # 정리 (오래 안 쓴 refs, 참조 없는 objects)
+    # -----------------------------
+    def _gc_due(self) -> bool:
+        try:
+            return time.time() - (self.root / "gc.stamp").stat().st_mtime > GC_INTERVAL_S
+        except FileNotFoundError:
+            return True
+
+    def _prune_quietly(self):
+        try:
+            self.prune()
+        except Exception:
+            _log.exception("cache prune failed")
+
+    def prune(self, now: float | None = None) -> dict:
+        """max_age_s 동안 안 쓴 ref와 어떤 ref도 가리키지 않는 object 삭제, 삭제 수·바이트 반환
+
+        방금 쓴 파일(GC_GRACE_S 이내)은 참조가 없어도 남긴다. 다른 프로세스가 매핑 중인 object는
+        POSIX에서는 매핑이 유지되고, 지울 수 없는 환경(Windows)에서는 다음 정리 때 다시 시도한다.
+        """
+        now = time.time() if now is None else now
+        (self.root / "gc.stamp").touch()
+        removed = {"refs": 0, "objects": 0, "bytes": 0}
+
+        def _unlink(path: Path) -> bool:
+            try:
+                path.unlink()
+                return True
+            except OSError:  # 이미 지워졌거나 사용 중
+                return False
+
+        live = set()
+        for ref in (self.root / "refs").iterdir():
+            try:
+                st_ = ref.stat()
+                if ref.name.endswith(".tmp"):
+                    if now - st_.st_mtime > GC_GRACE_S:
+                        _unlink(ref)
+                    continue
+                if now - st_.st_mtime > self.max_age_s:
+                    if _unlink(ref):
+                        removed["refs"] += 1
+                        _unlink(self.root / "locks" / f"{ref.name}.lock")
+                    continue
+                live.add(ref.read_text().strip())
+            except FileNotFoundError:
+                continue
+        for path in (self.root / "objects").glob("*/*"):
+            try:
+                st_ = path.stat()
+            except FileNotFoundError:
+                continue
+            digest = path.name.split(".")[0]
+            if digest in live or now - st_.st_mtime <= GC_GRACE_S:
+                continue
+            if _unlink(path):
+                removed["objects"] += 1
+                removed["bytes"] += st_.st_size
+        _log.info("cache prune: %s", removed)
+        return removed
+
+    @contextlib.contextmanager
+    def lock(self, key):
+        # 같은 프로세스 안의 스레드끼리는 threading.Lock, 프로세스 간에는 파일 잠금
+        with self._thread_locks.hold(key), open(self.root / "locks" / f"{key}.lock", "a+b") as f:
+            _lock_file(f)
+            try:
+                yield
+            finally:
+                _unlock_file(f)
+
+
+def _make_store():
+    root = os.environ.get(CACHE_DIR_ENV)
+    budget = int(float(os.environ.get(BUDGET_ENV, DEFAULT_BUDGET_MB)) * MB)
+    if not root:
+        return MemoryStore(budget)
+    max_age_s = float(os.environ.get(MAX_AGE_ENV, DEFAULT_MAX_AGE_DAYS)) * 86400
+    return DiskStore(root, budget, max_age_s)
+
+
+STORE = _make_store()
+
+
+def cached(fn=None, *, paths: tuple = ()):
+    """DataFrame을 반환하는 함수 결과를 STORE에 캐시 (st.cache_data 대체)
+
+    paths: 데이터 파일 경로인 인자 이름 — 이 인자만 파일 수정시각·크기를 키에 넣는다
+    (예: @cached(paths=("path_str",))). 반환된 DataFrame은 여러 세션이 공유하므로 호출 측에서 수정하지 않는다.
+    """
+    if fn is None:
+        return functools.partial(cached, paths=paths)
+    params = list(inspect.signature(fn).parameters)
+    unknown = [p for p in paths if p not in params]
+    if unknown:
+        raise ValueError(f"{fn.__name__}: 알 수 없는 경로 인자 {unknown}")
+    path_positions = tuple(params.index(p) for p in paths)
+
+    @functools.wraps(fn)
+    def wrapper(*args):
+        key = make_key(fn, args, path_positions)
+        label = describe_call(fn, args)
+        df = STORE.get(key, label)
+        if df is not None:
+            CACHE_REQUESTS.inc(fn=fn.__name__, result="hit")
+            return df
+        with STORE.lock(key):
+            df = STORE.get(key, label)  # 잠금 대기 중 다른 스레드/프로세스가 계산했을 수 있음
+            if df is None:
+                CACHE_REQUESTS.inc(fn=fn.__name__, result="miss")
+                with CACHE_COMPUTE.time(fn=fn.__name__):
+                    df = STORE.put(key, fn(*args), label)
+            else:
+                CACHE_REQUESTS.inc(fn=fn.__name__, result="hit")
+        return df
+
+    return wrapper
+
+
+def cache_summary() -> dict:
+    """관리자 화면용 캐시 사용 현황"""
+    res = STORE.resident
+    return {
+        "백엔드": STORE.name,
+        "예산(MB)": round(res.budget / MB, 2),
+        "사용(MB)": round(res.used / MB, 2),
+        "상주 항목": len(res),
+        "LRU 제거": res.evictions,
+    }
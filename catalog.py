@@ -0,0 +1,244 @@
+# catalog.py
+"""소재 확보 리스트 페이지(1~3) 공통 로더 · 전처리 · 집계
+
+각 단계는 입력 파라미터(파일 경로, 컬럼, 검색 조건)를 키로 캐시되므로
+화면에 보이는 보기만 계산하고, 이미 계산한 보기는 다시 계산하지 않는다.
+DataFrame 단계는 cache_store 백엔드(메모리 또는 프로세스 간 공유 디스크)에 저장된다.
+검색 조건은 (검색어, 검색 컬럼들, 유사학명 컬럼, 유사학명 목록) 튜플로 넘긴다.
+
+로드 시 문자열 컬럼은 중복이 많으면 범주형(category), 아니면 Arrow 문자열로 바꿔 보관하고,
+전처리는 바뀐 컬럼만 새로 만들어 원본과 나머지 컬럼 버퍼를 공유한다.
+"""
+import hashlib
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from cache_store import cached
+from csv_ingest import canonical_csv
+from fuzzy import NameIndex
+from metrics import DATASET_LOAD
+
+NO_SEARCH = ("", (), None, ())
+
+# 페이지 1~3 기본 데이터 파일 (페이지와 warmup 예열이 같은 경로를 쓰도록 한 곳에서 관리)
+CATALOG_FILES = {
+    "배양체 균류": "data/국립호남권생물자원관_섬생물소재은행_ 배양체 균류 소재 확보 리스트_20241217.csv",
+    "유전자원 DNA": "data/국립호남권생물자원관_섬생물소재은행_유전자원 DNA 소재 확보 리스트_20250912.csv",
+    "천연물 추출물": "data/국립호남권생물자원관_섬생물소재은행_천연물 추출물 소재 확보 리스트_20241217.csv",
+}
+
+
+# 표준 컬럼 자동 탐지 키 (집계 API·품질 점검 공용, 페이지 1~3의 자동 탐지와 같은 키)
+COLUMN_KEYS = {
+    "분류군": ["분류군", "taxon", "class", "군"],
+    "국명": ["국명", "한글명", "korean", "이름"],
+    "학명": ["학명", "scientific", "species", "binomial"],
+    "분양가능여부": ["분양"],
+}
+
+# 페이지 1~3 표시 옵션 기본값 (페이지 슬라이더 기본값이자 예열·보고서의 차트 옵션: 같아야 차트 명세 캐시 키가 일치)
+DEFAULT_STYLE = dict(label_font=11, bar_size=20, show_labels=True)
+DEFAULT_TOP_N = 20
+PAIRS_PER_TOP = 5  # 교차표 기본 표시 페어 수 = Top-N × 5
+
+# 페이지 1~3 보기 정의 (페이지·warmup 예열·정적 보고서 공용, 표준 컬럼 이름 기준)
+#   clean   전처리 컬럼 순서 (캐시 키의 일부라서 페이지와 예열이 같아야 함)
+#   counts  단일 컬럼 집계 보기
+#   crosses 교차표 보기 (행, 열) → (표시 페어 수(None이면 Top-N × PAIRS_PER_TOP), 히트맵 옵션)
+CATALOG_VIEWS = {
+    "배양체 균류": {
+        "clean": ("국명", "학명"),
+        "counts": ("국명", "학명"),
+        "crosses": {("국명", "학명"): (None, dict(titles=False))},
+    },
+    "유전자원 DNA": {
+        "clean": ("분류군", "국명", "학명"),
+        "counts": ("분류군", "국명", "학명"),
+        "crosses": {("분류군", "국명"): (None, {}), ("분류군", "학명"): (None, {})},
+    },
+    "천연물 추출물": {
+        "clean": ("국명", "학명", "분류군"),
+        "counts": ("국명", "학명"),
+        "crosses": {("국명", "학명"): (50, dict(weighted_sort=True, titles=False))},
+    },
+}
+
+# 고유값 비율이 이 값 이하인 문자열 컬럼은 범주형으로 변환
+CATEGORY_MAX_RATIO = 0.5
+
+# 결측을 뜻하는 문자열 (전처리 단계에서 한 번만 결측으로 바꾸므로 집계에서는 dropna만 하면 됨)
+NULL_TOKENS = ("", "nan", "NaN", "None", "null", "NULL")
+
+
+# -----------------------------
+# 데이터 로더
+# -----------------------------
+def _read_table(path_str: str) -> pd.DataFrame:
+    p = Path(path_str)
+    if not p.exists():
+        raise FileNotFoundError(f"파일을 찾을 수 없습니다: {p}")
+    if p.suffix.lower() == ".csv":
+        with DATASET_LOAD.time(loader="catalog_csv"):
+            src, encoding = canonical_csv(p)  # cp949 등은 한 번만 UTF-8 사본으로 변환
+            return pd.read_csv(src, encoding=encoding)
+    elif p.suffix.lower() in (".xls", ".xlsx"):
+        try:
+            import openpyxl  # noqa: F401
+        except ImportError:
+            raise ImportError("엑셀(.xlsx) 사용 시 `pip install openpyxl` 필요")
+        with DATASET_LOAD.time(loader="catalog_xlsx"):
+            return pd.read_excel(p, engine="openpyxl")
+    else:
+        raise ValueError("지원 형식: .csv, .xlsx")
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """문자열 컬럼을 범주형(중복 많은 컬럼) 또는 Arrow 문자열로 변환"""
+    out = {}
+    for c in df.columns:
+        s = df[c]
+        if pd.api.types.is_string_dtype(s.dtype) and not isinstance(s.dtype, pd.CategoricalDtype):
+            if len(s) and s.nunique() <= len(s) * CATEGORY_MAX_RATIO:
+                s = s.astype("category")
+            else:
+                s = s.astype(pd.StringDtype("pyarrow"))
+        out[c] = s
+    return pd.DataFrame(out, index=df.index)
+
+
+@cached(paths=("path_str",))
+def load_table(path_str: str) -> pd.DataFrame:
+    return compact_frame(_read_table(path_str))
+
+
+@cached(paths=("path_str",))
+def memory_report(path_str: str) -> pd.DataFrame:
+    """컬럼별 메모리(바이트): 기본 로드 dtype 대비 변환 후 dtype"""
+    raw, compact = _read_table(path_str), load_table(path_str)
+    before = raw.memory_usage(deep=True, index=False)
+    after = compact.memory_usage(deep=True, index=False)
+    rep = pd.DataFrame({
+        "컬럼": [str(c) for c in raw.columns],
+        "기본 dtype": raw.dtypes.astype(str).values,
+        "기본(bytes)": before.values,
+        "변환 dtype": compact.dtypes.astype(str).values,
+        "변환 후(bytes)": after.values,
+    })
+    total = {"컬럼": "합계", "기본 dtype": "", "기본(bytes)": int(before.sum()),
+             "변환 dtype": "", "변환 후(bytes)": int(after.sum())}
+    rep = pd.concat([rep, pd.DataFrame([total])], ignore_index=True)
+    rep["절감률"] = (1 - rep["변환 후(bytes)"] / rep["기본(bytes)"].where(rep["기본(bytes)"] > 0)).round(3)
+    return rep
+
+
+def find_col(columns, keys):
+    """컬럼명(소문자)에 keys 중 하나가 포함된 첫 컬럼"""
+    for c in columns:
+        low = str(c).strip().lower()
+        if any(k in low for k in keys):
+            return c
+    return None
+
+
+def view_columns(keys, found: dict) -> tuple:
+    """표준 컬럼 이름 keys → 페이지에서 찾은 실제 컬럼 이름 (찾지 못한 컬럼은 뺌)"""
+    return tuple(found[k] for k in keys if found.get(k))
+
+
+def cross_pairs(pairs, top_n: int) -> int:
+    """교차표 표시 페어 수 (보기 정의가 None이면 Top-N × PAIRS_PER_TOP)"""
+    return top_n * PAIRS_PER_TOP if pairs is None else pairs
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """DataFrame 내용(컬럼명·값) 지문 — 집계 결과 캐시 키로 사용"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr(list(df.columns)).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return h.hexdigest()
+
+
+# 학명 오타 허용 색인 (데이터 파일·컬럼별 1회 구축, 세션 간 공유)
+#   사이드바 경로로 임의 파일을 열 수 있으므로 보관 개수를 제한
+@st.cache_resource(max_entries=16, show_spinner=False)
+def sci_name_index(path_str: str, col: str) -> NameIndex:
+    return NameIndex(load_table(path_str)[col].dropna().unique())
+
+
+# -----------------------------
+# 전처리 · 검색
+# -----------------------------
+def _strip(s: pd.Series) -> pd.Series:
+    """양끝 공백 제거 + NULL_TOKENS → 결측 (범주형은 범주만 정리, 바뀐 것이 없으면 원본 그대로)"""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        cats = s.cat.categories
+        stripped = cats.astype(str).str.strip()
+        if not stripped.equals(cats):
+            if stripped.is_unique:
+                s = s.cat.rename_categories(stripped)
+            else:
+                s = s.astype(pd.StringDtype("pyarrow")).str.strip().astype("category")
+        nulls = s.cat.categories[s.cat.categories.isin(NULL_TOKENS)]
+        return s.cat.remove_categories(nulls) if len(nulls) else s
+    if not pd.api.types.is_string_dtype(s.dtype):
+        s = s.astype(pd.StringDtype("pyarrow"))
+    s = s.str.strip()
+    return s.mask(s.isin(NULL_TOKENS))
+
+
+@cached(paths=("path_str",))
+def clean_table(path_str: str, cols: tuple) -> pd.DataFrame:
+    """문자열 정리(양끝 공백 제거) — 나머지 컬럼은 원본과 버퍼 공유"""
+    df = load_table(path_str).copy(deep=False)
+    for c in cols:
+        df[c] = _strip(df[c])
+    return df
+
+
+@cached(paths=("path_str",))
+def search_rows(path_str: str, cols: tuple, search: tuple = NO_SEARCH) -> pd.DataFrame:
+    """검색어 부분일치 + (선택) 유사 학명 일치 행만 남김"""
+    df = clean_table(path_str, cols)
+    kw, search_cols, fuzzy_col, fuzzy_names = search
+    if not kw:
+        return df
+    mask = pd.Series(False, index=df.index)
+    for c in search_cols:
+        mask |= df[c].str.contains(kw, case=False, na=False)
+    if fuzzy_col is not None:
+        mask |= df[fuzzy_col].isin(fuzzy_names)
+    return df[mask]
+
+
+# -----------------------------
+# 집계
+# -----------------------------
+@cached(paths=("path_str",))
+def count_table(path_str: str, cols: tuple, search: tuple, col) -> pd.DataFrame:
+    cnt = search_rows(path_str, cols, search)[col].value_counts()  # 결측 표기는 clean_table에서 정리됨
+    agg = cnt[cnt > 0].rename_axis(col).reset_index(name="건수")  # 범주형의 빈 범주 제외
+    total = int(agg["건수"].sum()) if not agg.empty else 0
+    agg["비율"] = 0.0 if total == 0 else agg["건수"] / total
+    return agg
+
+
+def count_by(path_str: str, cols: tuple, search: tuple, col) -> tuple[pd.DataFrame, int]:
+    """col 값별 건수·비율과 전체 건수"""
+    agg = count_table(path_str, cols, search, col)
+    return agg, int(agg["건수"].sum())
+
+
+@cached(paths=("path_str",))
+def cross_counts(path_str: str, cols: tuple, search: tuple, pair_cols: tuple) -> pd.DataFrame:
+    """pair_cols 조합별 건수 (건수 내림차순)"""
+    pair_cols = list(pair_cols)
+    return (
+        search_rows(path_str, cols, search)[pair_cols]
+        .dropna()
+        .groupby(pair_cols, as_index=False, observed=True)
+        .size()
+        .rename(columns={"size": "건수"})
+        .sort_values("건수", ascending=False)
+    )
@@ -0,0 +1,140 @@
+# charts.py
+"""소재 확보 리스트 페이지(1~3) 공통 차트 (Top-N 막대, 교차 히트맵)
+
+표시 옵션(글자 크기·막대 두께·라벨)은 페이지 전역값 대신 인자로 받는다.
+*_spec 함수는 직렬화된 Vega-Lite 명세(dict)를 (집계 지문 + 표시 옵션) 키로
+세션 간 캐시하므로, 자주 보는 조합은 pandas 정렬과 Altair 직렬화를 모두 건너뛴다.
+페이지에서는 st.vega_lite_chart(spec)로 그린다.
+"""
+import altair as alt
+import numpy as np
+import streamlit as st
+
+from catalog import frame_fingerprint
+
+alt.themes.enable("none")
+
+# Top 1~5 단계색(진한 파랑 → 옅은 파랑), 6위 이후 회색
+RANK_COLORS = np.array(["#004488", "#2E6EB5", "#5B8BD5", "#87A9E2", "#B4C7EF"], dtype=object)
+OTHER_COLOR = "#D9D9D9"
+
+
+def rank_colors(n: int) -> np.ndarray:
+    """순위 1..n 의 막대 색상 (벡터 연산)"""
+    colors = np.full(n, OTHER_COLOR, dtype=object)
+    k = min(n, len(RANK_COLORS))
+    colors[:k] = RANK_COLORS[:k]
+    return colors
+
+
+def bar_chart(df_cnt, name_col, value_col="건수", top=20, pct=False,
+              label_font=11, bar_size=20, show_labels=True):
+    axis_y    = alt.Axis(title=None, labelFontSize=label_font)
+    axis_xcnt = alt.Axis(title="건수", labelFontSize=label_font)
+    axis_xpct = alt.Axis(title="비율", format="%", labelFontSize=label_font)
+
+    # Top 정렬 및 순위 부여
+    src = df_cnt.sort_values("비율" if pct else value_col, ascending=False).head(top).copy()
+    src = src.reset_index(drop=True)
+    src["rank"] = src.index + 1
+
+    src["색상"] = rank_colors(len(src))  # Top 1~5 단계색, 6위 이후 회색
+
+    enc_x = alt.X(("비율:Q" if pct else "건수:Q"),
+                  axis=(axis_xpct if pct else axis_xcnt))
+
+    bars = (
+        alt.Chart(src)
+        .mark_bar(size=bar_size)
+        .encode(
+            y=alt.Y(f"{name_col}:N", sort="-x", axis=axis_y),
+            x=enc_x,
+            color=alt.Color("색상:N", legend=None, scale=None),  # 계산된 색상 직접 사용
+            tooltip=[
+                alt.Tooltip(f"{name_col}:N", title="이름"),
+                alt.Tooltip("건수:Q", format=",.0f"),
+                alt.Tooltip("비율:Q", format=".1%"),
+                alt.Tooltip("rank:Q", title="순위"),
+            ],
+        )
+        .properties(height=max(320, len(src) * (bar_size + 6)))
+    )
+
+    if show_labels:
+        texts = (
+            alt.Chart(src)
+            .mark_text(dx=3, align="left", baseline="middle", color="#222")
+            .encode(
+                y=alt.Y(f"{name_col}:N", sort="-x", axis=None),
+                x=enc_x,
+                text=alt.Text(("비율:Q" if pct else "건수:Q"),
+                              format=(".0%" if pct else ",.0f")),
+            )
+        )
+        return (bars + texts).configure_view(stroke=None).configure_axis(labelOverlap=False)
+
+    return bars.configure_view(stroke=None).configure_axis(labelOverlap=False)
+
+
+def cross_heat(cross, y_name, x_name, label_font=11, bar_size=20,
+               weighted_sort=False, titles=True):
+    """교차 집계(cross_counts 결과 상위 일부) 히트맵
+
+    weighted_sort=True 이면 축을 조합 건수 합 순으로 정렬, titles=False 이면 축 제목 생략
+    """
+    title = alt.Undefined if titles else None
+    if weighted_sort:
+        y_sort = (cross.groupby(y_name, as_index=False, observed=True)["건수"].sum()
+                       .sort_values("건수", ascending=False)[y_name].tolist())
+        x_sort = (cross.groupby(x_name, as_index=False, observed=True)["건수"].sum()
+                       .sort_values("건수", ascending=False)[x_name].tolist())
+    else:
+        y_sort, x_sort = "-x", alt.Undefined
+
+    heat = (
+        alt.Chart(cross)
+        .mark_rect()
+        .encode(
+            y=alt.Y(f"{y_name}:N", sort=y_sort, axis=alt.Axis(title=title, labelFontSize=label_font)),
+            x=alt.X(f"{x_name}:N", sort=x_sort,
+                    axis=alt.Axis(title=title, labelAngle=-40, labelFontSize=label_font)),
+            color=alt.Color("건수:Q", title="건수"),
+            tooltip=[y_name, x_name, alt.Tooltip("건수:Q", format=",.0f")],
+        )
+        .properties(height=max(360, cross[y_name].nunique() * (bar_size // 2 + 4)))
+        .configure_view(stroke=None)
+    )
+    if weighted_sort:
+        heat = heat.configure_axis(labelOverlap=False, grid=True, gridOpacity=0.2)
+    return heat
+
+
+# -----------------------------
+# 직렬화된 차트 명세 캐시
+# -----------------------------
+@st.cache_data(max_entries=512, show_spinner=False)
+def _bar_chart_spec(fingerprint, _df_cnt, name_col, value_col, top, pct,
+                    label_font, bar_size, show_labels) -> dict:
+    return bar_chart(_df_cnt, name_col, value_col, top=top, pct=pct, label_font=label_font,
+                     bar_size=bar_size, show_labels=show_labels).to_dict()
+
+
+def bar_chart_spec(df_cnt, name_col, value_col="건수", top=20, pct=False,
+                   label_font=11, bar_size=20, show_labels=True) -> dict:
+    """bar_chart의 Vega-Lite 명세 (집계 지문 + 표시 옵션 키로 캐시)"""
+    return _bar_chart_spec(frame_fingerprint(df_cnt), df_cnt, name_col, value_col, top, pct,
+                           label_font, bar_size, show_labels)
+
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def _cross_heat_spec(fingerprint, _cross, y_name, x_name, label_font, bar_size,
+                     weighted_sort, titles) -> dict:
+    return cross_heat(_cross, y_name, x_name, label_font=label_font, bar_size=bar_size,
+                      weighted_sort=weighted_sort, titles=titles).to_dict()
+
+
+def cross_heat_spec(cross, y_name, x_name, label_font=11, bar_size=20,
+                    weighted_sort=False, titles=True) -> dict:
+    """cross_heat의 Vega-Lite 명세 (집계 지문 + 표시 옵션 키로 캐시)"""
+    return _cross_heat_spec(frame_fingerprint(cross), cross, y_name, x_name, label_font, bar_size,
+                            weighted_sort, titles)
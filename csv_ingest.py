@@ -0,0 +1,148 @@
+# csv_ingest.py
+"""CSV 인코딩 판별과 1회 변환 (utf-8 / utf-8-sig / cp949·euc-kr / utf-16)
+
+공공데이터포털 파일은 cp949로 오는 경우가 많다. 파일 앞·뒤 일부 바이트만 읽어 인코딩을 판별하고,
+UTF-8이 아니면 한 번만 UTF-8로 변환한 사본(.ingest/ 아래)을 만들어 이후에는 그 사본을 읽는다.
+판별·변환 결과는 파일 지문(경로, 크기, 수정시각)별로 기억하므로 같은 파일을 다시 시도하며 파싱하지 않는다.
+"""
+import codecs
+import hashlib
+import json
+import os
+import pathlib
+import threading
+
+INGEST_DIR = pathlib.Path(os.environ.get("DASHBOARD_INGEST_DIR", ".ingest"))
+SAMPLE_BYTES = 64 * 1024  # 앞·뒤 각각
+CANDIDATES = ("utf-8", "cp949")  # cp949는 euc-kr의 상위 집합
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+_lock = threading.Lock()
+_memo = {}  # 지문 → (읽을 경로, 인코딩)
+
+
+def _decodes(sample: bytes, encoding: str, at_start: bool = True) -> bool:
+    """sample이 encoding으로 디코딩되는지 (잘린 멀티바이트 문자는 허용)"""
+    if not at_start:
+        # 파일 중간부터 자른 조각: 앞쪽의 잘린 문자를 건너뛰도록 최대 3바이트까지 밀어 봄
+        return any(_decodes(sample[i:], encoding) for i in range(min(4, len(sample))))
+    try:
+        codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def detect_encoding(head: bytes, tail: bytes = b"") -> str:
+    """바이트 표본으로 인코딩 판별: BOM → UTF-8 → cp949 순 (모두 실패하면 ValueError)"""
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    for encoding in CANDIDATES:
+        if _decodes(head, encoding) and (not tail or _decodes(tail, encoding, at_start=False)):
+            return encoding
+    raise ValueError("CSV 인코딩을 판별할 수 없습니다 (지원: UTF-8, CP949/EUC-KR, UTF-16)")
+
+
+def _samples(path) -> tuple[bytes, bytes]:
+    """파일 앞·뒤 SAMPLE_BYTES (파일이 작으면 tail은 비어 있음)"""
+    with open(path, "rb") as f:
+        head = f.read(SAMPLE_BYTES)
+        size = f.seek(0, os.SEEK_END)
+        tail = b""
+        if size > SAMPLE_BYTES:
+            f.seek(max(SAMPLE_BYTES, size - SAMPLE_BYTES))
+            tail = f.read()
+    return head, tail
+
+
+def sniff_file(path) -> str:
+    """파일 앞·뒤 SAMPLE_BYTES만 읽어 인코딩 판별"""
+    return detect_encoding(*_samples(path))
+
+
+def _is_valid(path, encoding: str) -> bool:
+    """파일 전체가 encoding으로 디코딩되는지 스트리밍 검사 (표본이 ASCII뿐이라 판별이 불확실할 때 1회)"""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                decoder.decode(chunk)
+            decoder.decode(b"", final=True)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def _fingerprint(path: pathlib.Path) -> str:
+    st_ = path.stat()
+    raw = f"{path.resolve()}|{st_.st_size}|{st_.st_mtime_ns}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:24]
+
+
+def _transcode(src: pathlib.Path, dst: pathlib.Path, encoding: str) -> str:
+    """src를 UTF-8 사본으로 (표본 밖에서 디코딩이 실패하면 다음 후보 인코딩으로 다시 시도), 실제 인코딩 반환"""
+    order = [encoding] + [c for c in CANDIDATES if c != encoding]
+    tmp = dst.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    for enc in order:
+        try:
+            with open(src, "r", encoding=enc, newline="") as fin, open(tmp, "w", encoding="utf-8", newline="") as fout:
+                for chunk in iter(lambda: fin.read(1 << 20), ""):
+                    fout.write(chunk)
+        except UnicodeDecodeError:
+            continue
+        os.replace(tmp, dst)  # 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록 원자적 교체
+        return enc
+    tmp.unlink(missing_ok=True)
+    raise ValueError(f"CSV 인코딩을 판별할 수 없습니다: {src}")
+
+
+def canonical_csv(path) -> tuple[str, str]:
+    """pd.read_csv에 넘길 (경로, 인코딩)
+
+    UTF-8(BOM 유무 무관)이면 원본 그대로 ('utf-8-sig'), 아니면 .ingest/<지문>.csv UTF-8 사본.
+    """
+    p = pathlib.Path(path)
+    fp = _fingerprint(p)
+    with _lock:
+        hit = _memo.get(fp)
+    if hit is not None:
+        return hit
+
+    manifest = INGEST_DIR / f"{fp}.json"
+    if manifest.exists():
+        info = json.loads(manifest.read_text(encoding="utf-8"))
+        result = (info["read_path"], info["read_encoding"])
+        if pathlib.Path(result[0]).exists():
+            with _lock:
+                _memo[fp] = result
+            return result
+
+    head, tail = _samples(p)
+    encoding = detect_encoding(head, tail)
+    # 표본에 한글 등 비ASCII 문자가 UTF-8로 들어 있으면 그대로 믿고, ASCII뿐일 때만 전체를 검사
+    # (표본 밖에 한글이 처음 나오는 cp949 파일)
+    if encoding == "utf-8" and head.isascii() and tail.isascii() and not _is_valid(p, encoding):
+        encoding = "cp949"
+    if encoding in ("utf-8", "utf-8-sig"):
+        source_encoding, result = encoding, (str(p), "utf-8-sig")
+    else:
+        INGEST_DIR.mkdir(parents=True, exist_ok=True)
+        dst = INGEST_DIR / f"{fp}.csv"
+        source_encoding = _transcode(p, dst, encoding)
+        result = (dst.as_posix(), "utf-8")
+    INGEST_DIR.mkdir(parents=True, exist_ok=True)
+    # 다른 프로세스가 반쯤 쓴 기록을 읽지 않도록 임시 파일에 쓰고 원자적 교체
+    tmp = manifest.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps({
+        "source": str(p), "source_encoding": source_encoding,
+        "read_path": result[0], "read_encoding": result[1],
+    }, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, manifest)
+    with _lock:
+        _memo[fp] = result
+    return result
@@ -0,0 +1,120 @@
+# fuzzy.py
+"""학명 오타 허용 검색 (BK-tree 기반 편집거리 색인)"""
+import re
+
+_WORD = re.compile(r"[a-z]+")
+
+
+def normalize_name(name) -> str:
+    """학명을 비교용 키로 정규화 (소문자, 속명+종소명만 사용, 명명자/연도 제거)"""
+    if name is None:
+        return ""
+    words = _WORD.findall(str(name).lower())
+    if not words or words[0] in ("nan", "none"):
+        return ""
+    return " ".join(words[:2])
+
+
+def levenshtein(a: str, b: str) -> int:
+    """두 문자열의 편집거리(삽입·삭제·치환 각 1)
+
+    Myers/Hyyrö 비트 병렬 알고리즘: b의 각 문자 위치를 정수 비트로 표현해
+    a의 문자당 한 번의 정수 연산 묶음으로 DP 한 열을 갱신한다.
+    """
+    if a == b:
+        return 0
+    if not a:
+        return len(b)
+    if not b:
+        return len(a)
+
+    m = len(b)
+    peq: dict[str, int] = {}
+    for i, c in enumerate(b):
+        peq[c] = peq.get(c, 0) | (1 << i)
+    mask = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv, mv, score = mask, 0, m
+    for c in a:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return score
+
+
+class BKTree:
+    """편집거리 기반 BK-tree. 노드는 (단어, {거리: 자식노드}) 튜플"""
+
+    def __init__(self, words=()):
+        self.root = None
+        self.size = 0
+        for w in words:
+            self.add(w)
+
+    def add(self, word: str):
+        if self.root is None:
+            self.root = (word, {})
+            self.size = 1
+            return
+        node = self.root
+        while True:
+            d = levenshtein(word, node[0])
+            if d == 0:
+                return  # 중복 단어
+            child = node[1].get(d)
+            if child is None:
+                node[1][d] = (word, {})
+                self.size += 1
+                return
+            node = child
+
+    def search(self, query: str, k: int) -> list[tuple[int, str]]:
+        """편집거리 k 이내 단어를 (거리, 단어) 오름차순으로 반환"""
+        if self.root is None:
+            return []
+        found = []
+        stack = [self.root]
+        while stack:
+            word, children = stack.pop()
+            d = levenshtein(query, word)
+            if d <= k:
+                found.append((d, word))
+            # 삼각부등식: 자식 간선 거리가 [d-k, d+k] 안에 있을 때만 탐색
+            lo, hi = d - k, d + k
+            for dist, child in children.items():
+                if lo <= dist <= hi:
+                    stack.append(child)
+        found.sort()
+        return found
+
+
+class NameIndex:
+    """정규화된 학명 BK-tree + 정규화 키 → 원본 학명 매핑"""
+
+    def __init__(self, names):
+        self.originals: dict[str, set[str]] = {}
+        for n in names:
+            key = normalize_name(n)
+            if key:
+                self.originals.setdefault(key, set()).add(str(n).strip())
+        self.tree = BKTree(sorted(self.originals))
+
+    def lookup(self, query: str, k: int = 2, limit: int = 20) -> list[dict]:
+        """질의와 편집거리 k 이내인 학명 후보를 가까운 순으로 반환"""
+        key = normalize_name(query)
+        if not key:
+            return []
+        return [
+            {"거리": d, "학명키": w, "학명": sorted(self.originals[w])}
+            for d, w in self.tree.search(key, k)[:limit]
+        ]
@@ -0,0 +1,209 @@
+# metrics.py
+"""대시보드 내부 지표 (Prometheus 텍스트 형식) 와 선택적 HTTP 엔드포인트
+
+DASHBOARD_METRICS_PORT 환경변수를 지정하면 백그라운드 스레드에서
+http://<DASHBOARD_METRICS_ADDR, 기본 127.0.0.1>:<포트>/metrics 로 지표를 내보낸다.
+지정하지 않으면 지표는 메모리에만 쌓이고 엔드포인트는 열지 않는다.
+
+- dashboard_page_render_seconds{page}           페이지 스크립트 실행 시간
+- dashboard_fragment_render_seconds{page,fragment}  fragment 실행 시간 (fragment만 다시 실행될 때 포함)
+- dashboard_dataset_load_seconds{loader}        데이터 파일 읽기 시간
+- dashboard_cache_requests_total{fn,result}     cache_store 캐시 적중(hit)/계산(miss)
+- dashboard_cache_compute_seconds{fn}           캐시 미스 시 계산 시간
+- dashboard_visit_log_queue_depth               기록 대기 중인 방문 로그 수
+- dashboard_sqlite_write_seconds{op}            SQLite 쓰기 트랜잭션 시간
+"""
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import streamlit as st
+
+PORT_ENV = "DASHBOARD_METRICS_PORT"
+ADDR_ENV = "DASHBOARD_METRICS_ADDR"
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(v) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)] + list(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name, doc, labels=()):
+        self.name, self.doc, self.labelnames = name, doc, tuple(labels)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels) -> tuple:
+        return tuple(labels.get(n, "") for n in self.labelnames)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.labelnames, k)} {v:g}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """값을 직접 넣거나, fn을 주면 내보낼 때마다 호출해 읽음"""
+
+    kind = "gauge"
+
+    def __init__(self, name, doc, labels=(), fn=None):
+        super().__init__(name, doc, labels)
+        self.fn = fn
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def render(self) -> list[str]:
+        if self.fn is not None:
+            self.set(self.fn())
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.labelnames, k)} {v:g}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, doc, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, doc, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, seconds: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[bisect_left(self.buckets, seconds)] += 1
+            self._values[key] = (counts, total + seconds)
+
+    def time(self, **labels):
+        return _Timer(self, labels)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted((k, (list(c), s)) for k, (c, s) in self._values.items())
+        lines = self.header()
+        for key, (counts, total) in items:
+            cum = 0
+            for le, n in zip(self.buckets + (float("inf"),), counts):
+                cum += n
+                le_label = 'le="+Inf"' if le == float("inf") else f'le="{le:g}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, [le_label])} {cum}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {total:.6f}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cum}")
+        return lines
+
+
+class _Timer:
+    def __init__(self, hist, labels):
+        self.hist, self.labels = hist, labels
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.hist.observe(time.perf_counter() - self.t0, **self.labels)
+
+
+# -----------------------------
+# 지표 정의
+# -----------------------------
+PAGE_RENDER = Histogram("dashboard_page_render_seconds", "Page script run time", ("page",))
+FRAGMENT_RENDER = Histogram("dashboard_fragment_render_seconds", "st.fragment run time", ("page", "fragment"))
+DATASET_LOAD = Histogram("dashboard_dataset_load_seconds", "Time to read a data file", ("loader",))
+CACHE_REQUESTS = Counter("dashboard_cache_requests_total", "cache_store lookups", ("fn", "result"))
+CACHE_COMPUTE = Histogram("dashboard_cache_compute_seconds", "Time to compute a cache miss", ("fn",))
+VISIT_QUEUE_DEPTH = Gauge("dashboard_visit_log_queue_depth", "Visit log events waiting to be written")
+SQLITE_WRITE = Histogram("dashboard_sqlite_write_seconds", "SQLite write transaction time", ("op",))
+
+REGISTRY = [PAGE_RENDER, FRAGMENT_RENDER, DATASET_LOAD, CACHE_REQUESTS, CACHE_COMPUTE, VISIT_QUEUE_DEPTH, SQLITE_WRITE]
+
+
+def render_all() -> str:
+    return "\n".join(line for m in REGISTRY for line in m.render()) + "\n"
+
+
+# -----------------------------
+# 페이지 실행 시간 (페이지 상단 start_render → 하단 end_render)
+# -----------------------------
+def start_render(page: str):
+    st.session_state["_render_started"] = (page, time.perf_counter())
+
+
+def end_render():
+    """st.stop() 등으로 중간에 끝난 실행은 기록하지 않음"""
+    started = st.session_state.pop("_render_started", None)
+    if started is not None:
+        page, t0 = started
+        PAGE_RENDER.observe(time.perf_counter() - t0, page=page)
+
+
+def timed_fragment(page: str, fragment: str):
+    """fragment 함수 실행 시간 기록 (@st.fragment 바로 아래에 붙임)
+
+    fragment만 다시 실행될 때는 페이지 하단의 end_render까지 가지 않으므로 PAGE_RENDER에 남지 않는다.
+    전체 실행 중의 fragment 실행도 함께 기록된다.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with FRAGMENT_RENDER.time(page=page, fragment=fragment):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# -----------------------------
+# HTTP 엔드포인트
+# -----------------------------
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = render_all().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # 요청마다 stderr에 찍지 않음
+        pass
+
+
+@st.cache_resource(show_spinner=False)
+def start_exporter():
+    """DASHBOARD_METRICS_PORT가 있으면 프로세스당 한 번 엔드포인트 시작 (없으면 None)"""
+    port = os.environ.get(PORT_ENV)
+    if not port:
+        return None
+    server = ThreadingHTTPServer((os.environ.get(ADDR_ENV, "127.0.0.1"), int(port)), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-exporter", daemon=True).start()
+    return server
@@ -1,49 +1,34 @@
 # pages/1_국명_학명_집계.py
-import pandas as pd
 import streamlit as st
-import altair as alt
-from pathlib import Path
 from analytics import log_visit
+from warmup import start_warmup
+from metrics import end_render, timed_fragment
+from catalog import (CATALOG_FILES, CATALOG_VIEWS, DEFAULT_STYLE, DEFAULT_TOP_N, count_by, cross_counts, cross_pairs,
+                     find_col, load_table, memory_report, view_columns)
+from charts import bar_chart_spec, cross_heat_spec
+from quality import issue_count, quality_report
+from search_ui import build_search, search_controls
 
 st.set_page_config(page_title="배양체 균류 소재 확보 현황(국명·학명 집계)", layout="wide")
 log_visit("배양체 균류 소재 확보 현황(국명·학명 집계)")
+start_warmup()  # 프로세스 첫 실행 시 백그라운드 캐시 예열
 
 st.title("국립호남권생물자원관 배양체 균류 소재 확보 현황 · 국명/학명 집계")
 
 # -----------------------------
 # 데이터 경로 입력 (CSV 권장)
 # -----------------------------
-DEFAULT_DATA = "data/국립호남권생물자원관_섬생물소재은행_ 배양체 균류 소재 확보 리스트_20241217.csv"
+DEFAULT_DATA = CATALOG_FILES["배양체 균류"]
+VIEW_DEF = CATALOG_VIEWS["배양체 균류"]  # 전처리 컬럼·교차표 옵션 (warmup 예열과 공용)
 data_path = st.sidebar.text_input("데이터 파일 경로", DEFAULT_DATA)
 st.sidebar.caption("국립호남권생물자원관이 보유하고 있는 배양체 균류 소재 확보 리스트 데이터입니다.")
 
-# 표시 옵션
-label_font = st.sidebar.slider("축 글자 크기", 9, 16, 11)
-bar_size   = st.sidebar.slider("막대 두께(픽셀)", 10, 40, 20)
-top_n      = st.sidebar.slider("표시 개수(상위)", 5, 50, 20)
-show_labels = st.sidebar.checkbox("막대 라벨 표시", True)
-search_kw   = st.sidebar.text_input("이름 필터(포함 검색)", "")
+# 검색 조건 (바뀌면 검색 이후 단계만 다시 계산)
+search_kw, fuzzy_mode, fuzzy_k = search_controls("이름 필터(포함 검색)")
 
 # -----------------------------
-# 데이터 로더
+# 데이터 로드
 # -----------------------------
-@st.cache_data
-def load_table(path_str: str) -> pd.DataFrame:
-    p = Path(path_str)
-    if not p.exists():
-        raise FileNotFoundError(f"파일을 찾을 수 없습니다: {p}")
-    if p.suffix.lower() == ".csv":
-        return pd.read_csv(p, encoding="utf-8-sig")
-    elif p.suffix.lower() in (".xls", ".xlsx"):
-        try:
-            import openpyxl  # noqa: F401
-        except ImportError:
-            raise ImportError("엑셀(.xlsx)을 쓰려면 openpyxl이 필요합니다. "
-                              "CSV로 저장하거나 `pip install openpyxl` 후 다시 시도하세요.")
-        return pd.read_excel(p, engine="openpyxl")
-    else:
-        raise ValueError("지원 형식: .csv, .xlsx")
-
 try:
     df_raw = load_table(data_path)
 except Exception as e:
@@ -53,19 +38,10 @@ except Exception as e:
 # -----------------------------
 # 스키마 추론: 국명/학명 컬럼 찾기
 # -----------------------------
-columns_lower = {c: str(c).strip().lower() for c in df_raw.columns}
-
-def find_col(candidates):
-    for c in df_raw.columns:
-        low = columns_lower[c]
-        if any(key in low for key in candidates):
-            return c
-    return None
-
 # 국명 후보 예: 국명, 한글명, 종명(국명), 이름 등
-korean_name_col = find_col(["국명", "한글명", "국 명", "korean", "국가명"]) or "국명"
+korean_name_col = find_col(df_raw.columns, ["국명", "한글명", "국 명", "korean", "국가명"]) or "국명"
 # 학명 후보 예: 학명, scientific name, species 등
-scientific_name_col = find_col(["학명", "scientific", "species", "binomial"]) or "학명"
+scientific_name_col = find_col(df_raw.columns, ["학명", "scientific", "species", "binomial"]) or "학명"
 
 missing_cols = [c for c in [korean_name_col, scientific_name_col] if c not in df_raw.columns]
 if missing_cols:
@@ -77,149 +53,84 @@ if missing_cols:
     with col2:
         scientific_name_col = st.selectbox("학명 컬럼 선택", df_raw.columns, index=min(1, len(df_raw.columns)-1))
 
-# 전처리: 문자열 통일(양끝 공백 제거)
-df = df_raw.copy()
-for c in [korean_name_col, scientific_name_col]:
-    df[c] = df[c].astype(str).str.strip()
+# 전처리 대상 컬럼(양끝 공백 제거) — 실제 정리는 catalog 캐시 단계에서 1회만 수행
+clean_cols = view_columns(VIEW_DEF["clean"], {"국명": korean_name_col, "학명": scientific_name_col})
 
-# 검색 필터 적용(국명/학명 모두에 부분일치)
-if search_kw:
-    kw = str(search_kw).strip()
-    mask = df[korean_name_col].str.contains(kw, case=False, na=False) | df[scientific_name_col].str.contains(kw, case=False, na=False)
-    df = df[mask]
+# 검색 조건(국명/학명 모두에 부분일치)
+search = build_search(data_path, search_kw, clean_cols, scientific_name_col, fuzzy_mode, fuzzy_k)
 
 # -----------------------------
-# 집계 함수
+# 보기 영역 (fragment): 보기 선택·표시 옵션을 바꾸면 이 영역만 다시 실행
+#   의존성: data_path, clean_cols, search — 사이드바 데이터 조건이 바뀔 때만 전체 재실행
 # -----------------------------
-def count_by(col):
-    s = (df[col]
-         .replace({"nan": None, "None": None})
-         .dropna())
-    agg = (s.value_counts()
-             .rename_axis(col)
-             .reset_index(name="건수"))
-    total = int(agg["건수"].sum()) if not agg.empty else 0
-    if total > 0:
-        agg["비율"] = agg["건수"] / total
+VIEWS = ["국명 집계", "학명 집계", "국명×학명 매트릭스"]
+
+@st.fragment
+@timed_fragment("배양체 균류 소재 확보 현황(국명·학명 집계)", "보기")  # 보기만 다시 실행될 때도 실행 시간 기록
+def catalog_views(data_path, clean_cols, search):
+    korean_name_col, scientific_name_col = clean_cols
+
+    c_view, c_opt = st.columns([5, 1])
+    with c_view:
+        view = st.radio("보기 선택", VIEWS, horizontal=True, label_visibility="collapsed")
+    # 표시 옵션: 캐시된 집계로 차트만 다시 그림
+    with c_opt.popover("표시 옵션", use_container_width=True):
+        label_font  = st.slider("축 글자 크기", 9, 16, DEFAULT_STYLE["label_font"])
+        bar_size    = st.slider("막대 두께(픽셀)", 10, 40, DEFAULT_STYLE["bar_size"])
+        top_n       = st.slider("표시 개수(상위)", 5, 50, DEFAULT_TOP_N)
+        show_labels = st.checkbox("막대 라벨 표시", DEFAULT_STYLE["show_labels"])
+    style = dict(label_font=label_font, bar_size=bar_size, show_labels=show_labels)
+
+    if view == "국명 집계":
+        cnt_kor, total_kor = count_by(data_path, clean_cols, search, korean_name_col)
+        st.caption(f"총 {total_kor:,} 건 · 고유 국명 {cnt_kor.shape[0]:,} 종")
+        c1, c2 = st.columns(2)
+        with c1:
+            st.subheader("국명 Top-N (건수)")
+            st.vega_lite_chart(bar_chart_spec(cnt_kor, korean_name_col, "건수", top=top_n, pct=False, **style), use_container_width=True)
+        with c2:
+            st.subheader("국명 Top-N (비율)")
+            st.vega_lite_chart(bar_chart_spec(cnt_kor, korean_name_col, "건수", top=top_n, pct=True, **style), use_container_width=True)
+        st.dataframe(cnt_kor.head(200), use_container_width=True)
+
+    elif view == "학명 집계":
+        cnt_sci, total_sci = count_by(data_path, clean_cols, search, scientific_name_col)
+        st.caption(f"총 {total_sci:,} 건 · 고유 학명 {cnt_sci.shape[0]:,} 종")
+        c1, c2 = st.columns(2)
+        with c1:
+            st.subheader("학명 Top-N (건수)")
+            st.vega_lite_chart(bar_chart_spec(cnt_sci, scientific_name_col, "건수", top=top_n, pct=False, **style), use_container_width=True)
+        with c2:
+            st.subheader("학명 Top-N (비율)")
+            st.vega_lite_chart(bar_chart_spec(cnt_sci, scientific_name_col, "건수", top=top_n, pct=True, **style), use_container_width=True)
+        st.dataframe(cnt_sci.head(200), use_container_width=True)
+
     else:
-        agg["비율"] = 0.0
-    return agg, total
+        st.subheader("국명 × 학명 동시 분포(교차표)")
+        cross = cross_counts(data_path, clean_cols, search, (korean_name_col, scientific_name_col))
+        st.caption(f"페어(국명-학명) {cross.shape[0]:,} 조합")
+        # 상위 조합만 표시할 수 있도록 제한
+        pairs, heat_opts = VIEW_DEF["crosses"][("국명", "학명")]
+        cross_top = cross.head(cross_pairs(pairs, top_n))
+        st.vega_lite_chart(cross_heat_spec(cross_top, korean_name_col, scientific_name_col,
+                                           label_font=label_font, bar_size=bar_size, **heat_opts),
+                           use_container_width=True)
+        with st.expander("교차표(상위 일부) 미리보기"):
+            st.dataframe(cross_top, use_container_width=True)
 
-# -----------------------------
-# 차트 공통 설정
-# -----------------------------
-alt.themes.enable("none")
-axis_y    = alt.Axis(title=None, labelFontSize=label_font)
-axis_xcnt = alt.Axis(title="건수", labelFontSize=label_font)
-axis_xpct = alt.Axis(title="비율", format="%", labelFontSize=label_font)
-
-def bar_chart(df_cnt, name_col, value_col="건수", top=20, pct=False):
-    # Top 정렬 및 순위 부여
-    src = df_cnt.sort_values("비율" if pct else value_col, ascending=False).head(top).copy()
-    src = src.reset_index(drop=True)
-    src["rank"] = src.index + 1
-
-    # Top 1~5 단계색, 6위 이후 회색
-    def rank_to_color(r: int) -> str:
-        if r == 1: return "#004488"   # 가장 진한 파랑
-        if r == 2: return "#2E6EB5"
-        if r == 3: return "#5B8BD5"
-        if r == 4: return "#87A9E2"
-        if r == 5: return "#B4C7EF"   # 가장 옅은 파랑
-        return "#D9D9D9"              # 6위 이후 회색
-
-    src["색상"] = src["rank"].apply(rank_to_color)
-
-    enc_x = alt.X(("비율:Q" if pct else "건수:Q"),
-                  axis=(axis_xpct if pct else axis_xcnt))
-
-    bars = (
-        alt.Chart(src)
-        .mark_bar(size=bar_size)
-        .encode(
-            y=alt.Y(f"{name_col}:N", sort="-x", axis=axis_y),
-            x=enc_x,
-            color=alt.Color("색상:N", legend=None, scale=None),  # 계산된 색상 직접 사용
-            tooltip=[
-                alt.Tooltip(f"{name_col}:N", title="이름"),
-                alt.Tooltip("건수:Q", format=",.0f"),
-                alt.Tooltip("비율:Q", format=".1%"),
-                alt.Tooltip("rank:Q", title="순위"),
-            ],
-        )
-        .properties(height=max(320, len(src) * (bar_size + 6)))
-    )
-
-    if show_labels:
-        texts = (
-            alt.Chart(src)
-            .mark_text(dx=3, align="left", baseline="middle", color="#222")
-            .encode(
-                y=alt.Y(f"{name_col}:N", sort="-x", axis=None),
-                x=enc_x,
-                text=alt.Text(("비율:Q" if pct else "건수:Q"),
-                              format=(".0%" if pct else ",.0f")),
-            )
-        )
-        return (bars + texts).configure_view(stroke=None).configure_axis(labelOverlap=False)
-
-    return bars.configure_view(stroke=None).configure_axis(labelOverlap=False)
 
+catalog_views(data_path, clean_cols, search)
 
 # -----------------------------
-# 레이아웃: 탭 3개
+# 데이터 품질 점검 (데이터 파일이 바뀔 때만 다시 계산: quality.py)
 # -----------------------------
-tab1, tab2, tab3 = st.tabs(["국명 집계", "학명 집계", "국명×학명 매트릭스"])
-
-with tab1:
-    cnt_kor, total_kor = count_by(korean_name_col)
-    st.caption(f"총 {total_kor:,} 건 · 고유 국명 {cnt_kor.shape[0]:,} 종")
-    c1, c2 = st.columns(2)
-    with c1:
-        st.subheader("국명 Top-N (건수)")
-        st.altair_chart(bar_chart(cnt_kor, korean_name_col, "건수", top=top_n, pct=False), use_container_width=True)
-    with c2:
-        st.subheader("국명 Top-N (비율)")
-        st.altair_chart(bar_chart(cnt_kor, korean_name_col, "건수", top=top_n, pct=True), use_container_width=True)
-    st.dataframe(cnt_kor.head(200), use_container_width=True)
-
-with tab2:
-    cnt_sci, total_sci = count_by(scientific_name_col)
-    st.caption(f"총 {total_sci:,} 건 · 고유 학명 {cnt_sci.shape[0]:,} 종")
-    c1, c2 = st.columns(2)
-    with c1:
-        st.subheader("학명 Top-N (건수)")
-        st.altair_chart(bar_chart(cnt_sci, scientific_name_col, "건수", top=top_n, pct=False), use_container_width=True)
-    with c2:
-        st.subheader("학명 Top-N (비율)")
-        st.altair_chart(bar_chart(cnt_sci, scientific_name_col, "건수", top=top_n, pct=True), use_container_width=True)
-    st.dataframe(cnt_sci.head(200), use_container_width=True)
-
-with tab3:
-    st.subheader("국명 × 학명 동시 분포(교차표)")
-    cross = (df[[korean_name_col, scientific_name_col]]
-                .dropna()
-                .groupby([korean_name_col, scientific_name_col], as_index=False)
-                .size()
-                .rename(columns={"size": "건수"}))
-    st.caption(f"페어(국명-학명) {cross.shape[0]:,} 조합")
-    # 상위 조합만 표시할 수 있도록 제한
-    cross_top = cross.sort_values("건수", ascending=False).head(top_n * 5)
-
-    heat = (
-        alt.Chart(cross_top)
-        .mark_rect()
-        .encode(
-            y=alt.Y(f"{korean_name_col}:N", sort="-x", axis=axis_y),
-            x=alt.X(f"{scientific_name_col}:N", axis=alt.Axis(labelAngle=-40, labelFontSize=label_font)),
-            color=alt.Color("건수:Q", title="건수"),
-            tooltip=[korean_name_col, scientific_name_col, alt.Tooltip("건수:Q", format=",.0f")],
-        )
-        .properties(height=max(360, len(cross_top[korean_name_col].unique()) * (bar_size // 2 + 4)))
-    )
-    st.altair_chart(heat.configure_view(stroke=None), use_container_width=True)
-    with st.expander("교차표(상위 일부) 미리보기"):
-        st.dataframe(cross_top, use_container_width=True)
+quality = quality_report(data_path)
+n_issues = issue_count(quality)
+with st.expander(f"데이터 품질 점검 · 확인 필요 {n_issues}건" if n_issues else "데이터 품질 점검 · 이상 없음"):
+    st.dataframe(quality, use_container_width=True, hide_index=True,
+                 column_config={"비율": st.column_config.NumberColumn(format="percent")})
+    st.caption("오류·경고는 원본 파일 수정이 필요한 항목, 참고는 집계에 영향이 없는 항목입니다. "
+               "결측 이름은 집계에서 제외됩니다.")
 
 # -----------------------------
 # 데이터 미리보기
@@ -228,3 +139,7 @@ with st.expander("원본 데이터 미리보기 / 컬럼 확인"):
     st.write("국명 컬럼:", korean_name_col)
     st.write("학명 컬럼:", scientific_name_col)
     st.dataframe(df_raw.head(30), use_container_width=True)
+    st.caption("컬럼별 메모리 사용량 (기본 로드 dtype → 범주형/Arrow 문자열 변환 후)")
+    st.dataframe(memory_report(data_path), use_container_width=True, hide_index=True)
+
+end_render()  # 페이지 실행 시간 기록 (metrics)
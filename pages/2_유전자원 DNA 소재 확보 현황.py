@@ -1,48 +1,34 @@
 # pages/2_분류군_국명_학명_집계.py
-import pandas as pd
 import streamlit as st
-import altair as alt
-from pathlib import Path
 from analytics import log_visit
+from warmup import start_warmup
+from metrics import end_render, timed_fragment
+from catalog import (CATALOG_FILES, CATALOG_VIEWS, DEFAULT_STYLE, DEFAULT_TOP_N, count_by, cross_counts, cross_pairs,
+                     find_col, load_table, memory_report, view_columns)
+from charts import bar_chart_spec, cross_heat_spec
+from quality import issue_count, quality_report
+from search_ui import build_search, search_controls
 
 st.set_page_config(page_title="유전자원 DNA 소재 확보 현황(분류군·국명·학명 집계)", layout="wide")
 log_visit("유전자원 DNA 소재 확보 현황(분류군·국명·학명 집계)")
+start_warmup()  # 프로세스 첫 실행 시 백그라운드 캐시 예열
 
 st.title("국립호남권생물자원관 유전자원 DNA 소재 확보 현황 · 분류군/국명/학명 집계")
 
 # -----------------------------
 # 데이터 경로 (CSV 권장)
 # -----------------------------
-DEFAULT_DATA = "data/국립호남권생물자원관_섬생물소재은행_유전자원 DNA 소재 확보 리스트_20250912.csv"
+DEFAULT_DATA = CATALOG_FILES["유전자원 DNA"]
+VIEW_DEF = CATALOG_VIEWS["유전자원 DNA"]  # 전처리 컬럼·교차표 옵션 (warmup 예열과 공용)
 data_path = st.sidebar.text_input("데이터 파일 경로", DEFAULT_DATA)
 st.sidebar.caption("국립호남권생물자원관이 보유하고 있는 유전자원 DNA 소재 확보 리스트 데이터입니다.")
 
-# 표시 옵션
-label_font  = st.sidebar.slider("축 글자 크기", 9, 16, 11)
-bar_size    = st.sidebar.slider("막대 두께(픽셀)", 10, 40, 20)
-top_n       = st.sidebar.slider("Top-N 표시 개수", 5, 50, 20)
-show_labels = st.sidebar.checkbox("막대 라벨 표시", True)
-search_kw   = st.sidebar.text_input("이름/학명/분류군 포함 검색", "")
+# 검색 조건 (바뀌면 검색 이후 단계만 다시 계산)
+search_kw, fuzzy_mode, fuzzy_k = search_controls("이름/학명/분류군 포함 검색")
 
 # -----------------------------
-# 데이터 로더
+# 데이터 로드
 # -----------------------------
-@st.cache_data
-def load_table(path_str: str) -> pd.DataFrame:
-    p = Path(path_str)
-    if not p.exists():
-        raise FileNotFoundError(f"파일을 찾을 수 없습니다: {p}")
-    if p.suffix.lower() == ".csv":
-        return pd.read_csv(p, encoding="utf-8-sig")
-    elif p.suffix.lower() in (".xls", ".xlsx"):
-        try:
-            import openpyxl  # noqa: F401
-        except ImportError:
-            raise ImportError("엑셀(.xlsx) 사용 시 `pip install openpyxl` 필요")
-        return pd.read_excel(p, engine="openpyxl")
-    else:
-        raise ValueError("지원 형식: .csv, .xlsx")
-
 try:
     df_raw = load_table(data_path)
 except Exception as e:
@@ -52,18 +38,9 @@ except Exception as e:
 # -----------------------------
 # 스키마 추론: 분류군/국명/학명 컬럼
 # -----------------------------
-cols_lower = {c: str(c).strip().lower() for c in df_raw.columns}
-
-def find_col(keys):
-    for c in df_raw.columns:
-        low = cols_lower[c]
-        if any(k in low for k in keys):
-            return c
-    return None
-
-taxon_col = find_col(["분류군", "taxon", "class", "군"])
-korean_col = find_col(["국명", "한글명", "korean", "이름"])
-sci_col = find_col(["학명", "scientific", "species", "binomial"])
+taxon_col = find_col(df_raw.columns, ["분류군", "taxon", "class", "군"])
+korean_col = find_col(df_raw.columns, ["국명", "한글명", "korean", "이름"])
+sci_col = find_col(df_raw.columns, ["학명", "scientific", "species", "binomial"])
 
 # 못 찾은 항목은 선택 박스로 수동 지정
 missing = []
@@ -81,167 +58,82 @@ if missing:
     with col3:
         sci_col = st.selectbox("학명 컬럼", df_raw.columns, index=2) if sci_col is None else sci_col
 
-# 문자열 정리
-df = df_raw.copy()
-for c in [taxon_col, korean_col, sci_col]:
-    df[c] = df[c].astype(str).str.strip()
-
-# 검색 필터
-if search_kw:
-    kw = str(search_kw).strip()
-    mask = (
-        df[taxon_col].str.contains(kw, case=False, na=False) |
-        df[korean_col].str.contains(kw, case=False, na=False) |
-        df[sci_col].str.contains(kw, case=False, na=False)
-    )
-    df = df[mask]
+# 문자열 정리 대상 — 실제 정리는 catalog 캐시 단계에서 1회만 수행
+clean_cols = view_columns(VIEW_DEF["clean"], {"분류군": taxon_col, "국명": korean_col, "학명": sci_col})
+
+# 검색 조건
+search = build_search(data_path, search_kw, clean_cols, sci_col, fuzzy_mode, fuzzy_k)
 
 # -----------------------------
-# 집계 유틸
+# 보기 영역 (fragment): 보기 선택·표시 옵션을 바꾸면 이 영역만 다시 실행
+#   의존성: data_path, clean_cols, search — 사이드바 데이터 조건이 바뀔 때만 전체 재실행
 # -----------------------------
-def count_by(col):
-    s = df[col].replace({"nan": None, "None": None}).dropna()
-    agg = s.value_counts().rename_axis(col).reset_index(name="건수")
-    total = int(agg["건수"].sum()) if not agg.empty else 0
-    agg["비율"] = 0 if total == 0 else agg["건수"] / total
-    return agg, total
-
-alt.themes.enable("none")
-axis_y    = alt.Axis(title=None, labelFontSize=label_font)
-axis_xcnt = alt.Axis(title="건수", labelFontSize=label_font)
-axis_xpct = alt.Axis(title="비율", format="%", labelFontSize=label_font)
-
-def bar_chart(df_cnt, name_col, value_col="건수", top=20, pct=False):
-    # Top 정렬 및 순위 부여
-    src = df_cnt.sort_values("비율" if pct else value_col, ascending=False).head(top).copy()
-    src = src.reset_index(drop=True)
-    src["rank"] = src.index + 1
-
-    # Top 1~5 단계색, 6위 이후 회색
-    def rank_to_color(r: int) -> str:
-        if r == 1: return "#004488"   # 가장 진한 파랑
-        if r == 2: return "#2E6EB5"
-        if r == 3: return "#5B8BD5"
-        if r == 4: return "#87A9E2"
-        if r == 5: return "#B4C7EF"   # 가장 옅은 파랑
-        return "#D9D9D9"              # 6위 이후 회색
-
-    src["색상"] = src["rank"].apply(rank_to_color)
-
-    enc_x = alt.X(("비율:Q" if pct else "건수:Q"),
-                  axis=(axis_xpct if pct else axis_xcnt))
-
-    bars = (
-        alt.Chart(src)
-        .mark_bar(size=bar_size)
-        .encode(
-            y=alt.Y(f"{name_col}:N", sort="-x", axis=axis_y),
-            x=enc_x,
-            color=alt.Color("색상:N", legend=None, scale=None),  # 계산된 색상 직접 사용
-            tooltip=[
-                alt.Tooltip(f"{name_col}:N", title="이름"),
-                alt.Tooltip("건수:Q", format=",.0f"),
-                alt.Tooltip("비율:Q", format=".1%"),
-                alt.Tooltip("rank:Q", title="순위"),
-            ],
-        )
-        .properties(height=max(320, len(src) * (bar_size + 6)))
-    )
-
-    if show_labels:
-        texts = (
-            alt.Chart(src)
-            .mark_text(dx=3, align="left", baseline="middle", color="#222")
-            .encode(
-                y=alt.Y(f"{name_col}:N", sort="-x", axis=None),
-                x=enc_x,
-                text=alt.Text(("비율:Q" if pct else "건수:Q"),
-                              format=(".0%" if pct else ",.0f")),
-            )
-        )
-        return (bars + texts).configure_view(stroke=None).configure_axis(labelOverlap=False)
-
-    return bars.configure_view(stroke=None).configure_axis(labelOverlap=False)
+VIEWS = ["분류군 집계", "국명 집계", "학명 집계", "분류군×국명", "분류군×학명"]
+
+@st.fragment
+@timed_fragment("유전자원 DNA 소재 확보 현황(분류군·국명·학명 집계)", "보기")  # 보기만 다시 실행될 때도 실행 시간 기록
+def catalog_views(data_path, clean_cols, search):
+    taxon_col, korean_col, sci_col = clean_cols
+
+    c_view, c_opt = st.columns([5, 1])
+    with c_view:
+        view = st.radio("보기 선택", VIEWS, horizontal=True, label_visibility="collapsed")
+    # 표시 옵션: 캐시된 집계로 차트만 다시 그림
+    with c_opt.popover("표시 옵션", use_container_width=True):
+        label_font  = st.slider("축 글자 크기", 9, 16, DEFAULT_STYLE["label_font"])
+        bar_size    = st.slider("막대 두께(픽셀)", 10, 40, DEFAULT_STYLE["bar_size"])
+        top_n       = st.slider("Top-N 표시 개수", 5, 50, DEFAULT_TOP_N)
+        show_labels = st.checkbox("막대 라벨 표시", DEFAULT_STYLE["show_labels"])
+    style = dict(label_font=label_font, bar_size=bar_size, show_labels=show_labels)
+
+    # 단일 컬럼 집계 보기: (컬럼, 라벨, 단위)
+    count_views = {
+        "분류군 집계": (taxon_col, "분류군", "개"),
+        "국명 집계": (korean_col, "국명", "종"),
+        "학명 집계": (sci_col, "학명", "종"),
+    }
+    # 교차 분포 보기: (행 컬럼, 열 컬럼, 보기 정의 키)
+    cross_views = {
+        "분류군×국명": (taxon_col, korean_col, ("분류군", "국명")),
+        "분류군×학명": (taxon_col, sci_col, ("분류군", "학명")),
+    }
+
+    if view in count_views:
+        col, label, unit = count_views[view]
+        cnt, tot = count_by(data_path, clean_cols, search, col)
+        st.caption(f"총 {tot:,} 건 · 고유 {label} {cnt.shape[0]:,}{unit}")
+        c1, c2 = st.columns(2)
+        with c1:
+            st.subheader(f"{label} Top-N (건수)")
+            st.vega_lite_chart(bar_chart_spec(cnt, col, "건수", top=top_n, pct=False, **style), use_container_width=True)
+        with c2:
+            st.subheader(f"{label} Top-N (비율)")
+            st.vega_lite_chart(bar_chart_spec(cnt, col, "건수", top=top_n, pct=True, **style), use_container_width=True)
+        st.dataframe(cnt.head(200), use_container_width=True)
 
+    else:
+        row_col, col_col, key = cross_views[view]
+        pairs, heat_opts = VIEW_DEF["crosses"][key]
+        st.subheader(view.replace("×", " × "))
+        # 상위 조합 제한(너무 많은 경우)
+        cross = cross_counts(data_path, clean_cols, search, (row_col, col_col)).head(cross_pairs(pairs, top_n))
+        st.vega_lite_chart(cross_heat_spec(cross, row_col, col_col, label_font=label_font, bar_size=bar_size,
+                                           **heat_opts),
+                           use_container_width=True)
 
-# -----------------------------
-# 탭 구성
-# -----------------------------
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "분류군 집계", "국명 집계", "학명 집계", "분류군×국명", "분류군×학명"
-])
-
-with tab1:
-    cnt_taxon, tot_taxon = count_by(taxon_col)
-    st.caption(f"총 {tot_taxon:,} 건 · 고유 분류군 {cnt_taxon.shape[0]:,}개")
-    c1, c2 = st.columns(2)
-    with c1:
-        st.subheader("분류군 Top-N (건수)")
-        st.altair_chart(bar_chart(cnt_taxon, taxon_col, "건수", top=top_n, pct=False), use_container_width=True)
-    with c2:
-        st.subheader("분류군 Top-N (비율)")
-        st.altair_chart(bar_chart(cnt_taxon, taxon_col, "건수", top=top_n, pct=True), use_container_width=True)
-    st.dataframe(cnt_taxon.head(200), use_container_width=True)
-
-with tab2:
-    cnt_kor, tot_kor = count_by(korean_col)
-    st.caption(f"총 {tot_kor:,} 건 · 고유 국명 {cnt_kor.shape[0]:,}종")
-    c1, c2 = st.columns(2)
-    with c1:
-        st.subheader("국명 Top-N (건수)")
-        st.altair_chart(bar_chart(cnt_kor, korean_col, "건수", top=top_n, pct=False), use_container_width=True)
-    with c2:
-        st.subheader("국명 Top-N (비율)")
-        st.altair_chart(bar_chart(cnt_kor, korean_col, "건수", top=top_n, pct=True), use_container_width=True)
-    st.dataframe(cnt_kor.head(200), use_container_width=True)
-
-with tab3:
-    cnt_sci, tot_sci = count_by(sci_col)
-    st.caption(f"총 {tot_sci:,} 건 · 고유 학명 {cnt_sci.shape[0]:,}종")
-    c1, c2 = st.columns(2)
-    with c1:
-        st.subheader("학명 Top-N (건수)")
-        st.altair_chart(bar_chart(cnt_sci, sci_col, "건수", top=top_n, pct=False), use_container_width=True)
-    with c2:
-        st.subheader("학명 Top-N (비율)")
-        st.altair_chart(bar_chart(cnt_sci, sci_col, "건수", top=top_n, pct=True), use_container_width=True)
-    st.dataframe(cnt_sci.head(200), use_container_width=True)
+
+catalog_views(data_path, clean_cols, search)
 
 # -----------------------------
-# 교차 분포 (히트맵)
+# 데이터 품질 점검 (데이터 파일이 바뀔 때만 다시 계산: quality.py)
 # -----------------------------
-def cross_heat(row_cols, col_cols, top_filter=top_n*5, y_label_size=label_font):
-    cross = (
-        df[row_cols + col_cols]
-        .dropna()
-        .groupby(row_cols + col_cols, as_index=False)
-        .size()
-        .rename(columns={"size": "건수"})
-    )
-    # 상위 조합 제한(너무 많은 경우)
-    cross = cross.sort_values("건수", ascending=False).head(top_filter)
-    y_name = row_cols[-1]
-    x_name = col_cols[-1]
-    heat = (
-        alt.Chart(cross)
-        .mark_rect()
-        .encode(
-            y=alt.Y(f"{y_name}:N", sort="-x", axis=alt.Axis(labelFontSize=y_label_size)),
-            x=alt.X(f"{x_name}:N", axis=alt.Axis(labelAngle=-40, labelFontSize=y_label_size)),
-            color=alt.Color("건수:Q", title="건수"),
-            tooltip=[y_name, x_name, alt.Tooltip("건수:Q", format=",.0f")],
-        )
-        .properties(height=max(360, len(cross[y_name].unique()) * (bar_size // 2 + 4)))
-    )
-    return heat.configure_view(stroke=None)
-
-with tab4:
-    st.subheader("분류군 × 국명")
-    st.altair_chart(cross_heat([taxon_col], [korean_col]), use_container_width=True)
-
-with tab5:
-    st.subheader("분류군 × 학명")
-    st.altair_chart(cross_heat([taxon_col], [sci_col]), use_container_width=True)
+quality = quality_report(data_path)
+n_issues = issue_count(quality)
+with st.expander(f"데이터 품질 점검 · 확인 필요 {n_issues}건" if n_issues else "데이터 품질 점검 · 이상 없음"):
+    st.dataframe(quality, use_container_width=True, hide_index=True,
+                 column_config={"비율": st.column_config.NumberColumn(format="percent")})
+    st.caption("오류·경고는 원본 파일 수정이 필요한 항목, 참고는 집계에 영향이 없는 항목입니다. "
+               "결측 이름은 집계에서 제외됩니다.")
 
 # -----------------------------
 # 데이터 미리보기
@@ -251,3 +143,7 @@ with st.expander("원본 데이터 미리보기 / 컬럼 확인"):
     st.write("국명 컬럼:", korean_col)
     st.write("학명 컬럼:", sci_col)
     st.dataframe(df_raw.head(30), use_container_width=True)
+    st.caption("컬럼별 메모리 사용량 (기본 로드 dtype → 범주형/Arrow 문자열 변환 후)")
+    st.dataframe(memory_report(data_path), use_container_width=True, hide_index=True)
+
+end_render()  # 페이지 실행 시간 기록 (metrics)
@@ -1,8 +1,12 @@
+import hashlib
 import streamlit as st
-import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+import pandas as pd
 from analytics import log_visit
+from board import (ADMIN_PASSWORD, STATUSES, add_comment, add_post, apply_changes, count_posts, editor_changes,
+                   get_post, list_comments, list_posts)
+from warmup import start_warmup
+from metrics import end_render
 
 # Streamlit Multi-page App Configuration (Optional, but good practice)
 st.set_page_config(
@@ -11,8 +15,9 @@ st.set_page_config(
     layout="wide",
 )
 log_visit("건의사항")
+start_warmup()  # 프로세스 첫 실행 시 백그라운드 캐시 예열
 # ==========================================================
-# 세션 상태 및 프론트엔드 유틸리티 함수
+# 세션 상태 (게시글은 board.py → 게시판.db posts 테이블)
 # ==========================================================
 
 # 세션 상태 초기화
@@ -22,74 +27,8 @@ if "show_write_form" not in st.session_state:
     st.session_state.show_write_form = False
 if "admin_ok" not in st.session_state:
     st.session_state["admin_ok"] = False # 관리자 상태 유지
-if "posts" not in st.session_state:
-    # 건의글을 저장할 리스트 (세션당 유지)
-    st.session_state.posts = [] 
-
-# -------------------------------
-# 데이터 처리 함수 (세션 상태 기반)
-# -------------------------------
-
-def get_total_posts(search_query: str = ""):
-    """전체 게시글 수를 반환합니다 (검색 필터링 포함)."""
-    if not st.session_state.posts:
-        return 0
-        
-    posts_df = pd.DataFrame(st.session_state.posts)
-    
-    if not search_query:
-        return len(posts_df)
-    
-    query = search_query.strip().lower()
-    # 제목, 작성자 기준으로 필터링
-    filtered_df = posts_df[
-        posts_df['제목'].str.lower().str.contains(query) | 
-        posts_df['작성자'].str.lower().str.contains(query)
-    ]
-    return len(filtered_df)
-
-def list_posts(limit: int, offset: int, search_query: str = ""):
-    """페이지네이션 및 검색 조건에 맞는 게시글 목록을 가져옵니다."""
-    
-    if not st.session_state.posts:
-        return pd.DataFrame({ "번호": [], "제목": [], "작성자": [], "작성일": [], "상태": [] })
-
-    df = pd.DataFrame(st.session_state.posts)
-
-    # 검색 필터링
-    if search_query:
-        query = search_query.strip().lower()
-        df = df[
-            df['제목'].str.lower().str.contains(query) | 
-            df['작성자'].str.lower().str.contains(query)
-        ]
-
-    # 페이지네이션 적용 (최신 글이 위에 오도록 ID 역순으로 정렬)
-    df_sorted = df.sort_values(by='번호', ascending=False)
-    
-    # 목록에 표시할 컬럼만 선택
-    display_cols = ["번호", "제목", "작성자", "작성일", "상태"]
-    return df_sorted[display_cols].iloc[offset:offset + limit].reset_index(drop=True)
-
-def add_post(author: str, title: str, content: str):
-    """세션 상태에 건의글을 추가합니다."""
-    
-    # 새 게시글 번호 (현재 목록 길이 + 1)
-    new_id = len(st.session_state.posts) + 1 
-    
-    new_post = {
-        "번호": new_id,
-        "제목": title,
-        "작성자": author,
-        # 작성 시각을 현재 시각으로 설정
-        "작성일": datetime.now().strftime("%Y.%m.%d"),
-        "상태": "답변대기", # 초기 상태는 답변대기
-        "내용": content # 상세 내용을 위해 내용도 저장
-    }
-    
-    # 세션 상태에 새 글 추가
-    st.session_state.posts.append(new_post)
-
+if "editor_gen" not in st.session_state:
+    st.session_state.editor_gen = 0 # 변경 적용 후 편집기 상태를 비우기 위한 key 번호
 
 # ==========================================================
 # UI 구현
@@ -121,17 +60,20 @@ with header_col2:
 def render_write_form():
     """글 작성 폼과 관리자 도구를 렌더링합니다."""
     with st.container(border=True):
-        st.subheader("새 글 작성 (세션 내 임시 저장)")
+        st.subheader("새 글 작성")
         
-        # 관리자 도구 (UI만 유지)
+        # 관리자 도구 (관리자 대시보드와 같은 비밀번호)
         st.caption("관리자 모드를 활성화하면 목록에서 '선택' 및 '상태' 변경 UI가 보입니다.")
         with st.expander("관리자 도구 설정", expanded=False):
             admin_mode = st.checkbox("관리자 모드 활성화", value=st.session_state["admin_ok"])
             
             if admin_mode:
-                admin_key = st.text_input("관리자 키", type="password", help="키에 관계없이 UI만 활성화됩니다.")
-                st.session_state["admin_ok"] = True
-                st.success("관리자 인증 완료 (프론트엔드 모드)")
+                admin_key = st.text_input("관리자 키", type="password")
+                st.session_state["admin_ok"] = st.session_state["admin_ok"] or admin_key == ADMIN_PASSWORD
+                if st.session_state["admin_ok"]:
+                    st.success("관리자 인증 완료")
+                else:
+                    st.info("관리자 키를 입력하세요.")
             else:
                 st.session_state["admin_ok"] = False
                 st.info("관리자 키를 입력하거나 비활성화하세요.")
@@ -157,7 +99,7 @@ def render_write_form():
                 st.warning("제목과 내용을 모두 입력해주세요.")
             else:
                 add_post(author.strip(), title.strip(), content.strip())
-                st.success(f"건의사항 '{title}'이(가) 세션에 저장되었습니다!")
+                st.success(f"건의사항 '{title}'이(가) 등록되었습니다!")
                 st.session_state.show_write_form = False # 폼 닫기
                 st.rerun()
 
@@ -171,13 +113,19 @@ if st.session_state.show_write_form:
 # -------------------------------
 
 # 페이지네이션 설정
-posts_per_page = 10 # 페이지당 10개로 고정
-total_posts = get_total_posts(search_query=search_query) 
+# 관리자는 한 번에 많은 글을 처리할 수 있도록 페이지 크기 선택
+if st.session_state.get("admin_ok"):
+    posts_per_page = st.selectbox("페이지당 글 수", [10, 50, 200, 500], key="posts_per_page")
+else:
+    posts_per_page = 10
+total_posts = count_posts(search_query)
 total_pages = int(np.ceil(total_posts / posts_per_page))
+# 삭제·페이지 크기 변경으로 현재 페이지가 범위를 벗어나면 마지막 페이지로
+st.session_state.current_page = max(1, min(st.session_state.current_page, total_pages))
 offset = (st.session_state.current_page - 1) * posts_per_page
 
 # 게시글 데이터 가져오기
-posts_df = list_posts(limit=posts_per_page, offset=offset, search_query=search_query)
+posts_df = list_posts(limit=posts_per_page, offset=offset, query=search_query)
 
 # CSS 스타일 정의
 st.markdown("""
@@ -193,6 +141,14 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+# 직전 일괄 처리 결과 (적용 후 새로 읽은 목록 위에 표시)
+result = st.session_state.pop("board_result", None)
+if result:
+    st.toast(f"상태 변경 {result['updated']}건 · 삭제 {result['deleted']}건 적용")
+    if result["conflicts"]:
+        st.warning("다른 관리자가 먼저 변경한 글은 적용하지 않았습니다 (새로 읽은 목록에서 다시 확인하세요): "
+                   + ", ".join(map(str, result["conflicts"])))
+
 if posts_df.empty:
     st.info("작성된 건의사항이 없습니다.")
 else:
@@ -200,28 +156,47 @@ else:
     if st.session_state.get("admin_ok"):
         # posts_df에 '선택' 컬럼 추가 (data_editor에서 사용)
         posts_df.loc[:, "선택"] = False
-        columns = ["선택", "번호", "제목", "작성자", "작성일", "상태"]
+        columns = ["선택", "번호", "제목", "작성자", "작성일", "상태", "댓글"]
     else:
-        columns = ["번호", "제목", "작성자", "작성일", "상태"]
+        columns = ["번호", "제목", "작성자", "작성일", "상태", "댓글"]
 
     # set_index('번호')를 사용하면 '번호'가 컬럼에서 제외되므로,
     # columns 리스트에서 '번호'를 제외한 리스트를 만들어 사용합니다.
     display_columns = [col for col in columns if col != "번호"]
-    
+    # 편집기 변경분은 행 위치로 기록되고 keyed 편집기는 데이터가 바뀌어도 변경분을 유지하므로,
+    # key에 페이지·페이지 크기·검색어를 넣고 처음 그린 목록(번호·버전·상태)을 저장해 그 목록에 맞춰 해석
+    view = hashlib.blake2b(f"{st.session_state.current_page}|{posts_per_page}|{search_query}".encode(),
+                           digest_size=6).hexdigest()
+    shown = posts_df[["번호", "버전", "상태"]].reset_index(drop=True)
+    editor_key = f"posts_editor_{st.session_state.editor_gen}_{view}"
+    saved = st.session_state.get(f"{editor_key}_shown")
+    if saved is not None and saved["번호"].tolist() != shown["번호"].tolist():
+        # 새 글 등록·삭제로 행 위치가 밀림 → 대기 중인 변경은 버리고 새 편집기로
+        if st.session_state.get(editor_key, {}).get("edited_rows"):
+            st.info("목록이 바뀌어 선택한 변경 사항을 초기화했습니다. 다시 선택해 주세요.")
+        st.session_state.editor_gen += 1
+        editor_key = f"posts_editor_{st.session_state.editor_gen}_{view}"
+        saved = None
+    if saved is None:
+        # 지난 편집기들의 저장 목록은 정리
+        for k in [k for k in st.session_state if str(k).startswith("posts_editor_") and str(k).endswith("_shown")]:
+            del st.session_state[k]
+        st.session_state[f"{editor_key}_shown"] = saved = shown
+
     # Streamlit Table/DataFrame 표시 (편집 가능한 상태로 렌더링)
     st.data_editor(
         posts_df.set_index('번호')[display_columns],
-        key="posts_editor",
+        key=editor_key,
         use_container_width=True,
         column_config={
             "제목": st.column_config.Column(
                 "제목",
-                help="클릭하면 상세 내용을 볼 수 있습니다. (기능 미구현)",
+                help="아래 '글 보기'에서 글을 고르면 본문과 답변·댓글을 볼 수 있습니다.",
                 width="large"
             ),
             "상태": st.column_config.SelectboxColumn(
                 "상태",
-                options=["답변대기", "답변완료"],
+                options=list(STATUSES),
                 disabled=not st.session_state.get("admin_ok") # 관리자가 아니면 편집 불가
             ),
             "선택": st.column_config.CheckboxColumn(
@@ -231,47 +206,87 @@ else:
             ),
         },
         hide_index=False,
-        # 프론트엔드 모드에서는 편집 잠금 (선택/상태는 위에서 따로 해제)
+        # 선택/상태 외 컬럼은 편집 잠금
         disabled=[col for col in display_columns if col not in ['선택', '상태']] 
     )
     
     # -------------------------------
-    # 삭제 기능 (관리자 전용) - UI만 유지
+    # 상태 변경·삭제 (관리자 전용)
     # -------------------------------
     if st.session_state.get("admin_ok"):
-        st.warning("경고: 현재 프론트엔드 모드입니다. 아래 버튼을 눌러도 데이터가 영구적으로 삭제되거나 상태가 변경되지 않습니다. (세션 내에서만 변경 가능)")
-        
-        # 실제 삭제/상태 변경 로직 (세션 상태 반영)
-        editor_data = st.session_state["posts_editor"]
-        
-        # 1. 삭제 로직 (선택된 항목이 있는 경우)
-        selected_indices = [idx for idx, selected in enumerate(editor_data['선택']) if selected]
-        
-        if selected_indices:
-            if st.button("선택된 건의사항 삭제", type="secondary"):
-                # 실제 st.session_state.posts에서 해당 번호의 항목을 찾아 제거해야 합니다.
-                
-                # 현재 페이지에 표시된 글의 번호 목록
-                current_page_post_numbers = posts_df.set_index('번호').index.tolist()
-                
-                # 삭제할 글의 번호
-                posts_to_delete_numbers = [current_page_post_numbers[i] for i in selected_indices]
-                
-                # 세션 상태 업데이트: 삭제할 번호가 아닌 글만 남김
-                st.session_state.posts = [
-                    post for post in st.session_state.posts 
-                    if post['번호'] not in posts_to_delete_numbers
-                ]
-                st.toast(f"{len(posts_to_delete_numbers)}개 건의글이 세션에서 삭제되었습니다.")
+        # 편집기의 변경분(edited_rows: {행 위치: {컬럼: 값}})만 읽어 저장해 둔 목록의 번호·버전으로 바꿈
+        edited_rows = st.session_state[editor_key]["edited_rows"]
+        status_changes, deletes = editor_changes(saved, edited_rows)
+
+        if status_changes or deletes:
+            st.caption(f"적용 대기: 상태 변경 {len(status_changes)}건 · 삭제 {len(deletes)}건")
+            if st.button("변경 사항 적용", type="primary"):
+                # 모든 변경을 한 트랜잭션으로 반영 (다른 관리자가 먼저 바꾼 글은 건너뜀)
+                result = apply_changes(status_changes, deletes)
+                st.session_state.editor_gen += 1  # 편집기 변경분 초기화
+                st.session_state["board_result"] = result
                 st.rerun()
 
-        # 2. 상태 변경 로직 (data_editor의 변화를 감지하여 세션에 반영)
-        # 이 부분은 data_editor가 변경되면 자동으로 st.session_state["posts_editor"]에 반영되므로
-        # 실제 DB라면 업데이트 쿼리를 날려야 하지만, 여기서는 임시로 처리합니다.
-        # Streamlit은 st.data_editor의 변경 시 리턴 값으로 변경된 DataFrame을 제공하지 않고
-        # st.session_state를 통해 접근해야 합니다. (복잡하므로 삭제만 명확히 구현하고 상태 변경은 UI만 표시)
+# -------------------------------
+# 글 보기: 본문 + 답변·댓글 스레드 (고른 글만 읽음)
+# -------------------------------
+COMMENTS_PER_PAGE = 20
+
+
+def load_more_comments(post_id: int):
+    """'댓글 더 보기' 콜백: 이미 불러온 마지막 id 다음부터 한 페이지만 읽어 이어 붙임"""
+    key = f"thread_{post_id}"
+    loaded = st.session_state[key]
+    after = int(loaded["id"].iloc[-1]) if len(loaded) else 0
+    st.session_state[key] = pd.concat([loaded, list_comments(post_id, COMMENTS_PER_PAGE, after)], ignore_index=True)
 
 
+@st.fragment
+def render_thread(post_id: int):
+    """글 본문과 댓글을 20개씩 불러오기 (이 영역의 버튼은 목록을 다시 읽지 않음)"""
+    post = get_post(post_id)
+    if post is None:
+        st.info("삭제된 글입니다.")
+        return
+    with st.container(border=True):
+        st.markdown(f"**{post['제목']}** · {post['작성자']} · {post['작성일시'][:16].replace('T', ' ')} · {post['상태']}")
+        st.write(post["내용"])
+
+    # 불러온 댓글은 세션에 쌓아 두고 '더 보기'로 한 페이지씩 추가
+    key = f"thread_{post_id}"
+    if key not in st.session_state:
+        st.session_state[key] = list_comments(post_id, COMMENTS_PER_PAGE)
+    loaded = st.session_state[key]
+
+    st.caption(f"답변·댓글 {post['댓글']}개 중 {len(loaded)}개 표시")
+    for c in loaded.itertuples(index=False):
+        with st.chat_message("assistant" if c.답변 else "user"):
+            st.markdown(f"**{c.작성자}**{' · 답변' if c.답변 else ''} · {c.작성일시[:16].replace('T', ' ')}")
+            st.write(c.내용)
+    if len(loaded) < post["댓글"]:
+        st.button("댓글 더 보기", key=f"more_{post_id}", on_click=load_more_comments, args=(post_id,))
+
+    with st.form(f"comment_form_{post_id}", clear_on_submit=True):
+        c_author, c_answer = st.columns([3, 1])
+        author = c_author.text_input("작성자", max_chars=50, value="관리자" if st.session_state.get("admin_ok") else "익명")
+        is_answer = c_answer.checkbox("답변으로 등록 (답변완료 처리)", disabled=not st.session_state.get("admin_ok"))
+        body = st.text_area("내용", height=100, max_chars=2000)
+        if st.form_submit_button("등록"):
+            if not body.strip():
+                st.warning("내용을 입력해주세요.")
+            elif add_comment(post_id, author.strip() or "익명", body.strip(), is_answer) is None:
+                st.warning("삭제된 글에는 댓글을 달 수 없습니다.")
+            else:
+                st.session_state.pop(key, None)  # 새 댓글 포함해 다시 불러오기
+                st.rerun()  # 목록의 댓글 수·상태도 갱신
+
+
+if not posts_df.empty:
+    labels = {int(r.번호): f"{r.번호} · {r.제목} (댓글 {r.댓글})" for r in posts_df.itertuples(index=False)}
+    opened = st.selectbox("글 보기", [None] + list(labels), format_func=lambda pid: "선택하세요" if pid is None else labels[pid])
+    if opened is not None:
+        render_thread(opened)
+
 st.divider()
 
 # -------------------------------
@@ -343,4 +358,6 @@ with col_write:
         st.rerun()
 
 
-st.caption("ⓒ 게시판 모듈 · Streamlit 프론트엔드 전용 (세션 상태 저장)")
\ No newline at end of file
+st.caption("ⓒ 게시판 모듈 · 게시판.db 저장")
+
+end_render()  # 페이지 실행 시간 기록 (metrics)
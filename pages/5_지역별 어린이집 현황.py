@@ -0,0 +1,135 @@
+# pages/5_지역별 어린이집 현황.py
+import altair as alt
+import numpy as np
+import pandas as pd
+import streamlit as st
+from analytics import log_visit
+from warmup import start_warmup
+from metrics import end_render
+from regional import CHILDCARE_FILES, load_childcare_cube, read_childcare_table
+
+st.set_page_config(page_title="지역별 어린이집 유형별 현황", layout="wide")
+log_visit("지역별 어린이집 유형별 현황")
+start_warmup()  # 프로세스 첫 실행 시 백그라운드 캐시 예열
+st.title("지역별 어린이집 유형별 분포 · 정원 현황")
+
+# -----------------------------
+# 데이터 (시도×도시규모×유형 큐브, 합계·비율은 로드 시 1회 계산)
+# -----------------------------
+try:
+    cube = load_childcare_cube()
+except Exception as e:
+    st.error(f"데이터 로드 오류: {e}")
+    st.stop()
+
+# -----------------------------
+# 사이드바 조건
+# -----------------------------
+measure = st.sidebar.radio("지표", cube.measures)
+scales = st.sidebar.multiselect("도시규모", cube.scales, default=list(cube.scales))
+st.sidebar.caption("data/ 폴더의 지역별 어린이집 유형별 분포(시설 수)·정원 현황 데이터입니다.")
+
+if not scales:
+    st.warning("도시규모를 하나 이상 선택하세요.")
+    st.stop()
+
+grid = cube.select(measure, scales)                 # [시도, 유형]
+share = cube.share(measure, scales)                 # [시도, 유형] 시도 내 구성비
+per_fac = cube.capacity_per_facility(scales)        # [시도, 유형] 시설당 정원
+
+# -----------------------------
+# 요약 지표
+# -----------------------------
+n_fac = int(cube.select("시설 수", scales).sum())
+n_cap = int(cube.select("정원", scales).sum())
+c1, c2, c3 = st.columns(3)
+c1.metric("시설 수 합계", f"{n_fac:,}개")
+c2.metric("정원 합계", f"{n_cap:,}명")
+c3.metric("시설당 평균 정원", f"{n_cap / n_fac:,.1f}명" if n_fac else "-")
+
+# -----------------------------
+# 시도별 합계 (유형 누적 막대)
+# -----------------------------
+st.subheader(f"시도별 {measure} (유형별 누적)")
+long = cube.long_frame(grid, measure)
+long["구성비"] = share.ravel()
+region_order = [cube.regions[i] for i in np.argsort(-grid.sum(axis=1), kind="stable")]
+stacked = (
+    alt.Chart(long[long[measure] > 0])
+    .mark_bar()
+    .encode(
+        y=alt.Y("시도:N", sort=region_order, title=None),
+        x=alt.X(f"{measure}:Q", title=measure),
+        color=alt.Color("유형:N", sort=list(cube.types)),
+        tooltip=["시도", "유형", alt.Tooltip(f"{measure}:Q", format=",.0f"),
+                 alt.Tooltip("구성비:Q", format=".1%")],
+    )
+    .properties(height=max(320, len(cube.regions) * 24))
+)
+st.altair_chart(stacked, use_container_width=True)
+
+# -----------------------------
+# 유형 구성비 · 시설당 정원 (히트맵)
+# -----------------------------
+c_left, c_right = st.columns(2)
+with c_left:
+    st.subheader(f"시도별 유형 구성비 ({measure})")
+    heat = (
+        alt.Chart(long)
+        .mark_rect()
+        .encode(
+            y=alt.Y("시도:N", sort=region_order, title=None),
+            x=alt.X("유형:N", sort=list(cube.types), title=None, axis=alt.Axis(labelAngle=-40)),
+            color=alt.Color("구성비:Q", legend=alt.Legend(format=".0%")),
+            tooltip=["시도", "유형", alt.Tooltip("구성비:Q", format=".1%")],
+        )
+        .properties(height=max(320, len(cube.regions) * 24))
+    )
+    st.altair_chart(heat, use_container_width=True)
+
+with c_right:
+    st.subheader("시설당 평균 정원")
+    fac = cube.long_frame(per_fac, "시설당 정원").dropna()
+    heat_fac = (
+        alt.Chart(fac)
+        .mark_rect()
+        .encode(
+            y=alt.Y("시도:N", sort=region_order, title=None),
+            x=alt.X("유형:N", sort=list(cube.types), title=None, axis=alt.Axis(labelAngle=-40)),
+            color=alt.Color("시설당 정원:Q", scale=alt.Scale(scheme="greens")),
+            tooltip=["시도", "유형", alt.Tooltip("시설당 정원:Q", format=",.1f")],
+        )
+        .properties(height=max(320, len(cube.regions) * 24))
+    )
+    st.altair_chart(heat_fac, use_container_width=True)
+
+# -----------------------------
+# 시도별 합계 표 (전국 대비 비율)
+# -----------------------------
+region_sum = grid.sum(axis=1)
+table = pd.DataFrame({
+    "시도": cube.regions,
+    measure: region_sum,
+    "전국 대비": region_sum / region_sum.sum() if region_sum.sum() else 0.0,
+})
+table = pd.concat([table, pd.DataFrame(grid, columns=cube.types)], axis=1)
+st.dataframe(
+    table.sort_values(measure, ascending=False),
+    use_container_width=True,
+    hide_index=True,
+    column_config={"전국 대비": st.column_config.NumberColumn(format="percent")},
+)
+
+# -----------------------------
+# 데이터 미리보기
+# -----------------------------
+with st.expander("원본 데이터 미리보기 / 컬럼 확인"):
+    if cube.mismatches:
+        st.caption("※ '계'와 유형별 합이 다른 행: " + ", ".join(f"{m} · {lbl}" for m, lbl in cube.mismatches)
+                   + " (본 페이지는 유형별 값 합계를 사용)")
+    for m, path in CHILDCARE_FILES.items():
+        st.write(f"{m}:", path)
+        st.dataframe(read_childcare_table(path).head(10), use_container_width=True, hide_index=True)
+    st.write(f"큐브 크기: {cube.values.shape} · {cube.values.dtype} · {cube.values.nbytes:,} bytes")
+
+end_render()  # 페이지 실행 시간 기록 (metrics)
@@ -0,0 +1,107 @@
+# pages/6_보육교사 자격급수 현황.py
+import altair as alt
+import streamlit as st
+from analytics import log_visit
+from warmup import start_warmup
+from metrics import end_render
+from regional import TEACHER_DIMS, TEACHER_FILE, TEACHER_VALUE, load_teacher_cube
+
+st.set_page_config(page_title="보육교사 자격급수 현황", layout="wide")
+log_visit("보육교사 자격급수 현황")
+start_warmup()  # 프로세스 첫 실행 시 백그라운드 캐시 예열
+st.title("지역별 보육교사 자격급수 현황 · 슬라이스/피벗")
+
+# -----------------------------
+# 데이터 (시도×자격급수×유형 큐브, 모든 주변합은 로드 시 1회 계산)
+# -----------------------------
+try:
+    cube = load_teacher_cube()
+except Exception as e:
+    st.error(f"데이터 로드 오류: {e}")
+    st.stop()
+
+# -----------------------------
+# 사이드바: 슬라이스/다이스 조건 (차원별 선택)
+# -----------------------------
+st.sidebar.caption(f"{TEACHER_FILE} 데이터를 사용합니다.")
+filters = {}
+for d in TEACHER_DIMS:
+    filters[d] = st.sidebar.multiselect(d, cube.labels[d], default=list(cube.labels[d]))
+
+empty = [d for d, sel in filters.items() if not sel]
+if empty:
+    st.warning(f"{', '.join(empty)}을(를) 하나 이상 선택하세요.")
+    st.stop()
+
+# -----------------------------
+# 요약 지표
+# -----------------------------
+total = int(cube.cut((), filters))
+by_grade = cube.pivot("자격급수", filters=filters)[TEACHER_VALUE]
+cols = st.columns(1 + len(by_grade))
+cols[0].metric("보육교사 수", f"{total:,}명")
+for c, (grade, n) in zip(cols[1:], by_grade.items()):
+    c.metric(grade, f"{int(n):,}명", f"{n / total:.1%}" if total else None, delta_color="off")
+
+# -----------------------------
+# 피벗 (행/열 차원 선택)
+# -----------------------------
+c_row, c_col = st.columns(2)
+with c_row:
+    row_dim = st.selectbox("행 차원", TEACHER_DIMS, index=0)
+with c_col:
+    col_options = ["(없음)"] + [d for d in TEACHER_DIMS if d != row_dim]
+    col_dim = st.selectbox("열 차원", col_options, index=1)
+col_dim = None if col_dim == "(없음)" else col_dim
+as_ratio = st.checkbox("행 합계 대비 비율로 보기", False, disabled=col_dim is None)
+
+table = cube.pivot(row_dim, col_dim, filters)
+
+if col_dim is None:
+    st.subheader(f"{row_dim}별 {TEACHER_VALUE}")
+    src = table.reset_index()
+    bars = (
+        alt.Chart(src)
+        .mark_bar()
+        .encode(
+            y=alt.Y(f"{row_dim}:N", sort="-x", title=None),
+            x=alt.X(f"{TEACHER_VALUE}:Q", title=TEACHER_VALUE),
+            tooltip=[row_dim, alt.Tooltip(f"{TEACHER_VALUE}:Q", format=",.0f")],
+        )
+        .properties(height=max(240, len(src) * 24))
+    )
+    st.altair_chart(bars, use_container_width=True)
+    st.dataframe(table, use_container_width=True)
+else:
+    st.subheader(f"{row_dim} × {col_dim}")
+    body = table.drop(index="합계", columns="합계")
+    if as_ratio:
+        body = body.div(body.sum(axis=1).where(lambda s: s > 0), axis=0).fillna(0.0)
+    value_name = "비율" if as_ratio else TEACHER_VALUE
+    long = body.stack().rename(value_name).reset_index()
+    heat = (
+        alt.Chart(long)
+        .mark_rect()
+        .encode(
+            y=alt.Y(f"{row_dim}:N", sort=list(body.index), title=None),
+            x=alt.X(f"{col_dim}:N", sort=list(body.columns), title=None, axis=alt.Axis(labelAngle=-40)),
+            color=alt.Color(f"{value_name}:Q", legend=alt.Legend(format=".0%" if as_ratio else ",.0f")),
+            tooltip=[row_dim, col_dim, alt.Tooltip(f"{value_name}:Q", format=".1%" if as_ratio else ",.0f")],
+        )
+        .properties(height=max(240, len(body) * 24))
+    )
+    st.altair_chart(heat, use_container_width=True)
+    if as_ratio:
+        st.dataframe(body.style.format("{:.1%}"), use_container_width=True)
+    else:
+        st.dataframe(table, use_container_width=True)
+
+# -----------------------------
+# 큐브 정보
+# -----------------------------
+with st.expander("큐브 구조 보기"):
+    st.write("차원:", " × ".join(f"{d}({len(cube.labels[d])})" for d in cube.dims))
+    st.write(f"값 배열: {cube.values.shape} · {cube.values.dtype} · {cube.values.nbytes:,} bytes")
+    st.write("미리 계산한 주변합:", ", ".join("(" + ", ".join(k) + ")" if k else "(전체)" for k in cube.marginals))
+
+end_render()  # 페이지 실행 시간 기록 (metrics)
@@ -0,0 +1,115 @@
+# pages/7_소재 변경 이력.py
+import altair as alt
+import streamlit as st
+from analytics import log_visit
+from warmup import start_warmup
+from metrics import end_render
+from snapshots import (CHANGES, collection_label, collections, holdings_counts, refresh_snapshots, release_deltas,
+                       release_history, release_signature)
+
+st.set_page_config(page_title="소재 확보 리스트 변경 이력", layout="wide")
+log_visit("소재 확보 리스트 변경 이력")
+start_warmup()  # 프로세스 첫 실행 시 백그라운드 캐시 예열
+st.title("소재 확보 리스트 릴리스별 변경 이력")
+
+# -----------------------------
+# 데이터 (수집 시 계산해 둔 릴리스 간 변경분만 읽음)
+# -----------------------------
+try:
+    refresh_snapshots()
+    names = collections()
+except Exception as e:
+    st.error(f"데이터 로드 오류: {e}")
+    st.stop()
+
+if not names:
+    st.info("data/ 폴더에 `<리스트 이름>_YYYYMMDD.csv` 형식의 릴리스 파일이 없습니다.")
+    st.stop()
+
+collection = st.sidebar.selectbox("소재 리스트", names, format_func=collection_label)
+st.sidebar.caption("data/ 의 같은 리스트 파일을 날짜(파일명 끝 YYYYMMDD)순으로 비교합니다. "
+                   "(분류군, 국명, 학명, 분양가능여부) 조합별 건수 기준")
+
+# -----------------------------
+# 릴리스 목록
+# -----------------------------
+history = release_history(collection)
+st.subheader(f"{collection_label(collection)} 릴리스")
+st.dataframe(history, use_container_width=True, hide_index=True)
+
+# -----------------------------
+# 보유 현황 추이 (모든 릴리스를 병렬로 읽어 합친 표에서 릴리스×항목별 건수를 한 번 계산)
+# -----------------------------
+st.subheader("릴리스별 보유 현황 추이")
+c_by, c_pick = st.columns([1, 3])
+with c_by:
+    by = st.radio("기준", ["분류군", "학명", "국명"], horizontal=True)
+counts = holdings_counts(collection, release_signature(collection), by)
+latest = counts[counts["릴리스"] == counts["릴리스"].max()].sort_values("건수", ascending=False)
+with c_pick:
+    default = list(latest[by].head(5 if by == "분류군" else 8))
+    picked = st.multiselect(f"{by} 선택 (기본: 최신 릴리스 상위)", sorted(counts[by].unique()), default=default)
+trend = counts[counts[by].isin(picked)]
+if trend.empty:
+    st.info(f"{by}을(를) 하나 이상 선택하세요.")
+else:
+    line = (
+        alt.Chart(trend)
+        .mark_line(point=True)
+        .encode(
+            x=alt.X("릴리스:T", title="릴리스"),
+            y=alt.Y("건수:Q"),
+            color=alt.Color(f"{by}:N", sort=picked),
+            tooltip=[alt.Tooltip("릴리스:T", format="%Y-%m-%d"), by, "건수"],
+        )
+    )
+    st.altair_chart(line, use_container_width=True)
+
+compared = history.dropna(subset=["이전 릴리스"])
+if compared.empty:
+    st.info("비교할 이전 릴리스가 없습니다. 같은 이름에 날짜만 다른 새 릴리스 파일을 data/ 에 넣으면 "
+            "다음 수집 때(최대 5분) 직전 릴리스와의 변경분이 계산됩니다.")
+    end_render()
+    st.stop()
+
+# -----------------------------
+# 릴리스 간 변경분
+# -----------------------------
+pairs = list(zip(compared["이전 릴리스"], compared["릴리스"]))
+from_rel, to_rel = st.selectbox("비교", pairs[::-1], format_func=lambda p: f"{p[0]} → {p[1]}")
+delta = release_deltas(collection, from_rel, to_rel)
+
+c1, c2, c3 = st.columns(3)
+for col, change in zip((c1, c2, c3), CHANGES):
+    col.metric(change, f"{int(delta.loc[delta['변경'] == change, '건수'].sum()):,}건")
+
+if delta.empty:
+    st.info("두 릴리스의 내용이 같습니다.")
+else:
+    f_change, f_text = st.columns([2, 3])
+    with f_change:
+        show = st.multiselect("변경 유형", CHANGES, default=list(CHANGES))
+    with f_text:
+        kw = st.text_input("분류군/국명/학명 포함 검색", "").strip()
+    view = delta[delta["변경"].isin(show)]
+    if kw:
+        hit = view[["분류군", "국명", "학명"]].apply(lambda s: s.str.contains(kw, case=False, regex=False)).any(axis=1)
+        view = view[hit]
+
+    st.subheader("분류군별 변경 건수")
+    by_taxon = view.groupby(["분류군", "변경"], as_index=False)["건수"].sum()
+    chart = (
+        alt.Chart(by_taxon)
+        .mark_bar()
+        .encode(
+            y=alt.Y("분류군:N", sort="-x", title=None),
+            x=alt.X("건수:Q"),
+            color=alt.Color("변경:N", sort=list(CHANGES)),
+            tooltip=["분류군", "변경", "건수"],
+        )
+        .properties(height=max(160, by_taxon["분류군"].nunique() * 28))
+    )
+    st.altair_chart(chart, use_container_width=True)
+    st.dataframe(view, use_container_width=True, hide_index=True)
+
+end_render()  # 페이지 실행 시간 기록 (metrics)
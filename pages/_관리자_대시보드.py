@@ -2,14 +2,21 @@
 import streamlit as st
 import pandas as pd
 import altair as alt
-from analytics import load_logs
+from analytics import (RETENTION_MONTHS, compact_logs, log_date_range, log_page, log_storage_status,
+                       recent_visits)
+from board import ADMIN_PASSWORD
+from cache_store import STORE, cache_summary
+from warmup import start_warmup
+from metrics import end_render, start_render
+from rollups import WEEKDAYS, hourly_heatmap, session_path, session_report, update_rollups, visit_rollups
 
 st.set_page_config(page_title="관리자 대시보드", layout="wide")
+warmup = start_warmup()
+start_render("관리자 대시보드")  # 페이지 실행 시간 측정 (metrics)
 
 st.title("관리자 대시보드")
 
-# 1) 비밀번호 체크
-ADMIN_PASSWORD = "hnibr1234" 
+# 1) 비밀번호 체크 (board.ADMIN_PASSWORD, 건의사항 관리자 모드와 공용)
 
 pwd = st.text_input("관리자 비밀번호", type="password")
 if pwd != ADMIN_PASSWORD:
@@ -18,37 +25,103 @@ if pwd != ADMIN_PASSWORD:
 
 st.success("관리자 모드 접속 완료 ✅")
 
-# 2) 로그 불러오기
-df = load_logs()
+# 실시간 현황 (이 서버 프로세스의 링 버퍼, 5초마다 이 영역만 갱신)
+@st.fragment(run_every=5)
+def live_panel():
+    buf = recent_visits()
+    per_min = buf.views_per_minute(30)
+    this_min = per_min[per_min["minute"] == per_min["minute"].max()]["views"].sum() if len(per_min) else 0
+    c1, c2, c3 = st.columns(3)
+    c1.metric("활성 세션 (최근 5분)", f"{buf.active_sessions(300):,}")
+    c2.metric("이번 분 조회수", f"{int(this_min):,}")
+    c3.metric("버퍼 이벤트", f"{len(buf):,}")
+    if per_min.empty:
+        st.caption("최근 30분 동안 방문이 없습니다.")
+        return
+    chart = (
+        alt.Chart(per_min)
+        .mark_bar()
+        .encode(
+            x=alt.X("minute:T", title="분", timeUnit="hoursminutes"),
+            y=alt.Y("views:Q", title="조회수", stack=True),
+            color=alt.Color("page:N", title="페이지"),
+            tooltip=[alt.Tooltip("minute:T", format="%H:%M"), "page:N", "views:Q"],
+        )
+        .properties(height=220)
+    )
+    st.altair_chart(chart, use_container_width=True)
+
+
+st.subheader("실시간 현황")
+st.caption("이 서버 프로세스가 받은 최근 방문만 집계합니다 (5초마다 갱신, SQLite 조회 없음).")
+live_panel()
+
+# 캐시 예열 상태
+with st.expander("캐시 예열 상태", expanded=not warmup.ready):
+    if warmup.ready:
+        st.write(f"예열 완료 · 소요 {warmup.elapsed:.2f}초")
+    else:
+        st.write(f"예열 진행 중 · 경과 {warmup.elapsed:.1f}초")
+    st.dataframe(pd.DataFrame(warmup.rows()), use_container_width=True, hide_index=True)
+
+# 데이터 캐시 메모리 (예산 초과 시 오래 안 쓴 항목부터 제거)
+with st.expander("데이터 캐시 메모리"):
+    summary = cache_summary()
+    cols = st.columns(len(summary))
+    for c, (k, v) in zip(cols, summary.items()):
+        c.metric(k, v)
+    st.progress(min(1.0, summary["사용(MB)"] / summary["예산(MB)"]) if summary["예산(MB)"] else 0.0)
+    resident = STORE.resident.rows()
+    if resident:
+        st.dataframe(pd.DataFrame(resident), use_container_width=True, hide_index=True)
+    else:
+        st.write("상주 중인 데이터가 없습니다.")
+
+# 방문 로그 저장소 (월별 파티션 + 압축 보관)
+with st.expander("방문 로그 저장소"):
+    parts, archives = log_storage_status()
+    c_live, c_arch = st.columns(2)
+    with c_live:
+        st.write("SQLite 월별 파티션")
+        st.dataframe(parts, use_container_width=True, hide_index=True)
+    with c_arch:
+        st.write("압축 보관된 달 (Parquet)")
+        st.dataframe(archives, use_container_width=True, hide_index=True)
+    if st.button("집계 지금 반영", help="방문 로그 기록 스레드를 거치지 않고 들어온 행까지 집계 테이블에 반영합니다."):
+        n = update_rollups()
+        visit_rollups.clear()
+        session_report.clear()
+        hourly_heatmap.clear()
+        st.success(f"새 로그 {n:,}건 반영" if n else "반영할 새 로그가 없습니다.")
+    retention = st.number_input("SQLite 보관 기간(개월, 이번 달 포함)", 1, 36, RETENTION_MONTHS)
+    if st.button("보관 기간 지난 로그 압축 보관"):
+        done = compact_logs(retention)
+        visit_rollups.clear()
+        session_report.clear()
+        hourly_heatmap.clear()
+        st.success(f"{len(done)}개월 보관 완료" if done else "보관할 달이 없습니다.")
+
+# 2) 로그 기간 (집계는 visit_rollups에서 1분 캐시)
+date_min, date_max = log_date_range()
 
-if df.empty:
+if date_min is None:
     st.warning("아직 방문 로그가 없습니다.")
     st.stop()
 
 # 날짜 필터
-date_min = df["date"].min()
-date_max = df["date"].max()
 col1, col2 = st.columns(2)
 with col1:
     start_date = st.date_input("시작일", value=pd.to_datetime(date_min))
 with col2:
     end_date = st.date_input("종료일", value=pd.to_datetime(date_max))
 
-mask = (pd.to_datetime(df["date"]) >= pd.to_datetime(start_date)) & (
-    pd.to_datetime(df["date"]) <= pd.to_datetime(end_date)
-)
-df_filtered = df[mask]
+n_logs, daily, page_counts = visit_rollups(start_date.isoformat(), end_date.isoformat())
 
-st.write(f"선택 기간 방문 로그 수: {len(df_filtered)}건")
+st.write(f"선택 기간 방문 로그 수: {n_logs}건")
+st.caption("집계는 최대 1분 간격으로 갱신됩니다.")
 
 # 일자별 방문자
 st.subheader("일자별 방문자 수 (세션 기준)")
-daily = (
-    df_filtered.groupby("date")["session_id"]
-    .nunique()
-    .reset_index(name="visitors")
-)
-
 chart_daily = (
     alt.Chart(daily)
     .mark_line(point=True)
@@ -60,17 +133,110 @@ chart_daily = (
 )
 st.altair_chart(chart_daily, use_container_width=True)
 
+# 요일×시간대 (SQLite 시간대별 집계: rollups.hourly_visits)
+st.subheader("요일 × 시간대별 조회수")
+heat = hourly_heatmap(start_date.isoformat(), end_date.isoformat())
+metric = st.radio("값", ["평균", "최대", "합계"], horizontal=True,
+                  captions=["해당 요일 하루 평균", "가장 많았던 날", "기간 합계"])
+peak = heat.loc[heat["최대"].idxmax()]
+c1, c2, c3 = st.columns(3)
+c1.metric("가장 붐비는 시간대 (평균)", f"{heat.loc[heat['평균'].idxmax(), '요일']}요일 "
+          f"{int(heat.loc[heat['평균'].idxmax(), '시'])}시")
+c2.metric("시간당 최대 조회수", f"{int(peak['최대']):,}건", f"{peak['요일']}요일 {int(peak['시'])}시",
+          delta_color="off")
+c3.metric("최대 시간대 초당 조회", f"{peak['최대'] / 3600:.3f}건/초")
+chart_heat = (
+    alt.Chart(heat)
+    .mark_rect()
+    .encode(
+        x=alt.X("시:O", title="시"),
+        y=alt.Y("요일:N", sort=list(WEEKDAYS), title=None),
+        color=alt.Color(f"{metric}:Q", scale=alt.Scale(scheme="orangered")),
+        tooltip=["요일", "시", "평균", "최대", "합계"],
+    )
+    .properties(height=240)
+)
+st.altair_chart(chart_heat, use_container_width=True)
+
 # 페이지별 조회수
 st.subheader("페이지별 조회수")
-page_counts = (
-    df_filtered.groupby("page")["id"].count().reset_index(name="views")
-    .sort_values("views", ascending=False)
-)
 st.table(page_counts)
 
-# 원시 로그
-with st.expander("원시 로그 데이터 보기"):
-    st.dataframe(
-        df_filtered.sort_values("timestamp", ascending=False),
-        use_container_width=True,
+# 세션 경로 분석 (SQLite 증분 집계: rollups.py)
+st.subheader("세션 경로 분석")
+report = session_report(start_date.isoformat(), end_date.isoformat())
+st.caption(f"선택 기간에 시작한 세션 {report['세션 수']:,}개 기준")
+
+funnel = report["퍼널"]
+c_funnel, c_table = st.columns([3, 2])
+with c_funnel:
+    chart_funnel = (
+        alt.Chart(funnel)
+        .mark_bar()
+        .encode(
+            y=alt.Y("단계:N", sort=list(funnel["단계"]), title=None),
+            x=alt.X("세션:Q"),
+            tooltip=["단계", "세션", alt.Tooltip("이전 단계 대비:Q", format=".1%")],
+        )
     )
+    st.altair_chart(chart_funnel, use_container_width=True)
+with c_table:
+    st.dataframe(funnel, use_container_width=True, hide_index=True,
+                 column_config={"이전 단계 대비": st.column_config.NumberColumn(format="percent")})
+
+c_entry, c_exit = st.columns(2)
+with c_entry:
+    st.write("진입 페이지")
+    st.dataframe(report["진입"], use_container_width=True, hide_index=True)
+with c_exit:
+    st.write("이탈 페이지")
+    st.dataframe(report["이탈"], use_container_width=True, hide_index=True)
+
+c_move, c_dwell = st.columns(2)
+with c_move:
+    st.write("페이지 이동 (상위 50)")
+    st.dataframe(report["이동"], use_container_width=True, hide_index=True)
+with c_dwell:
+    st.write("페이지 평균 체류 시간")
+    st.dataframe(report["체류"], use_container_width=True, hide_index=True)
+
+sid = st.text_input("세션 ID로 이동 경로 조회")
+if sid:
+    path = session_path(sid.strip())
+    if path.empty:
+        st.info("해당 세션의 로그가 없습니다.")
+    else:
+        st.dataframe(path, use_container_width=True, hide_index=True)
+
+# 원시 로그 (SQLite에서 한 페이지씩: 최신순 키셋 페이지네이션)
+PAGE_SIZE = 50
+with st.expander("원시 로그 데이터 보기"):
+    f_page, f_session = st.columns(2)
+    with f_page:
+        page_filter = st.selectbox("페이지", ["(전체)"] + list(page_counts["page"]))
+    with f_session:
+        session_filter = st.text_input("세션 ID", key="raw_log_session").strip()
+    query = (start_date.isoformat(), end_date.isoformat(),
+             None if page_filter == "(전체)" else page_filter, session_filter or None)
+
+    # 조건이 바뀌면 첫 페이지로 (cursors: 각 페이지 시작 위치 (timestamp, id) 목록)
+    if st.session_state.get("raw_log_query") != query:
+        st.session_state["raw_log_query"] = query
+        st.session_state["raw_log_cursors"] = [None]
+    cursors = st.session_state["raw_log_cursors"]
+
+    rows = log_page(*query, before=cursors[-1], limit=PAGE_SIZE + 1)  # 1행 더 읽어 다음 페이지 여부 확인
+    has_next = len(rows) > PAGE_SIZE
+    rows = rows.head(PAGE_SIZE)
+
+    c_prev, c_info, c_next = st.columns([1, 3, 1])
+    if c_prev.button("◀ 이전", disabled=len(cursors) == 1):
+        cursors.pop()
+        st.rerun()
+    if c_next.button("다음 ▶", disabled=not has_next):
+        cursors.append((rows["timestamp"].iloc[-1], int(rows["id"].iloc[-1])))
+        st.rerun()
+    c_info.caption(f"{len(cursors)}페이지 · 페이지당 {PAGE_SIZE}건 (압축 보관된 달은 제외)")
+    st.dataframe(rows, use_container_width=True, hide_index=True)
+
+end_render()  # 페이지 실행 시간 기록 (metrics)
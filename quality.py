@@ -0,0 +1,92 @@
+# quality.py
+"""소재 확보 리스트 데이터 품질 점검 (데이터 파일 버전별 1회, 벡터 연산)
+
+이름 결측, 결측 표기 문자열('nan' 등), 학명 형식, 알 수 없는 분류군·분양가능여부 값, 중복 자원번호를
+컬럼 단위 벡터 연산으로 검사해 표 하나로 돌려준다. 결과는 cache_store에 파일 지문과 함께 저장되므로
+데이터 파일이 바뀔 때만 다시 계산하고, 페이지 1~3은 이 표를 보여 주기만 한다.
+결측 표기 정리 자체는 catalog.clean_table에서 한 번 하므로 집계 단계에서는 다시 정리하지 않는다.
+"""
+import pandas as pd
+
+from cache_store import cached
+from catalog import COLUMN_KEYS, clean_table, find_col, load_table
+
+# 분류군 표준 목록 (새 분류군이 들어오면 여기에 추가)
+KNOWN_TAXA = (
+    "균류", "세균류", "관속식물류", "선태류", "지의류", "조류", "해조류", "와편모조류",
+    "어류", "곤충류", "무척추동물류(곤충제외)", "양서파충류", "포유류",
+)
+AVAILABILITY_VALUES = ("가능", "불가능")
+
+# 학명: 속명(대문자 + 소문자) 뒤에 종소명·명명자 등. 한글이나 연속 공백이 있으면 형식 오류
+SCI_NAME_RE = r"^[A-Z][a-z]+(?: \S.*)?$"
+SCI_NAME_BAD_RE = r"[가-힣]|\s{2,}"
+
+# 자원번호(accession) 컬럼 후보 — 없으면 모든 값이 같은 행의 반복을 참고로만 보고
+ACCESSION_KEYS = ["자원번호", "accession", "등록번호", "관리번호", "소재번호"]
+
+REPORT_COLUMNS = ["검사", "컬럼", "심각도", "건수", "비율", "예시"]
+SEVERITIES = ("오류", "경고", "참고")
+EXAMPLES = 3
+
+
+def _examples(values: pd.Series) -> str:
+    return ", ".join(map(str, values.dropna().unique()[:EXAMPLES]))
+
+
+@cached(paths=("path_str",))
+def quality_report(path_str: str) -> pd.DataFrame:
+    """검사별 (검사, 컬럼, 심각도, 건수, 비율, 예시) 표"""
+    raw = load_table(path_str)
+    found = {key: find_col(raw.columns, keys) for key, keys in COLUMN_KEYS.items()}
+    accession = find_col(raw.columns, ACCESSION_KEYS)
+    cols = tuple(c for c in (*found.values(), accession) if c is not None)
+    df = clean_table(path_str, cols)
+    n = len(df)
+    rows = []
+
+    def add(check, col, severity, mask, examples=""):
+        rows.append((check, col, severity, int(mask.sum()), examples))
+
+    for key, col in found.items():
+        if col is None:
+            rows.append(("컬럼 없음", key, "오류", n, ""))
+
+    # 결측 표기 문자열: 원본에서는 값이 있었는데 정리 후 결측이 된 칸
+    for col in cols:
+        placeholder = df[col].isna() & raw[col].notna()
+        if placeholder.any():
+            add("결측 표기 문자열", col, "참고", placeholder, _examples(raw[col][placeholder]))
+
+    for key, severity in (("국명", "경고"), ("학명", "오류")):
+        if found[key] is not None:
+            add("이름 결측", found[key], severity, df[found[key]].isna())
+
+    if found["학명"] is not None:
+        sci = df[found["학명"]].astype(pd.StringDtype("pyarrow"))
+        bad = sci.notna() & (~sci.str.match(SCI_NAME_RE, na=True) | sci.str.contains(SCI_NAME_BAD_RE, na=False))
+        bad = bad.fillna(False).astype(bool)
+        add("학명 형식 오류", found["학명"], "오류", bad, _examples(sci[bad]))
+
+    for key, allowed, check in (("분류군", KNOWN_TAXA, "알 수 없는 분류군"),
+                                ("분양가능여부", AVAILABILITY_VALUES, "알 수 없는 분양가능여부 값")):
+        col = found[key]
+        if col is not None:
+            unknown = df[col].notna() & ~df[col].isin(allowed)
+            add(check, col, "경고" if key == "분류군" else "오류", unknown, _examples(df[col][unknown]))
+
+    if accession is not None:
+        dup = df[accession].notna() & df[accession].duplicated(keep=False)
+        add("중복 자원번호", accession, "오류", dup, _examples(df[accession][dup]))
+    else:
+        dup = df.duplicated(keep="first")
+        add("같은 값 행 반복 (자원번호 컬럼 없음)", "전체", "참고", dup)
+
+    report = pd.DataFrame(rows, columns=["검사", "컬럼", "심각도", "건수", "예시"])
+    report["비율"] = report["건수"] / n if n else 0.0
+    return report[REPORT_COLUMNS]
+
+
+def issue_count(report: pd.DataFrame) -> int:
+    """확인이 필요한(오류·경고) 항목 수"""
+    return int(((report["심각도"] != "참고") & (report["건수"] > 0)).sum())
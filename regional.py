@@ -0,0 +1,235 @@
+# regional.py
+"""지역별 어린이집·보육교사 표 로더와 집계 큐브
+
+- 어린이집 유형별 분포(시설 수) · 정원 현황: ChildcareCube
+- 보육교사 자격급수(long 형식): DenseCube — 차원 조합별 합계(모든 주변합)를 미리 계산
+
+어린이집 원본 CSV는 '구분'(시도 + 도시규모)과 '계', 유형별 컬럼으로 되어 있고 숫자에 천 단위
+쉼표가 들어 있다("202,722"). 읽을 때 thousands=","와 명시적 dtype으로 바로 정수로 파싱하고,
+두 표를 (지표, 시도, 도시규모, 유형) 4차원 정수 배열 하나로 보관한다.
+합계·비율은 큐브를 만들 때 한 번만 계산해 둔다.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from cache_store import cached
+from csv_ingest import canonical_csv
+from metrics import DATASET_LOAD
+
+CHILDCARE_FILES = {
+    "시설 수": "data/지역별 어린이집 유형별 분포 현황.csv",
+    "정원": "data/지역별 어린이집 유형별 정원 현황.csv",
+}
+LABEL_COL = "구분"
+TOTAL_COL = "계"
+
+TEACHER_FILE = "data/지역별_보육교사_자격급수_long.csv"
+TEACHER_DIMS = ("시도", "자격급수", "유형")
+TEACHER_VALUE = "개수"
+
+
+# -----------------------------
+# 로더
+# -----------------------------
+@cached(paths=("path_str",))
+def read_childcare_table(path_str: str) -> pd.DataFrame:
+    """구분(Arrow 문자열) + 숫자 컬럼(int64)으로 읽기 (천 단위 쉼표는 파싱 단계에서 처리)"""
+    p = Path(path_str)
+    if not p.exists():
+        raise FileNotFoundError(f"파일을 찾을 수 없습니다: {p}")
+    src, encoding = canonical_csv(p)
+    header = pd.read_csv(src, encoding=encoding, nrows=0).columns
+    dtypes = {c: "int64" for c in header if c != LABEL_COL}
+    dtypes[LABEL_COL] = pd.StringDtype("pyarrow")
+    with DATASET_LOAD.time(loader="childcare"):
+        return pd.read_csv(src, encoding=encoding, thousands=",", dtype=dtypes)
+
+
+def _split_label(labels: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """'서울시 대도시' → ('서울시', '대도시')"""
+    parts = labels.str.strip().str.rsplit(" ", n=1, expand=True)
+    return parts[0], parts[1]
+
+
+# -----------------------------
+# 큐브
+# -----------------------------
+def _share(totals: np.ndarray) -> np.ndarray:
+    """[..., 시도, 유형] → 마지막 축 합 대비 비율 (합이 0이면 0)"""
+    denom = totals.sum(axis=-1, keepdims=True)
+    return np.divide(totals, denom, out=np.zeros(totals.shape, dtype=float), where=denom > 0)
+
+
+class ChildcareCube:
+    """values[지표, 시도, 도시규모, 유형] 정수 배열과 미리 계산한 합계·비율
+
+    - totals[지표, 시도, 유형]: 도시규모 합계
+    - region_totals[지표, 시도]: 시도 합계 (유형 전체)
+    - type_share[지표, 시도, 유형]: 시도 안에서 유형별 구성비
+    - per_facility[시도, 유형]: 시설당 평균 정원
+    """
+
+    def __init__(self, tables: dict[str, pd.DataFrame]):
+        self.measures = tuple(tables)
+        first = next(iter(tables.values()))
+        self.types = tuple(c for c in first.columns if c not in (LABEL_COL, TOTAL_COL))
+        sido, scale = _split_label(first[LABEL_COL])
+        self.regions = tuple(pd.unique(sido))
+        self.scales = tuple(pd.unique(scale))
+
+        shape = (len(self.measures), len(self.regions), len(self.scales), len(self.types))
+        self.values = np.zeros(shape, dtype=np.int32)
+        self.mismatches = []  # '계' 컬럼과 유형 합이 다른 행
+        r_idx = {r: i for i, r in enumerate(self.regions)}
+        s_idx = {s: i for i, s in enumerate(self.scales)}
+        for m, df in enumerate(tables.values()):
+            sido, scale = _split_label(df[LABEL_COL])
+            ri = sido.map(r_idx).to_numpy(dtype=np.intp)
+            si = scale.map(s_idx).to_numpy(dtype=np.intp)
+            block = df[list(self.types)].to_numpy(dtype=np.int32)
+            self.values[m, ri, si, :] = block
+            bad = block.sum(axis=1) != df[TOTAL_COL].to_numpy()
+            self.mismatches += [(self.measures[m], lbl) for lbl in df.loc[bad, LABEL_COL]]
+
+        self.totals = self.values.sum(axis=2, dtype=np.int64)
+        self.region_totals = self.totals.sum(axis=2)
+        self.national = self.region_totals.sum(axis=1)
+        self.type_share = _share(self.totals)
+        self.per_facility = self._per_facility(self.totals)
+
+    def _all_scales(self, scales) -> bool:
+        return scales is None or set(scales) == set(self.scales)
+
+    def _per_facility(self, totals):
+        if not {"시설 수", "정원"} <= set(self.measures):
+            return None
+        cnt = totals[self.measures.index("시설 수")]
+        cap = totals[self.measures.index("정원")]
+        return np.where(cnt > 0, cap / np.maximum(cnt, 1), np.nan)
+
+    def _totals(self, scales):
+        if self._all_scales(scales):
+            return self.totals
+        idx = [self.scales.index(s) for s in scales]
+        return self.values[:, :, idx, :].sum(axis=2, dtype=np.int64)
+
+    def select(self, measure: str, scales=None) -> np.ndarray:
+        """[시도, 유형] 값 (scales 지정 시 해당 도시규모만 합산)"""
+        return self._totals(scales)[self.measures.index(measure)]
+
+    def share(self, measure: str, scales=None) -> np.ndarray:
+        """[시도, 유형] 시도 안 유형별 구성비"""
+        if self._all_scales(scales):
+            return self.type_share[self.measures.index(measure)]
+        return _share(self.select(measure, scales)[None])[0]
+
+    def capacity_per_facility(self, scales=None):
+        """[시도, 유형] 시설당 평균 정원 (시설이 없으면 NaN)"""
+        if self._all_scales(scales):
+            return self.per_facility
+        return self._per_facility(self._totals(scales))
+
+    def long_frame(self, grid: np.ndarray, value_name: str) -> pd.DataFrame:
+        """[시도, 유형] 배열 → (시도, 유형, 값) long DataFrame (차트용)"""
+        return pd.DataFrame({
+            "시도": np.repeat(self.regions, len(self.types)),
+            "유형": np.tile(self.types, len(self.regions)),
+            value_name: grid.ravel(),
+        })
+
+
+@st.cache_resource(show_spinner=False)
+def load_childcare_cube() -> ChildcareCube:
+    """분포·정원 두 표로 큐브 구성 (프로세스당 1회)"""
+    return ChildcareCube({m: read_childcare_table(p) for m, p in CHILDCARE_FILES.items()})
+
+
+# -----------------------------
+# 보육교사 자격급수 (long → 밀집 큐브)
+# -----------------------------
+class DenseCube:
+    """long 표를 차원별 정수 배열로 보관하고 모든 차원 조합의 합계를 미리 계산
+
+    values[d0, d1, ...] 에서 marginals[keep] 는 keep(차원 이름 튜플, 원래 순서)만 남기고
+    나머지 축을 합한 배열. 슬라이스·피벗은 pivot_table 대신 배열 인덱싱과 합으로 답한다.
+    """
+
+    def __init__(self, dims, labels, values: np.ndarray):
+        self.dims = tuple(dims)
+        self.labels = {d: tuple(labels[d]) for d in self.dims}
+        self.values = values
+        self._pos = {d: {lbl: i for i, lbl in enumerate(self.labels[d])} for d in self.dims}
+        self.marginals = {}
+        n = len(self.dims)
+        for mask in range(1 << n):
+            keep = tuple(d for i, d in enumerate(self.dims) if mask >> i & 1)
+            drop = tuple(i for i, d in enumerate(self.dims) if d not in keep)
+            self.marginals[keep] = values.sum(axis=drop, dtype=np.int64) if drop else values.astype(np.int64)
+
+    @classmethod
+    def from_long(cls, df: pd.DataFrame, dims, value_col: str) -> "DenseCube":
+        """(차원..., 값) long 표 → 큐브 (라벨은 등장 순서, 같은 좌표는 합산)"""
+        labels, codes = {}, []
+        for d in dims:
+            c, uniq = pd.factorize(df[d], sort=False)
+            labels[d], codes = list(uniq), codes + [c]
+        values = np.zeros(tuple(len(labels[d]) for d in dims), dtype=np.int32)
+        np.add.at(values, tuple(codes), df[value_col].to_numpy(dtype=np.int32))
+        return cls(dims, labels, values)
+
+    def _index(self, dim, selected):
+        if selected is None:
+            return None
+        return sorted(self._pos[dim][s] for s in selected)  # 큐브의 라벨 순서 유지
+
+    def cut(self, keep, filters=None) -> np.ndarray:
+        """filters({차원: 선택 라벨})로 자른 뒤 keep 차원만 남긴 합계 배열
+
+        필터가 없거나 전체 선택인 차원은 미리 계산한 주변합을 그대로 사용한다.
+        """
+        keep = tuple(d for d in self.dims if d in keep)
+        filters = {d: sel for d, sel in (filters or {}).items()
+                   if sel and len(sel) < len(self.labels[d])}
+        if not filters:
+            return self.marginals[keep]
+        # 필터가 걸린 차원까지 남긴 주변합에서 잘라낸 뒤 나머지를 합산
+        base_dims = tuple(d for d in self.dims if d in keep or d in filters)
+        arr = self.marginals[base_dims]
+        idx = tuple(self._index(d, filters[d]) if d in filters else range(len(self.labels[d]))
+                    for d in base_dims)
+        arr = arr[np.ix_(*idx)]
+        drop = tuple(i for i, d in enumerate(base_dims) if d not in keep)
+        return arr.sum(axis=drop) if drop else arr
+
+    def pivot(self, row, col=None, filters=None) -> pd.DataFrame:
+        """row(×col) 피벗 표 (선택 필터 적용, 합계 행/열 포함)"""
+        filters = filters or {}
+        labels = {d: [lbl for lbl in self.labels[d] if not filters.get(d) or lbl in filters[d]]
+                  for d in self.dims}
+        if col is None:
+            arr = self.cut((row,), filters)
+            return pd.DataFrame({TEACHER_VALUE: arr}, index=pd.Index(labels[row], name=row))
+        arr = self.cut((row, col), filters)
+        if self.dims.index(row) > self.dims.index(col):
+            arr = arr.T
+        table = pd.DataFrame(arr, index=pd.Index(labels[row], name=row),
+                             columns=pd.Index(labels[col], name=col))
+        table["합계"] = table.sum(axis=1)
+        table.loc["합계"] = table.sum(axis=0)
+        return table
+
+
+@st.cache_resource(show_spinner=False)
+def load_teacher_cube() -> DenseCube:
+    """보육교사 자격급수 큐브 (프로세스당 1회)"""
+    p = Path(TEACHER_FILE)
+    if not p.exists():
+        raise FileNotFoundError(f"파일을 찾을 수 없습니다: {p}")
+    src, encoding = canonical_csv(p)
+    with DATASET_LOAD.time(loader="teacher"):
+        df = pd.read_csv(src, encoding=encoding, thousands=",",
+                         dtype={**{d: pd.StringDtype("pyarrow") for d in TEACHER_DIMS}, TEACHER_VALUE: "int64"})
+    return DenseCube.from_long(df, TEACHER_DIMS, TEACHER_VALUE)
@@ -0,0 +1,379 @@
+# rollups.py
+"""방문 로그 증분 집계 (SQLite 안에서 계산, pandas로 전체 로그를 읽지 않음)
+
+update_rollups()는 마지막으로 처리한 로그 id(rollup_state) 이후의 새 행만 읽어
+아래 집계 테이블을 갱신한다. 월 파티션이 압축 보관돼도 집계는 그대로 남는다.
+갱신은 쓰기 쪽에서만 한다: 방문 로그 기록 스레드(VisitWriter)가 묶음을 쓸 때마다, 압축 보관 직전,
+관리자 대시보드의 "집계 지금 반영". 조회 함수(session_report 등)는 집계 테이블을 읽기만 한다.
+
+- session_paths     세션별 첫/마지막 시각, 진입·이탈 페이지, 조회수, 퍼널 단계 도달 시각
+- page_transitions  날짜별 이전 페이지 → 다음 페이지 이동 수 (LAG)
+- page_dwell        날짜별 페이지 체류 시간 합계 (다음 조회까지 시간, LEAD)
+- hourly_visits     날짜·시간대(0~23시)별 조회수 (요일×시간 히트맵용)
+- daily_page_views  날짜·페이지별 조회수 (기간 로그 수, 페이지별 조회수)
+- daily_sessions    날짜별 방문 세션 (일자별 방문자 수). 처음 만들 때 압축 보관된 달도 한 번 반영
+
+세션 경계: 새 행의 LAG/LEAD는 해당 세션의 마지막 처리 행(session_paths.last_ts, exit_page)을
+함께 넣어 계산하므로, 여러 번에 나눠 처리해도 전체를 한 번에 계산한 것과 같다.
+"""
+import pathlib
+
+import pandas as pd
+import streamlit as st
+
+from analytics import init_db
+from metrics import SQLITE_WRITE
+
+# 퍼널 단계: (표시 이름, 페이지 LIKE 패턴) — 각 단계는 이전 단계 이후에 방문해야 도달
+FUNNEL_STEPS = (
+    ("홈", "홈"),
+    ("소재 확보 현황", "%소재 확보 현황%"),
+    ("건의사항", "건의사항"),
+)
+MAX_DWELL_S = 30 * 60  # 이보다 긴 간격은 자리를 비운 것으로 보고 체류 시간에서 제외
+
+
+def _ensure_tables(conn):
+    conn.executescript(
+        f"""
+        CREATE TABLE IF NOT EXISTS rollup_state (
+            name    TEXT PRIMARY KEY,
+            last_id INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS session_paths (
+            session_id TEXT PRIMARY KEY,
+            first_ts   TEXT NOT NULL,
+            last_ts    TEXT NOT NULL,
+            entry_page TEXT,
+            exit_page  TEXT,
+            views      INTEGER NOT NULL,
+            {", ".join(f"step{i}_ts TEXT" for i in range(1, len(FUNNEL_STEPS) + 1))}
+        );
+        CREATE INDEX IF NOT EXISTS session_paths_first ON session_paths(first_ts);
+        CREATE TABLE IF NOT EXISTS page_transitions (
+            date      TEXT NOT NULL,
+            from_page TEXT NOT NULL,
+            to_page   TEXT NOT NULL,
+            n         INTEGER NOT NULL,
+            PRIMARY KEY (date, from_page, to_page)
+        );
+        CREATE TABLE IF NOT EXISTS page_dwell (
+            date    TEXT NOT NULL,
+            page    TEXT NOT NULL,
+            n       INTEGER NOT NULL,
+            total_s REAL NOT NULL,
+            PRIMARY KEY (date, page)
+        );
+        CREATE TABLE IF NOT EXISTS hourly_visits (
+            date  TEXT NOT NULL,
+            hour  INTEGER NOT NULL,
+            views INTEGER NOT NULL,
+            PRIMARY KEY (date, hour)
+        );
+        CREATE TABLE IF NOT EXISTS daily_page_views (
+            date  TEXT NOT NULL,
+            page  TEXT NOT NULL,
+            views INTEGER NOT NULL,
+            PRIMARY KEY (date, page)
+        );
+        CREATE TABLE IF NOT EXISTS daily_sessions (
+            date       TEXT NOT NULL,
+            session_id TEXT NOT NULL,
+            PRIMARY KEY (date, session_id)
+        ) WITHOUT ROWID;
+        """
+    )
+
+
+def _connect():
+    """조회용 연결 (집계 테이블이 없으면 만들기만 하고 갱신하지 않음)"""
+    conn = init_db()
+    _ensure_tables(conn)
+    return conn
+
+
+def _last_id(conn, name: str) -> int:
+    row = conn.execute("SELECT last_id FROM rollup_state WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else 0
+
+
+def _update_sessions(conn, last_id: int, max_id: int):
+    conn.execute("DROP TABLE IF EXISTS temp.new_hits")
+    conn.execute(
+        "CREATE TEMP TABLE new_hits AS SELECT id, timestamp, date, page, session_id FROM visit_logs "
+        "WHERE id > ? AND id <= ? AND session_id IS NOT NULL",
+        (last_id, max_id),
+    )
+    conn.execute("CREATE INDEX temp.new_hits_session ON new_hits(session_id, timestamp)")
+
+    # 새 행 + 세션별 직전 처리 행(carried=1)에 대해 LAG/LEAD
+    conn.execute("DROP TABLE IF EXISTS temp.steps")
+    conn.execute(
+        """
+        CREATE TEMP TABLE steps AS
+        WITH hits AS (
+            SELECT session_id, timestamp, date, page, id, 0 AS carried FROM new_hits
+            UNION ALL
+            SELECT s.session_id, s.last_ts, substr(s.last_ts, 1, 10), s.exit_page, 0, 1
+            FROM session_paths s
+            WHERE s.session_id IN (SELECT session_id FROM new_hits)
+        )
+        SELECT session_id, timestamp, date, page, carried,
+               LAG(page)       OVER w AS prev_page,
+               LEAD(page)      OVER w AS next_page,
+               LEAD(timestamp) OVER w AS next_ts,
+               ROW_NUMBER()    OVER w AS rn
+        FROM hits
+        WINDOW w AS (PARTITION BY session_id ORDER BY timestamp, carried DESC, id)
+        """
+    )
+
+    conn.execute(
+        """
+        INSERT INTO page_transitions (date, from_page, to_page, n)
+        SELECT date, prev_page, page, COUNT(*) FROM steps
+        WHERE carried = 0 AND prev_page IS NOT NULL
+        GROUP BY date, prev_page, page
+        ON CONFLICT (date, from_page, to_page) DO UPDATE SET n = n + excluded.n
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO page_dwell (date, page, n, total_s)
+        SELECT date, page, COUNT(*), SUM(dwell) FROM (
+            SELECT date, page, (julianday(next_ts) - julianday(timestamp)) * 86400.0 AS dwell
+            FROM steps WHERE next_ts IS NOT NULL
+        )
+        WHERE dwell BETWEEN 0 AND ?
+        GROUP BY date, page
+        ON CONFLICT (date, page) DO UPDATE SET n = n + excluded.n, total_s = total_s + excluded.total_s
+        """,
+        (MAX_DWELL_S,),
+    )
+    conn.execute(
+        """
+        INSERT INTO session_paths (session_id, first_ts, last_ts, entry_page, exit_page, views)
+        SELECT session_id, MIN(timestamp), MAX(timestamp),
+               MAX(CASE WHEN rn = 1 THEN page END),
+               MAX(CASE WHEN next_ts IS NULL THEN page END),
+               COUNT(*)
+        FROM steps WHERE carried = 0
+        GROUP BY session_id
+        ON CONFLICT (session_id) DO UPDATE SET
+            last_ts = excluded.last_ts, exit_page = excluded.exit_page, views = views + excluded.views
+        """
+    )
+    # 퍼널: 단계 i는 단계 i-1 도달 이후 첫 방문 시각 (새 행은 기존 행보다 늦으므로 COALESCE로 유지)
+    for i, (_, pattern) in enumerate(FUNNEL_STEPS, start=1):
+        after_prev = f"AND n.timestamp > session_paths.step{i - 1}_ts" if i > 1 else ""
+        need_prev = f"AND step{i - 1}_ts IS NOT NULL" if i > 1 else ""
+        conn.execute(
+            f"""
+            UPDATE session_paths SET step{i}_ts = (
+                SELECT MIN(n.timestamp) FROM new_hits n
+                WHERE n.session_id = session_paths.session_id AND n.page LIKE ? {after_prev}
+            )
+            WHERE step{i}_ts IS NULL {need_prev}
+              AND session_id IN (SELECT session_id FROM new_hits)
+            """,
+            (pattern,),
+        )
+    conn.execute("DROP TABLE temp.steps")
+    conn.execute("DROP TABLE temp.new_hits")
+
+
+def _update_hourly(conn, last_id: int, max_id: int):
+    # timestamp는 로컬 시각 ISO 문자열 → 12~13번째 글자가 시(hour)
+    conn.execute(
+        """
+        INSERT INTO hourly_visits (date, hour, views)
+        SELECT date, CAST(substr(timestamp, 12, 2) AS INTEGER), COUNT(*) FROM visit_logs
+        WHERE id > ? AND id <= ?
+        GROUP BY 1, 2
+        ON CONFLICT (date, hour) DO UPDATE SET views = views + excluded.views
+        """,
+        (last_id, max_id),
+    )
+
+
+def _backfill_daily_archives(conn):
+    """압축 보관된 달의 일자별 집계 (daily 집계를 처음 만들 때 한 번, 필요한 컬럼만 읽음)"""
+    import pyarrow.parquet as pq
+
+    for (path,) in conn.execute("SELECT path FROM log_archives ORDER BY month").fetchall():
+        if not pathlib.Path(path).exists():
+            continue
+        df = pq.read_table(path, columns=["date", "page", "session_id"]).to_pandas()
+        views = df.groupby(["date", "page"]).size()
+        conn.executemany(
+            "INSERT INTO daily_page_views (date, page, views) VALUES (?, ?, ?) "
+            "ON CONFLICT (date, page) DO UPDATE SET views = views + excluded.views",
+            [(d, p, int(n)) for (d, p), n in views.items()],
+        )
+        sessions = df.dropna(subset=["session_id"]).drop_duplicates(["date", "session_id"])
+        conn.executemany(
+            "INSERT OR IGNORE INTO daily_sessions (date, session_id) VALUES (?, ?)",
+            sessions[["date", "session_id"]].itertuples(index=False, name=None),
+        )
+
+
+def _update_daily(conn, last_id: int, max_id: int):
+    if last_id == 0:
+        # 압축 보관은 보관 직전에 집계를 갱신하므로, 보관 파일은 이 집계가 처음 생길 때만 읽으면 됨
+        _backfill_daily_archives(conn)
+    conn.execute(
+        """
+        INSERT INTO daily_page_views (date, page, views)
+        SELECT date, page, COUNT(*) FROM visit_logs
+        WHERE id > ? AND id <= ?
+        GROUP BY 1, 2
+        ON CONFLICT (date, page) DO UPDATE SET views = views + excluded.views
+        """,
+        (last_id, max_id),
+    )
+    conn.execute(
+        "INSERT OR IGNORE INTO daily_sessions (date, session_id) "
+        "SELECT DISTINCT date, session_id FROM visit_logs WHERE id > ? AND id <= ? AND session_id IS NOT NULL",
+        (last_id, max_id),
+    )
+
+
+# 집계 이름 → 갱신 함수 (이름별로 처리한 로그 id를 따로 기록)
+ROLLUPS = {
+    "sessions": _update_sessions,
+    "hourly": _update_hourly,
+    "daily": _update_daily,
+}
+
+
+def update_rollups() -> int:
+    """새 로그 행을 증분 집계에 반영하고 처리한 행 수(가장 뒤처진 집계 기준)를 반환"""
+    conn = init_db()
+    try:
+        _ensure_tables(conn)
+        with SQLITE_WRITE.time(op="rollups"):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                max_id = conn.execute("SELECT MAX(id) FROM visit_logs").fetchone()[0] or 0
+                done = 0
+                for name, update in ROLLUPS.items():
+                    last_id = _last_id(conn, name)
+                    if max_id <= last_id:
+                        continue
+                    update(conn, last_id, max_id)
+                    conn.execute(
+                        "INSERT INTO rollup_state (name, last_id) VALUES (?, ?) "
+                        "ON CONFLICT (name) DO UPDATE SET last_id = excluded.last_id",
+                        (name, max_id),
+                    )
+                    done = max(done, max_id - last_id)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return done
+    finally:
+        conn.close()
+
+
+# -----------------------------
+# 조회 (집계 테이블만 읽음)
+# -----------------------------
+@st.cache_data(ttl=60, show_spinner=False)
+def session_report(start_date: str, end_date: str) -> dict:
+    """관리자 대시보드 세션 분석 (1분 캐시): 진입/이탈 페이지, 퍼널, 이동 경로, 체류 시간"""
+    conn = _connect()
+    end_ts = end_date + "T99"  # 종료일 하루 전체 포함
+    rng = (start_date, end_ts)
+    report = {
+        "진입": pd.read_sql_query(
+            "SELECT entry_page AS 페이지, COUNT(*) AS 세션 FROM session_paths "
+            "WHERE first_ts BETWEEN ? AND ? AND entry_page IS NOT NULL GROUP BY 1 ORDER BY 2 DESC", conn, params=rng),
+        "이탈": pd.read_sql_query(
+            "SELECT exit_page AS 페이지, COUNT(*) AS 세션 FROM session_paths "
+            "WHERE first_ts BETWEEN ? AND ? GROUP BY 1 ORDER BY 2 DESC", conn, params=rng),
+        "이동": pd.read_sql_query(
+            "SELECT from_page AS 이전, to_page AS 다음, SUM(n) AS 횟수 FROM page_transitions "
+            "WHERE date BETWEEN ? AND ? GROUP BY 1, 2 ORDER BY 3 DESC LIMIT 50", conn,
+            params=(start_date, end_date)),
+        "체류": pd.read_sql_query(
+            "SELECT page AS 페이지, SUM(n) AS 조회, ROUND(SUM(total_s) / SUM(n), 1) AS \"평균 체류(초)\" "
+            "FROM page_dwell WHERE date BETWEEN ? AND ? GROUP BY 1 ORDER BY 3 DESC", conn,
+            params=(start_date, end_date)),
+    }
+    steps = ", ".join(f"COUNT(step{i}_ts)" for i in range(1, len(FUNNEL_STEPS) + 1))
+    counts = conn.execute(f"SELECT COUNT(*), {steps} FROM session_paths WHERE first_ts BETWEEN ? AND ?",
+                          rng).fetchone()
+    conn.close()
+    prev = (counts[0],) + tuple(counts[1:-1])  # 첫 단계는 전체 세션 대비
+    funnel = pd.DataFrame({
+        "단계": [name for name, _ in FUNNEL_STEPS],
+        "세션": counts[1:],
+        "이전 단계 대비": [round(c / p, 3) if p else None for c, p in zip(counts[1:], prev)],
+    })
+    report["퍼널"] = funnel
+    report["세션 수"] = counts[0]
+    return report
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def visit_rollups(start_date: str, end_date: str):
+    """관리자 대시보드 집계 (1분 캐시): (기간 로그 수, 일자별 방문자, 페이지별 조회수)"""
+    conn = _connect()
+    rng = (start_date, end_date)
+    daily = pd.read_sql_query(
+        "SELECT date, COUNT(*) AS visitors FROM daily_sessions WHERE date BETWEEN ? AND ? "
+        "GROUP BY date ORDER BY date", conn, params=rng)
+    page_counts = pd.read_sql_query(
+        "SELECT page, SUM(views) AS views FROM daily_page_views WHERE date BETWEEN ? AND ? "
+        "GROUP BY page ORDER BY views DESC", conn, params=rng)
+    conn.close()
+    return int(page_counts["views"].sum()), daily, page_counts
+
+
+WEEKDAYS = ("일", "월", "화", "수", "목", "금", "토")  # SQLite strftime('%w') 순서
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def hourly_heatmap(start_date: str, end_date: str) -> pd.DataFrame:
+    """요일×시간대 조회수 (1분 캐시): 합계, 해당 요일 하루 평균, 가장 많았던 날의 값
+
+    평균은 기간 안의 그 요일 날짜 수로 나눈다 (방문이 없던 날도 0으로 포함).
+    """
+    conn = _connect()
+    df = pd.read_sql_query(
+        """
+        SELECT CAST(strftime('%w', date) AS INTEGER) AS wd, hour AS 시,
+               SUM(views) AS 합계, MAX(views) AS 최대
+        FROM hourly_visits WHERE date BETWEEN ? AND ?
+        GROUP BY 1, 2
+        """,
+        conn,
+        params=(start_date, end_date),
+    )
+    conn.close()
+    days = pd.date_range(start_date, end_date, freq="D")
+    n_days = pd.Series((days.dayofweek + 1) % 7).value_counts()  # 월=0 → %w 기준 월=1
+    grid = pd.MultiIndex.from_product([range(7), range(24)], names=["wd", "시"])
+    df = df.set_index(["wd", "시"]).reindex(grid, fill_value=0).reset_index()
+    df["평균"] = (df["합계"] / df["wd"].map(n_days).fillna(1)).round(2)  # 기간에 없는 요일은 합계 0
+    df.insert(0, "요일", df.pop("wd").map(dict(enumerate(WEEKDAYS))))
+    return df
+
+
+def session_path(session_id: str) -> pd.DataFrame:
+    """한 세션의 페이지 이동 경로와 체류 시간 (세션 인덱스로 해당 행만 조회)"""
+    conn = init_db()
+    df = pd.read_sql_query(
+        """
+        SELECT timestamp AS 시각, page AS 페이지,
+               ROUND((julianday(LEAD(timestamp) OVER w) - julianday(timestamp)) * 86400.0, 1) AS "체류(초)"
+        FROM visit_logs WHERE session_id = ?
+        WINDOW w AS (ORDER BY timestamp)
+        ORDER BY timestamp
+        """,
+        conn,
+        params=(session_id,),
+    )
+    conn.close()
+    return df
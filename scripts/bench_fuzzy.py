@@ -0,0 +1,94 @@
+# scripts/bench_fuzzy.py
+"""학명 오타 허용 검색 벤치마크: BK-tree vs 전수 편집거리 비교
+
+실행: python -m scripts.bench_fuzzy [--size 10000] [--queries 100] [-k 2]
+"""
+import argparse
+import glob
+import random
+import string
+import time
+
+import pandas as pd
+
+from csv_ingest import canonical_csv
+from fuzzy import BKTree, levenshtein, normalize_name
+
+
+def load_real_names() -> list[str]:
+    names = set()
+    for path in glob.glob("data/*소재 확보 리스트*.csv"):
+        src, encoding = canonical_csv(path)
+        df = pd.read_csv(src, encoding=encoding)
+        if "학명" in df.columns:
+            names.update(filter(None, map(normalize_name, df["학명"].dropna())))
+    return sorted(names)
+
+
+def mutate(word: str, rng: random.Random, edits: int) -> str:
+    chars = list(word)
+    for _ in range(edits):
+        op = rng.randrange(3)
+        pos = rng.randrange(len(chars) + (op == 1))
+        if op == 0 and len(chars) > 1:
+            del chars[pos]
+        elif op == 1:
+            chars.insert(pos, rng.choice(string.ascii_lowercase))
+        else:
+            chars[pos % len(chars)] = rng.choice(string.ascii_lowercase)
+    return "".join(chars)
+
+
+def synth_vocab(seed_names: list[str], size: int, rng: random.Random) -> list[str]:
+    """실제 학명을 변형해 size개 고유 학명 어휘를 만든다"""
+    vocab = set(seed_names)
+    while len(vocab) < size:
+        vocab.add(mutate(rng.choice(seed_names), rng, rng.randint(2, 6)))
+    return sorted(vocab)
+
+
+def brute_force(vocab: list[str], query: str, k: int) -> list[tuple[int, str]]:
+    hits = [(d, w) for w in vocab if (d := levenshtein(query, w)) <= k]
+    hits.sort()
+    return hits
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--size", type=int, default=10000, help="학명 어휘 크기")
+    ap.add_argument("--queries", type=int, default=100, help="질의 수")
+    ap.add_argument("-k", type=int, default=2, help="허용 편집거리")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    real = load_real_names()
+    if not real:
+        raise SystemExit("data/ 폴더에서 학명을 찾을 수 없습니다.")
+    vocab = synth_vocab(real, max(args.size, len(real)), rng)
+    queries = [mutate(rng.choice(real), rng, rng.randint(1, args.k)) for _ in range(args.queries)]
+
+    t0 = time.perf_counter()
+    tree = BKTree(vocab)
+    t_build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    bk_results = [tree.search(q, args.k) for q in queries]
+    t_bk = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    bf_results = [brute_force(vocab, q, args.k) for q in queries]
+    t_bf = time.perf_counter() - t0
+
+    assert bk_results == bf_results, "BK-tree 결과가 전수 비교와 다릅니다"
+
+    n = len(queries)
+    print(f"어휘 {len(vocab):,}개 (실제 학명 {len(real):,}개) · 질의 {n}개 · k={args.k}")
+    print(f"BK-tree 구축      : {t_build:8.3f} s")
+    print(f"전수 편집거리      : {t_bf:8.3f} s  ({t_bf / n * 1000:7.2f} ms/질의)")
+    print(f"BK-tree 검색      : {t_bk:8.3f} s  ({t_bk / n * 1000:7.2f} ms/질의)")
+    print(f"속도 향상          : {t_bf / t_bk:8.1f} x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+# scripts/build_api.py
+"""소재 확보 리스트 집계 JSON(gzip/brotli) 정적 API 빌드, --serve로 읽기 전용 HTTP 제공
+
+실행: python -m scripts.build_api [--out api] [--serve] [--addr 127.0.0.1] [--port 8600]
+"""
+import argparse
+
+from aggregate_api import API_DIR, brotli, build_aggregates, serve_api
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--out", default=str(API_DIR), help="출력 디렉터리")
+    ap.add_argument("--serve", action="store_true", help="빌드 후 읽기 전용 HTTP 서버 실행")
+    ap.add_argument("--no-build", action="store_true", help="빌드 없이 기존 파일만 제공 (--serve와 함께)")
+    ap.add_argument("--addr", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8600)
+    args = ap.parse_args()
+
+    if not args.no_build:
+        index = build_aggregates(args.out)
+        for slug, info in index["collections"].items():
+            print(f"{info['label']}: /{slug} → {info['path']} ({info['bytes']:,} bytes)")
+        if brotli is None:
+            print("brotli 모듈이 없어 gzip 사본만 만들었습니다 (`pip install brotli`).")
+    if args.serve:
+        print(f"집계 API: http://{args.addr}:{args.port}/index.json")
+        serve_api(args.addr, args.port, args.out)
+
+
+if __name__ == "__main__":
+    main()
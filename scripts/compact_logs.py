@@ -0,0 +1,25 @@
+# scripts/compact_logs.py
+"""보관 기간이 지난 방문 로그 월 파티션을 압축 Parquet으로 옮김
+
+실행: python -m scripts.compact_logs [--retention 3] [--archive-dir log_archive]
+"""
+import argparse
+
+from analytics import ARCHIVE_DIR, RETENTION_MONTHS, compact_logs
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--retention", type=int, default=RETENTION_MONTHS, help="SQLite에 남길 개월 수 (이번 달 포함)")
+    ap.add_argument("--archive-dir", default=str(ARCHIVE_DIR), help="보관 파일 디렉터리")
+    args = ap.parse_args()
+
+    done = compact_logs(args.retention, args.archive_dir)
+    if not done:
+        print("보관할 달이 없습니다.")
+    for s in done:
+        print(f"{s['month']}: {s['rows']:,}행 · 세션 {s['sessions']:,} → {s['path']} ({s['bytes']:,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+# scripts/export_report.py
+"""소재 확보 리스트 페이지(1~3) 정적 HTML 보고서 일괄 내보내기 (프로세스 풀)
+
+실행: python -m scripts.export_report [--out report] [--workers 4] [--top 20] [--png]
+
+페이지 1~3의 보기(탭)마다 기본 조건(검색 없음, 기본 표시 옵션)으로 catalog 집계와
+charts.bar_chart / cross_heat 명세를 만들어 페이지별 HTML과 index.html로 저장한다.
+보기 하나가 작업 하나이며, 집계·명세 직렬화(·PNG 변환)는 프로세스 풀에서 나누어 실행한다.
+
+vl-convert-python이 설치되어 있으면 Vega 스크립트를 HTML 안에 넣어 오프라인에서도 열리고,
+--png로 차트별 PNG도 저장한다. 없으면 HTML이 CDN의 Vega 스크립트를 참조한다.
+"""
+import argparse
+import datetime
+import html
+import json
+import os
+import pathlib
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import altair as alt
+
+from catalog import (CATALOG_FILES, CATALOG_VIEWS, DEFAULT_STYLE, DEFAULT_TOP_N, NO_SEARCH, count_by, cross_counts,
+                     cross_pairs)
+from charts import bar_chart, cross_heat
+
+CDN_SCRIPTS = (
+    f"https://cdn.jsdelivr.net/npm/vega@{alt.VEGA_VERSION}",
+    f"https://cdn.jsdelivr.net/npm/vega-lite@{alt.VEGALITE_VERSION}",
+    f"https://cdn.jsdelivr.net/npm/vega-embed@{alt.VEGAEMBED_VERSION}",
+)
+UNITS = {"분류군": "개", "국명": "종", "학명": "종"}
+TABLE_ROWS = 200  # 페이지의 집계표와 같은 행 수
+
+
+def _vl_convert():
+    try:
+        import vl_convert
+    except ImportError:
+        return None
+    return vl_convert
+
+
+# -----------------------------
+# 작업 (프로세스 풀에서 실행: 보기 하나 → 차트 명세·표)
+# -----------------------------
+def build_jobs(top: int) -> list[tuple]:
+    """(페이지, clean_cols, 보기 종류, 컬럼, 표시 개수, 히트맵 옵션) — 페이지 1~3의 보기 순서 그대로"""
+    jobs = []
+    for name, view in CATALOG_VIEWS.items():
+        for col in view["counts"]:
+            jobs.append((name, view["clean"], "count", (col,), top, {}))
+        for cols, (pairs, opts) in view["crosses"].items():
+            jobs.append((name, view["clean"], "cross", cols, cross_pairs(pairs, top), opts))
+    return jobs
+
+
+def _table_html(df) -> str:
+    out = df.copy()
+    if "비율" in out.columns:
+        out["비율"] = out["비율"].map("{:.1%}".format)
+    out["건수"] = out["건수"].map("{:,}".format)
+    return out.to_html(index=False, border=0, classes="table")
+
+
+def render_view(job: tuple, png: bool = False) -> dict:
+    name, clean_cols, kind, cols, top, opts = job
+    path = CATALOG_FILES[name]
+    if kind == "count":
+        col = cols[0]
+        cnt, total = count_by(path, clean_cols, NO_SEARCH, col)
+        title = f"{col} 집계"
+        caption = f"총 {total:,} 건 · 고유 {col} {cnt.shape[0]:,}{UNITS.get(col, '')}"
+        charts = [
+            (f"{col} Top-{top} (건수)", bar_chart(cnt, col, "건수", top=top, pct=False, **DEFAULT_STYLE)),
+            (f"{col} Top-{top} (비율)", bar_chart(cnt, col, "건수", top=top, pct=True, **DEFAULT_STYLE)),
+        ]
+        table = cnt.head(TABLE_ROWS)
+    else:
+        row_col, col_col = cols
+        cross = cross_counts(path, clean_cols, NO_SEARCH, (row_col, col_col))
+        shown = cross.head(top)
+        title = f"{row_col}×{col_col}"
+        caption = f"표시 페어 {len(shown):,} / 전체 페어 {len(cross):,}"
+        charts = [] if shown.empty else [
+            (f"{row_col} × {col_col}", cross_heat(shown, row_col, col_col, label_font=DEFAULT_STYLE["label_font"],
+                                                  bar_size=DEFAULT_STYLE["bar_size"], **opts)),
+        ]
+        table = shown.reset_index(drop=True)
+
+    specs = []
+    vlc = _vl_convert() if png else None
+    for subtitle, chart in charts:
+        spec = chart.properties(width="container").to_dict()
+        image = None
+        if vlc is not None:
+            image = vlc.vegalite_to_png(chart.properties(width=560).to_dict(), scale=2,
+                                        vl_version=alt.utils.html.vl_version_for_vl_convert())
+        specs.append({"subtitle": subtitle, "spec": spec, "png": image})
+    return {"page": name, "title": title, "caption": caption, "charts": specs, "table": _table_html(table)}
+
+
+def _render_view_png(job):
+    return render_view(job, png=True)
+
+
+# -----------------------------
+# HTML
+# -----------------------------
+STYLE = """
+body { font-family: -apple-system, "Malgun Gothic", "Apple SD Gothic Neo", sans-serif; margin: 24px; color: #222; }
+h1 { font-size: 1.5rem; } h2 { font-size: 1.2rem; margin-top: 2rem; border-bottom: 1px solid #ddd; }
+.caption { color: #666; font-size: .9rem; }
+.row { display: flex; gap: 24px; flex-wrap: wrap; }
+.col { flex: 1 1 420px; min-width: 0; }
+.chart { width: 100%; }
+.table { border-collapse: collapse; font-size: .85rem; }
+.table th, .table td { padding: 2px 10px; border-bottom: 1px solid #eee; text-align: left; }
+nav a { margin-right: 16px; }
+"""
+
+
+def _script_tags(inline_js: str | None) -> str:
+    if inline_js is not None:
+        return f'<script type="text/javascript">\n{inline_js}\n</script>'
+    return "\n".join(f'<script src="{src}"></script>' for src in CDN_SCRIPTS)
+
+
+def _page_file(name: str) -> str:
+    return f"{name}.html"
+
+
+def write_page(out: pathlib.Path, name: str, views: list[dict], nav: str, scripts: str, png_dir=None):
+    body, embeds = [], []
+    for i, view in enumerate(views):
+        body.append(f"<h2>{html.escape(view['title'])}</h2>")
+        body.append(f"<p class='caption'>{html.escape(view['caption'])}</p>")
+        if not view["charts"]:
+            body.append("<p>조건에 맞는 페어가 없습니다.</p>")
+        body.append("<div class='row'>")
+        for j, chart in enumerate(view["charts"]):
+            div = f"chart-{i}-{j}"
+            body.append(f"<div class='col'><h3>{html.escape(chart['subtitle'])}</h3>"
+                        f"<div class='chart' id='{div}'></div></div>")
+            spec = json.dumps(chart["spec"], ensure_ascii=False).replace("</", "<\\/")
+            embeds.append(f"vegaEmbed('#{div}', {spec}, {{actions: false}}).catch(console.error);")
+            if png_dir is not None and chart["png"] is not None:
+                (png_dir / f"{name}_{i + 1:02d}_{j + 1}.png").write_bytes(chart["png"])
+        body.append("</div>")
+        body.append(f"<details><summary>표 보기</summary>{view['table']}</details>")
+
+    doc = f"""<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="UTF-8">
+<title>{html.escape(name)} 소재 확보 현황</title>
+<style>{STYLE}</style>
+{scripts}
+</head>
+<body>
+<nav>{nav}</nav>
+<h1>국립호남권생물자원관 {html.escape(name)} 소재 확보 현황</h1>
+{"".join(body)}
+<script type="text/javascript">
+{chr(10).join(embeds)}
+</script>
+</body>
+</html>
+"""
+    (out / _page_file(name)).write_text(doc, encoding="utf-8")
+
+
+def write_index(out: pathlib.Path, pages: dict, nav: str, stamp: str):
+    items = "".join(
+        f"<li><a href='{html.escape(_page_file(name))}'>{html.escape(name)}</a> · 보기 {len(views)}개</li>"
+        for name, views in pages.items()
+    )
+    doc = f"""<!DOCTYPE html>
+<html lang="ko">
+<head><meta charset="UTF-8"><title>소재 확보 현황 보고서</title><style>{STYLE}</style></head>
+<body>
+<nav>{nav}</nav>
+<h1>국립호남권생물자원관 소재 확보 현황 보고서</h1>
+<p class='caption'>생성 {stamp} · 기본 조건(검색 없음)</p>
+<ul>{items}</ul>
+</body>
+</html>
+"""
+    (out / "index.html").write_text(doc, encoding="utf-8")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--out", default="report", help="출력 디렉터리")
+    ap.add_argument("--workers", type=int, default=os.cpu_count(), help="프로세스 수")
+    ap.add_argument("--top", type=int, default=DEFAULT_TOP_N, help="막대 차트 Top-N (페이지 기본값과 같게)")
+    ap.add_argument("--png", action="store_true", help="차트별 PNG도 저장 (vl-convert-python 필요)")
+    args = ap.parse_args()
+
+    vlc = _vl_convert()
+    if args.png and vlc is None:
+        raise SystemExit("PNG 저장 시 `pip install vl-convert-python` 필요")
+    out = pathlib.Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    png_dir = None
+    if args.png:
+        png_dir = out / "png"
+        png_dir.mkdir(exist_ok=True)
+
+    t0 = time.perf_counter()
+    jobs = build_jobs(args.top)
+    with ProcessPoolExecutor(max_workers=max(1, min(args.workers, len(jobs)))) as pool:
+        views = list(pool.map(_render_view_png if args.png else render_view, jobs))
+
+    pages = {}
+    for view in views:
+        pages.setdefault(view["page"], []).append(view)
+    scripts = _script_tags(vlc.javascript_bundle(vl_version=alt.utils.html.vl_version_for_vl_convert())
+                           if vlc is not None else None)
+    nav = "<a href='index.html'>목차</a>" + "".join(
+        f"<a href='{html.escape(_page_file(name))}'>{html.escape(name)}</a>" for name in pages
+    )
+    for name, page_views in pages.items():
+        write_page(out, name, page_views, nav, scripts, png_dir)
+    write_index(out, pages, nav, datetime.datetime.now().strftime("%Y-%m-%d %H:%M"))
+
+    n_charts = sum(len(v["charts"]) for v in views)
+    print(f"페이지 {len(pages)} · 보기 {len(views)} · 차트 {n_charts}개 → {out}/index.html "
+          f"({time.perf_counter() - t0:.1f}초)")
+    if vlc is None:
+        print("vl-convert-python이 없어 Vega 스크립트는 CDN을 참조합니다 (오프라인 열람 시 설치 후 다시 실행).")
+
+
+if __name__ == "__main__":
+    main()
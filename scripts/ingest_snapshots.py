@@ -0,0 +1,25 @@
+# scripts/ingest_snapshots.py
+"""data/ 의 소재 확보 리스트 릴리스를 수집하고 직전 릴리스와의 변경분을 계산
+
+실행: python -m scripts.ingest_snapshots [--data-dir data]
+"""
+import argparse
+
+from snapshots import DATA_DIR, collection_label, ingest_releases
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--data-dir", default=str(DATA_DIR), help="릴리스 파일 디렉터리")
+    args = ap.parse_args()
+
+    done = ingest_releases(args.data_dir)
+    if not done:
+        print("새로 비교할 릴리스가 없습니다.")
+    for d in done:
+        print(f"{collection_label(d['collection'])}: {d['from']} → {d['to']} · "
+              f"추가 {d['추가']:,} · 삭제 {d['삭제']:,} · 상태 변경 {d['상태 변경']:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+# scripts/load_test.py
+"""방문 로그·게시판 저장소 동시 접속 부하 테스트 (게시판.db 임시 복사본 사용)
+
+실행: python -m scripts.load_test [--mode thread|process] [--sessions 16] [--duration 10]
+                                  [--visit-mode direct|queued] [--json 결과.json] [--baseline 이전.json]
+
+세션마다 작업 비율(--mix)에 따라 아래 작업을 반복하고, 작업별 처리량·지연 시간 분포와
+"database is locked" 오류 비율을 집계한다. --json으로 저장한 결과를 --baseline으로 주면
+저장소 변경 전후를 나란히 비교한다.
+
+- visit        방문 로그 1건 기록 (direct: insert_visits 직접 호출 / queued: 프로세스별 VisitWriter 큐)
+- board_write  게시글 1건 등록 (board.add_post)
+- board_read   게시판 목록 첫 페이지 + 전체 글 수
+- board_moderate 최신 글 20건 상태 변경 일괄 반영 (board.apply_changes, 버전 충돌은 정상 결과로 셈) — 기본 비율에는 없음
+- log_read     관리자 원시 로그 첫 페이지 (analytics.log_page)
+"""
+import argparse
+import datetime
+import json
+import pathlib
+import random
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+import analytics
+import board
+
+SOURCE_DB = pathlib.Path("게시판.db")
+OPS = ("visit", "board_write", "board_read", "board_moderate", "log_read")
+DEFAULT_MIX = "visit=70,board_write=5,board_read=20,log_read=5"
+PAGES = ("홈", "소재 확보 현황", "검색", "학명 집계", "건의사항", "지역별 어린이집 유형별 현황")
+
+
+def parse_mix(text: str) -> dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in OPS:
+            raise SystemExit(f"알 수 없는 작업: {name} (가능: {', '.join(OPS)})")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def is_locked(e: Exception) -> bool:
+    return isinstance(e, sqlite3.OperationalError) and ("locked" in str(e) or "busy" in str(e))
+
+
+# -----------------------------
+# 작업 (각 호출이 앱 한 번의 요청에 해당: 연결을 열고 닫음)
+# -----------------------------
+def op_visit(ctx):
+    now = datetime.datetime.now()
+    row = (now.isoformat(), now.date().isoformat(), ctx["rng"].choice(PAGES), ctx["session_id"])
+    if ctx["writer"] is not None:
+        ctx["writer"].put(row)
+    else:
+        analytics.insert_visits([row])
+
+
+def op_board_write(ctx):
+    board.add_post(f"부하테스트-{ctx['session_id']}", "부하 테스트", "부하 테스트 글 " * 20)
+
+
+def op_board_read(ctx):
+    board.list_posts(10, 0)
+    board.count_posts()
+
+
+def op_board_moderate(ctx):
+    shown = board.list_posts(20, 0)
+    new_status = ctx["rng"].choice(board.STATUSES)
+    status, _ = board.editor_changes(shown, {i: {"상태": new_status} for i in range(len(shown))})
+    board.apply_changes(status, {})
+
+
+def op_log_read(ctx):
+    today = datetime.date.today().isoformat()
+    analytics.log_page(today, today, limit=50)
+
+
+OP_FUNCS = {
+    "visit": op_visit,
+    "board_write": op_board_write,
+    "board_read": op_board_read,
+    "board_moderate": op_board_moderate,
+    "log_read": op_log_read,
+}
+
+
+# -----------------------------
+# 세션 실행
+# -----------------------------
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def _process_writer(db_path: str):
+    """queued 모드: 프로세스마다 VisitWriter 하나 (앱의 visit_writer()와 같은 구성)"""
+    with _writers_lock:
+        if db_path not in _writers:
+            _writers[db_path] = analytics.VisitWriter()
+        return _writers[db_path]
+
+
+def run_session(db_path: str, index: int, duration: float, mix: dict, think_ms: float,
+                visit_mode: str, seed: int) -> dict:
+    """세션 하나: duration초 동안 작업을 반복하고 작업별 (지연 시간 목록, 잠금 오류 수, 기타 오류 수) 반환"""
+    analytics.DB_PATH = board.DB_PATH = pathlib.Path(db_path)
+    rng = random.Random(seed * 100003 + index)
+    ctx = {
+        "rng": rng,
+        "session_id": f"load{index:04d}",
+        "writer": _process_writer(db_path) if visit_mode == "queued" else None,
+    }
+    names, weights = list(mix), list(mix.values())
+    result = {name: {"lat": [], "locked": 0, "errors": 0} for name in names}
+
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights)[0]
+        t0 = time.perf_counter()
+        try:
+            OP_FUNCS[name](ctx)
+            result[name]["lat"].append(time.perf_counter() - t0)
+        except Exception as e:
+            result[name]["locked" if is_locked(e) else "errors"] += 1
+        if think_ms:
+            time.sleep(rng.uniform(0, 2 * think_ms) / 1000)
+
+    if ctx["writer"] is not None:
+        ctx["writer"].flush(timeout=30)
+    return result
+
+
+def run(args, db_path: str) -> tuple[dict, float]:
+    mix = parse_mix(args.mix)
+    jobs = [(db_path, i, args.duration, mix, args.think_ms, args.visit_mode, args.seed)
+            for i in range(args.sessions)]
+    pool_cls = ThreadPoolExecutor if args.mode == "thread" else ProcessPoolExecutor
+    t0 = time.perf_counter()
+    with pool_cls(max_workers=args.sessions) as pool:
+        results = list(pool.map(run_session, *zip(*jobs)))
+    elapsed = time.perf_counter() - t0
+
+    merged = {name: {"lat": [], "locked": 0, "errors": 0} for name in mix}
+    for res in results:
+        for name, r in res.items():
+            merged[name]["lat"] += r["lat"]
+            merged[name]["locked"] += r["locked"]
+            merged[name]["errors"] += r["errors"]
+    return merged, elapsed
+
+
+# -----------------------------
+# 보고서
+# -----------------------------
+def summarize(merged: dict, elapsed: float) -> dict:
+    rows = {}
+    for name, r in merged.items():
+        lat = np.asarray(r["lat"]) * 1000
+        attempts = len(lat) + r["locked"] + r["errors"]
+        q = np.percentile(lat, [50, 95, 99]) if len(lat) else [float("nan")] * 3
+        rows[name] = {
+            "ok": int(len(lat)),
+            "ops_per_s": round(len(lat) / elapsed, 1),
+            "p50_ms": round(float(q[0]), 2),
+            "p95_ms": round(float(q[1]), 2),
+            "p99_ms": round(float(q[2]), 2),
+            "max_ms": round(float(lat.max()), 2) if len(lat) else float("nan"),
+            "locked": r["locked"],
+            "locked_rate": round(r["locked"] / attempts, 4) if attempts else 0.0,
+            "errors": r["errors"],
+        }
+    return rows
+
+
+def print_report(report: dict, baseline: dict | None = None):
+    cfg = report["config"]
+    print(f"모드 {cfg['mode']} · 세션 {cfg['sessions']} · {cfg['duration']}초 · 방문 로그 {cfg['visit_mode']}"
+          f" · 작업 비율 {cfg['mix']} · 실제 {report['elapsed_s']:.1f}초")
+    print(f"SQLite 기록 확인: 방문 로그 {report['rows']['visit_logs']:,}행 · 게시글 {report['rows']['posts']:,}행")
+    header = f"{'작업':<12}{'성공':>8}{'ops/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}{'locked':>8}{'비율':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, r in report["ops"].items():
+        print(f"{name:<12}{r['ok']:>8,}{r['ops_per_s']:>9.1f}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}"
+              f"{r['p99_ms']:>9.2f}{r['max_ms']:>9.2f}{r['locked']:>8,}{r['locked_rate']:>8.2%}"
+              + (f"  (기타 오류 {r['errors']})" if r["errors"] else ""))
+        old = (baseline or {}).get("ops", {}).get(name)
+        if old:
+            print(f"{'  이전':<12}{old['ok']:>8,}{old['ops_per_s']:>9.1f}{old['p50_ms']:>9.2f}{old['p95_ms']:>9.2f}"
+                  f"{old['p99_ms']:>9.2f}{old['max_ms']:>9.2f}{old['locked']:>8,}{old['locked_rate']:>8.2%}")
+
+
+def count_rows(db_path: str, start_ids: dict) -> dict:
+    conn = sqlite3.connect(db_path)
+    try:
+        return {
+            "visit_logs": conn.execute("SELECT COUNT(*) FROM visit_logs WHERE id > ?",
+                                       (start_ids["visit_logs"],)).fetchone()[0],
+            "posts": conn.execute("SELECT COUNT(*) FROM posts WHERE id > ?", (start_ids["posts"],)).fetchone()[0],
+        }
+    finally:
+        conn.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--mode", choices=("thread", "process"), default="thread", help="세션을 스레드/프로세스로 실행")
+    ap.add_argument("--sessions", type=int, default=16, help="동시 세션 수")
+    ap.add_argument("--duration", type=float, default=10.0, help="세션별 실행 시간(초)")
+    ap.add_argument("--mix", default=DEFAULT_MIX, help=f"작업 비율 (기본 {DEFAULT_MIX})")
+    ap.add_argument("--think-ms", type=float, default=0.0, help="작업 사이 평균 대기 시간(ms), 0이면 쉬지 않음")
+    ap.add_argument("--visit-mode", choices=("direct", "queued"), default="direct",
+                    help="방문 로그를 바로 기록하거나(direct) 앱처럼 기록 큐에 넣음(queued)")
+    ap.add_argument("--db", default=str(SOURCE_DB), help="복사해서 사용할 원본 DB")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", help="결과를 JSON으로 저장")
+    ap.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    ap.add_argument("--keep", action="store_true", help="임시 DB를 지우지 않고 경로 출력")
+    args = ap.parse_args()
+
+    tmp = pathlib.Path(tempfile.mkdtemp(prefix="hnibr_load_"))
+    db_path = str(tmp / "게시판.db")
+    if pathlib.Path(args.db).exists():
+        shutil.copy2(args.db, db_path)
+
+    # 스키마 준비(이전 형식 이전·이번 달 파티션)는 측정 전에 한 번
+    analytics.DB_PATH = board.DB_PATH = pathlib.Path(db_path)
+    board._init_db().close()
+    conn = analytics.init_db()
+    start_ids = {
+        "visit_logs": conn.execute("SELECT COALESCE(MAX(id), 0) FROM visit_logs").fetchone()[0],
+        "posts": conn.execute("SELECT COALESCE(MAX(id), 0) FROM posts").fetchone()[0],
+    }
+    conn.close()
+
+    try:
+        merged, elapsed = run(args, db_path)
+        report = {
+            "config": {k: getattr(args, k) for k in ("mode", "sessions", "duration", "mix", "think_ms",
+                                                     "visit_mode", "seed")},
+            "elapsed_s": round(elapsed, 3),
+            "rows": count_rows(db_path, start_ids),
+            "ops": summarize(merged, elapsed),
+        }
+        baseline = json.loads(pathlib.Path(args.baseline).read_text(encoding="utf-8")) if args.baseline else None
+        print_report(report, baseline)
+        if args.json:
+            pathlib.Path(args.json).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+            print(f"결과 저장: {args.json}")
+    finally:
+        if args.keep:
+            print(f"임시 DB: {db_path}")
+        else:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
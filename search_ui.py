@@ -0,0 +1,41 @@
+# search_ui.py
+"""페이지 1~3 공용 검색 입력 (포함 검색 + 학명 오타 허용 검색)
+
+사이드바 위젯은 데이터 로드 전에 그리고(search_controls), 컬럼을 찾은 뒤 catalog 검색 조건
+튜플을 만든다(build_search). 검색 조건 튜플 형식은 catalog.NO_SEARCH 참고.
+"""
+import streamlit as st
+
+from catalog import NO_SEARCH, sci_name_index
+
+MAX_SUGGESTIONS = 10  # 캡션에 보여 줄 유사 학명 수
+
+
+def search_controls(label: str) -> tuple[str, bool, int]:
+    """사이드바 검색 위젯 → (검색어, 오타 허용 여부, 허용 편집거리)"""
+    search_kw  = st.sidebar.text_input(label, "")
+    fuzzy_mode = st.sidebar.checkbox("학명 오타 허용 검색", False,
+                                     help="철자가 조금 틀린 학명도 편집거리 기준으로 찾아줍니다.")
+    fuzzy_k    = st.sidebar.slider("허용 오타 수(편집거리)", 1, 4, 2, disabled=not fuzzy_mode)
+    return search_kw, fuzzy_mode, fuzzy_k
+
+
+def build_search(data_path: str, search_kw: str, cols: tuple, sci_col: str,
+                 fuzzy_mode: bool, fuzzy_k: int) -> tuple:
+    """검색 조건 튜플 (cols 전체에 부분일치, 오타 허용이면 BK-tree로 찾은 학명도 포함)
+
+    오타 허용 검색이면 찾은 유사 학명을 캡션으로 보여 준다.
+    """
+    kw = str(search_kw).strip()
+    if not kw:
+        return NO_SEARCH
+    fuzzy_names = ()
+    if fuzzy_mode:
+        hits = sci_name_index(data_path, sci_col).lookup(kw, fuzzy_k)
+        fuzzy_names = tuple(n for h in hits for n in h["학명"])
+        if hits:
+            st.caption("유사 학명: " + " · ".join(f"{h['학명'][0]} (오타 {h['거리']})"
+                                                for h in hits[:MAX_SUGGESTIONS]))
+        else:
+            st.caption(f"오타 {fuzzy_k}개 이내의 유사 학명이 없습니다.")
+    return (kw, tuple(cols), sci_col if fuzzy_mode else None, fuzzy_names)
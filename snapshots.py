@@ -0,0 +1,427 @@
+# snapshots.py
+"""소재 확보 리스트 릴리스(날짜별 스냅샷) 비교
+
+data/ 의 `<컬렉션>_<YYYYMMDD>.csv` 파일을 같은 컬렉션끼리 날짜순으로 묶고, 새 릴리스가 들어올 때(수집 시점)
+직전 릴리스와 비교한 변경분만 snapshots.db에 저장한다. 화면은 저장된 변경분만 읽는다.
+
+- 각 행은 (분류군, 국명, 학명, 분양가능여부) 튜플의 64비트 해시로 바꿔 해시별 개수(다중집합)로 비교
+- 릴리스마다 고유 튜플과 개수(snapshot_items)를 남겨 두므로, 다음 릴리스는 새 파일만 읽어 비교
+- 변경분: 추가 / 삭제 / 상태 변경(같은 (분류군, 국명, 학명)의 분양가능여부만 바뀐 것)
+
+보유 현황 추이는 컬렉션의 모든 릴리스를 스레드(또는 프로세스) 풀로 병렬로 읽어 릴리스 날짜 컬럼이 붙은
+하나의 표(holdings_table)로 합치고, 릴리스×분류군/학명별 건수를 한 번 계산해 캐시한다(holdings_counts).
+"""
+import datetime
+import hashlib
+import os
+import pathlib
+import re
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from cache_store import cached
+from catalog import CATALOG_FILES, _read_table, compact_frame
+
+DB_PATH = pathlib.Path("snapshots.db")
+DATA_DIR = pathlib.Path("data")
+RELEASE_RE = re.compile(r"^(?P<collection>.+)_(?P<release>\d{8})$")
+DIFF_KEY = ("분류군", "국명", "학명", "분양가능여부")
+IDENTITY = DIFF_KEY[:3]
+STATUS = DIFF_KEY[3]
+_DB_COLS = ("taxon", "korean_name", "sci_name", "status")  # DIFF_KEY 순서
+CHANGES = ("추가", "삭제", "상태 변경")
+
+
+def _init_db():
+    conn = sqlite3.connect(DB_PATH, isolation_level=None)
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS snapshot_releases (
+            collection  TEXT NOT NULL,
+            release     TEXT NOT NULL,
+            path        TEXT NOT NULL,
+            fingerprint TEXT NOT NULL,
+            rows        INTEGER NOT NULL,
+            items       INTEGER NOT NULL,
+            ingested_at TEXT NOT NULL,
+            PRIMARY KEY (collection, release)
+        );
+        CREATE TABLE IF NOT EXISTS snapshot_items (
+            collection  TEXT NOT NULL,
+            release     TEXT NOT NULL,
+            h           INTEGER NOT NULL,
+            taxon       TEXT NOT NULL,
+            korean_name TEXT NOT NULL,
+            sci_name    TEXT NOT NULL,
+            status      TEXT NOT NULL,
+            n           INTEGER NOT NULL,
+            PRIMARY KEY (collection, release, h)
+        );
+        CREATE TABLE IF NOT EXISTS snapshot_diffs (
+            collection   TEXT NOT NULL,
+            from_release TEXT NOT NULL,
+            to_release   TEXT NOT NULL,
+            added        INTEGER NOT NULL,
+            removed      INTEGER NOT NULL,
+            changed      INTEGER NOT NULL,
+            computed_at  TEXT NOT NULL,
+            PRIMARY KEY (collection, from_release, to_release)
+        );
+        CREATE TABLE IF NOT EXISTS snapshot_deltas (
+            collection   TEXT NOT NULL,
+            from_release TEXT NOT NULL,
+            to_release   TEXT NOT NULL,
+            change       TEXT NOT NULL,
+            taxon        TEXT NOT NULL,
+            korean_name  TEXT NOT NULL,
+            sci_name     TEXT NOT NULL,
+            old_status   TEXT,
+            new_status   TEXT,
+            n            INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS snapshot_deltas_pair ON snapshot_deltas(collection, from_release, to_release);
+        """
+    )
+    return conn
+
+
+# -----------------------------
+# 릴리스 찾기
+# -----------------------------
+def parse_release(path) -> tuple[str, str] | None:
+    """'..._20241217.csv' → (컬렉션, '2024-12-17'), 날짜 꼬리가 없으면 None"""
+    m = RELEASE_RE.match(pathlib.Path(path).stem)
+    if not m:
+        return None
+    try:
+        day = datetime.datetime.strptime(m["release"], "%Y%m%d").date()
+    except ValueError:
+        return None
+    return m["collection"].strip(), day.isoformat()
+
+
+def discover_releases(data_dir=DATA_DIR) -> dict[str, list[tuple[str, str]]]:
+    """{컬렉션: [(릴리스 날짜, 경로), ...] 날짜순}"""
+    found = {}
+    for p in sorted(pathlib.Path(data_dir).iterdir()):
+        if p.suffix.lower() not in (".csv", ".xlsx"):
+            continue
+        parsed = parse_release(p)
+        if parsed:
+            found.setdefault(parsed[0], []).append((parsed[1], p.as_posix()))
+    return {c: sorted(rs) for c, rs in found.items()}
+
+
+def collection_label(collection: str) -> str:
+    """CATALOG_FILES에 있는 컬렉션은 짧은 이름(예: '배양체 균류')으로 표시"""
+    for label, path in CATALOG_FILES.items():
+        parsed = parse_release(path)
+        if parsed and parsed[0] == collection:
+            return label
+    return collection
+
+
+def _fingerprint(path: str) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def release_signature(collection: str, data_dir=DATA_DIR) -> tuple:
+    """((릴리스, 경로, 수정시각, 크기), ...) — 캐시 키 (파일이 추가·변경되면 달라짐)"""
+    sig = []
+    for release, path in discover_releases(data_dir).get(collection, []):
+        st_ = os.stat(path)
+        sig.append((release, path, st_.st_mtime_ns, st_.st_size))
+    return tuple(sig)
+
+
+# -----------------------------
+# 병렬 로더
+# -----------------------------
+def key_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """비교 키 컬럼만 남기고 양끝 공백 제거·빈 값은 ''로 통일 (없는 컬럼은 '')"""
+    return pd.DataFrame({
+        c: (df[c].astype("string").fillna("").str.strip() if c in df.columns else pd.Series("", index=df.index))
+        for c in DIFF_KEY
+    }).astype(str)
+
+
+def _read_release(path: str) -> pd.DataFrame:
+    """릴리스 파일 하나 → 비교 키 컬럼 (프로세스 풀에서도 쓰도록 모듈 최상위 함수)"""
+    return key_frame(_read_table(path))
+
+
+def read_releases(paths, workers: int | None = None, processes: bool = False) -> list[pd.DataFrame]:
+    """릴리스 파일들을 병렬로 읽기 (기본 스레드 풀, processes=True면 프로세스 풀), 입력 순서대로 반환"""
+    paths = list(paths)
+    if len(paths) <= 1:
+        return [_read_release(p) for p in paths]
+    pool_cls = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with pool_cls(max_workers=workers or min(len(paths), os.cpu_count() or 4)) as pool:
+        return list(pool.map(_read_release, paths))
+
+
+@cached
+def holdings_table(collection: str, signature: tuple) -> pd.DataFrame:
+    """컬렉션의 모든 릴리스를 병렬로 읽어 합친 표: 릴리스(날짜) + 분류군·국명·학명·분양가능여부 (범주형)"""
+    frames = read_releases([path for _, path, *_ in signature])
+    df = pd.concat([f.assign(릴리스=release) for (release, *_), f in zip(signature, frames)], ignore_index=True)
+    df = compact_frame(df[["릴리스", *DIFF_KEY]])
+    df["릴리스"] = pd.to_datetime(df["릴리스"].astype(str))
+    return df
+
+
+@cached
+def holdings_counts(collection: str, signature: tuple, by: str) -> pd.DataFrame:
+    """릴리스 × by(분류군/국명/학명)별 보유 건수 (추이 차트용, 릴리스·항목 조합마다 한 행)"""
+    df = holdings_table(collection, signature)
+    counts = df.groupby(["릴리스", by], observed=True).size().rename("건수").reset_index()
+    counts[by] = counts[by].astype(str)
+    return counts
+
+
+# -----------------------------
+# 다중집합 · 비교
+# -----------------------------
+def _hash_keys(h: np.ndarray) -> np.ndarray:
+    """64비트 해시 → 16자리 16진 문자열 (인덱스 키용)
+
+    int64 해시를 그대로 인덱스로 쓰면 값이 두 개뿐일 때 RangeIndex 추론에서 뺄셈이 넘칠 수 있다.
+    """
+    return np.char.mod("%016x", np.asarray(h, dtype=np.int64).view(np.uint64))
+
+
+def _ident(items: pd.DataFrame) -> np.ndarray:
+    return pd.util.hash_pandas_object(items[list(IDENTITY)], index=False).to_numpy().view(np.int64)
+
+
+def release_items(df: pd.DataFrame) -> pd.DataFrame:
+    """행 → 고유 (분류군, 국명, 학명, 분양가능여부) 튜플별 개수
+
+    인덱스(key)는 튜플 해시 h의 16진 문자열, ident는 상태를 뺀 (분류군, 국명, 학명) 해시.
+    비교 전 양끝 공백 제거·빈 값은 ''로 통일. 없는 컬럼은 ''로 채운다.
+    """
+    keys = key_frame(df)
+    h = pd.util.hash_pandas_object(keys, index=False).to_numpy().view(np.int64)
+    uniq, first, counts = np.unique(h, return_index=True, return_counts=True)
+    items = keys.iloc[first].assign(h=uniq, n=counts)
+    items.index = pd.Index(_hash_keys(uniq), name="key")
+    items["ident"] = _ident(items)
+    return items
+
+
+def diff_items(old: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    """두 릴리스의 튜플 다중집합 차이 → 변경분 (change, 분류군, 국명, 학명, 이전 상태, 새 상태, n)
+
+    해시별 개수 차이가 +면 추가, -면 삭제. 같은 (분류군, 국명, 학명)에서 삭제된 상태와 추가된 상태가
+    함께 있으면 겹치는 개수만큼 '상태 변경'으로 묶는다.
+    """
+    both = old[["n"]].join(new[["n"]], how="outer", lsuffix="_old", rsuffix="_new").fillna(0)
+    d = (both["n_new"] - both["n_old"]).astype(np.int64)
+    d = d[d != 0]
+    meta = pd.concat([new.drop(columns="n"), old.drop(columns="n")])
+    meta = meta[~meta.index.duplicated()].reindex(d.index)
+    added = meta[d > 0].assign(n=d[d > 0])
+    removed = meta[d < 0].assign(n=-d[d < 0])
+
+    records = []
+    common = set(added["ident"]) & set(removed["ident"])
+    if common:
+        add_left = added["n"].to_dict()
+        rem_left = removed["n"].to_dict()
+        pairs = removed[removed["ident"].isin(common)].reset_index().merge(
+            added[added["ident"].isin(common)].reset_index(), on="ident", suffixes=("_r", "_a"))
+        for p in pairs.itertuples(index=False):
+            k = min(rem_left[p.key_r], add_left[p.key_a])
+            if k <= 0:
+                continue
+            rem_left[p.key_r] -= k
+            add_left[p.key_a] -= k
+            records.append(("상태 변경", getattr(p, "분류군_a"), getattr(p, "국명_a"), getattr(p, "학명_a"),
+                            getattr(p, f"{STATUS}_r"), getattr(p, f"{STATUS}_a"), k))
+        added = added.assign(n=[add_left[k] for k in added.index]).query("n > 0")
+        removed = removed.assign(n=[rem_left[k] for k in removed.index]).query("n > 0")
+
+    for change, part, old_col, new_col in (("추가", added, None, STATUS), ("삭제", removed, STATUS, None)):
+        for r in part.itertuples(index=False):
+            rd = r._asdict()
+            records.append((change, rd["분류군"], rd["국명"], rd["학명"],
+                            rd[old_col] if old_col else None, rd[new_col] if new_col else None, int(rd["n"])))
+    out = pd.DataFrame(records, columns=["변경", *IDENTITY, "이전 상태", "새 상태", "건수"])
+    out["변경"] = pd.Categorical(out["변경"], categories=CHANGES)
+    return out.sort_values(["변경", *IDENTITY], ignore_index=True)
+
+
+# -----------------------------
+# 수집 (새 릴리스만 읽어 저장)
+# -----------------------------
+def _store_items(conn, collection, release, path, fingerprint, n_rows, items):
+    conn.execute("DELETE FROM snapshot_items WHERE collection = ? AND release = ?", (collection, release))
+    conn.executemany(
+        f"INSERT INTO snapshot_items (collection, release, h, {', '.join(_DB_COLS)}, n) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [(collection, release, int(h), *vals, int(n))
+         for h, *vals, n in items[["h", *DIFF_KEY, "n"]].itertuples(index=False, name=None)],
+    )
+    conn.execute(
+        "INSERT OR REPLACE INTO snapshot_releases VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (collection, release, path, fingerprint, n_rows, len(items), datetime.datetime.now().isoformat()),
+    )
+    # 이 릴리스가 바뀌었으면 관련 비교 결과는 다시 계산
+    for table in ("snapshot_diffs", "snapshot_deltas"):
+        conn.execute(f"DELETE FROM {table} WHERE collection = ? AND ? IN (from_release, to_release)",
+                     (collection, release))
+
+
+def _load_items(conn, collection, release) -> pd.DataFrame:
+    items = pd.read_sql_query(
+        f"SELECT h, {', '.join(f'{c} AS {k}' for c, k in zip(_DB_COLS, DIFF_KEY))}, n "
+        "FROM snapshot_items WHERE collection = ? AND release = ?",
+        conn, params=(collection, release),
+    )
+    items.index = pd.Index(_hash_keys(items["h"].to_numpy()), name="key")
+    items["ident"] = _ident(items)
+    return items
+
+
+def _store_diff(conn, collection, from_release, to_release, delta: pd.DataFrame):
+    counts = delta.groupby("변경", observed=False)["건수"].sum()
+    conn.execute(
+        "INSERT OR REPLACE INTO snapshot_diffs VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (collection, from_release, to_release, int(counts["추가"]), int(counts["삭제"]), int(counts["상태 변경"]),
+         datetime.datetime.now().isoformat()),
+    )
+    conn.executemany(
+        "INSERT INTO snapshot_deltas VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [(collection, from_release, to_release, str(c), t, k, s, o, nw, int(n))
+         for c, t, k, s, o, nw, n in delta.itertuples(index=False, name=None)],
+    )
+
+
+def ingest_releases(data_dir=DATA_DIR) -> list[dict]:
+    """새로 들어왔거나 내용이 바뀐 릴리스만 읽어 저장하고, 비어 있는 연속 릴리스 쌍의 변경분을 계산
+
+    파일이 없어진 릴리스는 지우고, 그 앞뒤 릴리스를 새 연속 쌍으로 다시 비교한다.
+
+    반환: 이번에 새로 계산한 비교 목록 [{collection, from, to, 추가, 삭제, 상태 변경}, ...]
+    """
+    conn = _init_db()
+    done = []
+    try:
+        known = {(c, r): fp for c, r, fp in conn.execute(
+            "SELECT collection, release, fingerprint FROM snapshot_releases")}
+        found = discover_releases(data_dir)
+        # data/ 에서 파일이 사라진 릴리스는 튜플과 관련 비교 결과까지 삭제
+        gone = set(known) - {(c, r) for c, releases in found.items() for r, _ in releases}
+        if gone:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for collection, release in gone:
+                    for table in ("snapshot_releases", "snapshot_items"):
+                        conn.execute(f"DELETE FROM {table} WHERE collection = ? AND release = ?",
+                                     (collection, release))
+                    for table in ("snapshot_diffs", "snapshot_deltas"):
+                        conn.execute(f"DELETE FROM {table} WHERE collection = ? AND ? IN (from_release, to_release)",
+                                     (collection, release))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        for collection, releases in found.items():
+            fps = {path: _fingerprint(path) for _, path in releases}
+            pending = [(r, p) for r, p in releases if known.get((collection, r)) != fps[p]]
+            frames = read_releases([p for _, p in pending])  # 새 릴리스만 병렬로 읽음
+            for (release, path), keys in zip(pending, frames):
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    _store_items(conn, collection, release, path, fps[path], len(keys), release_items(keys))
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+
+            # 연속한 릴리스 쌍만 비교 (중간 릴리스가 나중에 들어오면 건너뛰던 쌍은 삭제)
+            dates = [r for r, _ in releases]
+            pairs = set(zip(dates, dates[1:]))
+            stored = set(conn.execute("SELECT from_release, to_release FROM snapshot_diffs WHERE collection = ?",
+                                      (collection,)).fetchall())
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for pair in stored - pairs:
+                    for table in ("snapshot_diffs", "snapshot_deltas"):
+                        conn.execute(f"DELETE FROM {table} WHERE collection = ? AND from_release = ? "
+                                     "AND to_release = ?", (collection, *pair))
+                for a, b in sorted(pairs - stored):
+                    delta = diff_items(_load_items(conn, collection, a), _load_items(conn, collection, b))
+                    _store_diff(conn, collection, a, b, delta)
+                    counts = delta.groupby("변경", observed=False)["건수"].sum().to_dict()
+                    done.append({"collection": collection, "from": a, "to": b, **counts})
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+    finally:
+        conn.close()
+    return done
+
+
+# -----------------------------
+# 조회 (저장된 변경분만 읽음)
+# -----------------------------
+@st.cache_data(ttl=300, show_spinner=False)
+def refresh_snapshots() -> int:
+    """페이지에서 호출: 5분에 한 번 data/ 의 새 릴리스를 수집 (새로 계산한 비교 수 반환)"""
+    return len(ingest_releases())
+
+
+def release_history(collection: str) -> pd.DataFrame:
+    """컬렉션의 릴리스 목록과 직전 릴리스 대비 변경 건수"""
+    conn = _init_db()
+    try:
+        df = pd.read_sql_query(
+            """
+            SELECT r.release AS 릴리스, r.rows AS 행수, r.items AS "고유 튜플",
+                   d.from_release AS "이전 릴리스", d.added AS 추가, d.removed AS 삭제, d.changed AS "상태 변경"
+            FROM snapshot_releases r
+            LEFT JOIN snapshot_diffs d ON d.collection = r.collection AND d.to_release = r.release
+            WHERE r.collection = ?
+            ORDER BY r.release
+            """,
+            conn,
+            params=(collection,),
+        )
+    finally:
+        conn.close()
+    return df.astype({c: "Int64" for c in ("추가", "삭제", "상태 변경")})  # 첫 릴리스는 비교 대상 없음(<NA>)
+
+
+def release_deltas(collection: str, from_release: str, to_release: str) -> pd.DataFrame:
+    """두 연속 릴리스 사이의 변경분"""
+    conn = _init_db()
+    try:
+        return pd.read_sql_query(
+            """
+            SELECT change AS 변경, taxon AS 분류군, korean_name AS 국명, sci_name AS 학명,
+                   old_status AS "이전 상태", new_status AS "새 상태", n AS 건수
+            FROM snapshot_deltas WHERE collection = ? AND from_release = ? AND to_release = ?
+            ORDER BY CASE change WHEN '추가' THEN 0 WHEN '삭제' THEN 1 ELSE 2 END, taxon, korean_name, sci_name
+            """,
+            conn,
+            params=(collection, from_release, to_release),
+        )
+    finally:
+        conn.close()
+
+
+def collections() -> list[str]:
+    conn = _init_db()
+    try:
+        return [r[0] for r in conn.execute("SELECT DISTINCT collection FROM snapshot_releases ORDER BY 1")]
+    finally:
+        conn.close()
@@ -0,0 +1,8 @@
+# tests/conftest.py
+"""저장소 루트의 모듈(catalog, snapshots 등)을 tests/ 에서 바로 import 하도록 경로 추가"""
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
@@ -0,0 +1,75 @@
+# tests/test_board.py
+"""board: 관리자 일괄 처리(apply_changes)와 편집기 변경분 변환(editor_changes), 임시 DB 사용"""
+import pytest
+
+import board
+
+
+@pytest.fixture(autouse=True)
+def temp_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(board, "DB_PATH", tmp_path / "게시판.db")
+
+
+def _posts():
+    return board.list_posts(100, 0).set_index("번호")
+
+
+def _editor(shown, edited_rows):
+    """편집기에서 바꾼 행만 반영한 apply_changes 결과"""
+    return board.apply_changes(*board.editor_changes(shown, edited_rows))
+
+
+def test_mixed_status_and_delete_batch():
+    ids = [board.add_post(f"작성자{i}", f"제목{i}", "내용") for i in range(4)]
+    board.add_comment(ids[1], "방문자", "댓글")
+    shown = board.list_posts(100, 0)  # 최신 글부터: ids[3], ids[2], ids[1], ids[0]
+
+    result = _editor(shown, {
+        0: {"상태": "답변완료"},               # ids[3] 상태 변경
+        2: {"선택": True},                     # ids[1] 삭제 (댓글도 함께)
+        3: {"상태": "답변완료", "선택": True},  # ids[0] 변경 + 삭제 → 삭제만
+    })
+    assert result == {"updated": 1, "deleted": 2, "conflicts": []}
+
+    posts = _posts()
+    assert sorted(posts.index) == [ids[2], ids[3]]
+    assert posts.loc[ids[3], "상태"] == "답변완료"
+    assert posts.loc[ids[3], "버전"] == shown.set_index("번호").loc[ids[3], "버전"] + 1
+    assert posts.loc[ids[2], "상태"] == "답변대기"
+    assert board.list_comments(ids[1]).empty
+
+
+def test_stale_version_is_reported_not_overwritten():
+    a, b = board.add_post("가", "제목A", "내용"), board.add_post("나", "제목B", "내용")
+    shown = board.list_posts(100, 0)  # 관리자 1이 읽어 둔 목록
+
+    # 관리자 2가 먼저 a에 답변 등록 (상태·버전 변경)
+    board.add_comment(a, "관리자", "답변", is_answer=True)
+
+    row = {pid: pos for pos, pid in enumerate(shown["번호"])}
+    result = _editor(shown, {row[a]: {"상태": "답변완료"}, row[b]: {"선택": True}})
+    assert result == {"updated": 0, "deleted": 1, "conflicts": [a]}
+    posts = _posts()
+    assert list(posts.index) == [a]
+    assert posts.loc[a, "버전"] == shown.set_index("번호").loc[a, "버전"] + 1  # 답변 등록분만 반영
+
+
+def test_already_deleted_post_is_a_conflict():
+    a = board.add_post("가", "제목", "내용")
+    shown = board.list_posts(100, 0)
+    assert _editor(shown, {0: {"선택": True}}) == {"updated": 0, "deleted": 1, "conflicts": []}
+    assert _editor(shown, {0: {"상태": "답변완료"}}) == {"updated": 0, "deleted": 0, "conflicts": [a]}
+
+
+def test_editor_changes_skips_unchanged_status():
+    board.add_post("가", "제목", "내용")
+    shown = board.list_posts(100, 0)
+    status, deletes = board.editor_changes(shown, {0: {"상태": "답변대기"}})
+    assert (status, deletes) == ({}, {})
+    assert board.apply_changes(status, deletes) == {"updated": 0, "deleted": 0, "conflicts": []}
+
+
+def test_unknown_status_is_rejected():
+    a = board.add_post("가", "제목", "내용")
+    with pytest.raises(ValueError):
+        board.apply_changes({a: ("보류", 0)}, {})
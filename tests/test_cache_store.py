@@ -0,0 +1,117 @@
+# tests/test_cache_store.py
+"""cache_store: 공유 버퍼 사용량, 경로 인자·코드 지문 키, disk 캐시 정리, 키별 잠금"""
+import importlib
+import os
+import time
+
+import pandas as pd
+import pytest
+
+import cache_store
+from cache_store import DiskStore, ResidentSet, cached, frame_buffers, make_key
+
+
+def _frame(n=1000):
+    return pd.DataFrame({"a": range(n), "b": [f"이름{i % 7}" for i in range(n)]})
+
+
+def test_shared_columns_are_counted_once():
+    base = _frame()
+    derived = base.assign(c=base["a"] * 2)  # a·b 컬럼 버퍼를 base와 공유
+    res = ResidentSet(budget_bytes=10**9)
+    res.put("base", base, frame_buffers(base))
+    res.put("derived", derived, frame_buffers(derived))
+    assert res.used == sum((frame_buffers(base) | frame_buffers(derived)).values())
+    assert res.used < sum(frame_buffers(base).values()) + sum(frame_buffers(derived).values())
+
+    # 공유 버퍼는 마지막 항목이 나갈 때만 빠짐
+    res.budget = sum(frame_buffers(derived).values())
+    res.put("other", derived.copy(), frame_buffers(derived.copy()))
+    assert res.evictions >= 1
+    remaining = {}
+    for e in res._entries.values():
+        remaining |= e["buffers"]
+    assert res.used == sum(remaining.values())
+
+
+def test_replacing_entry_keeps_accounting():
+    df = _frame()
+    res = ResidentSet(budget_bytes=10**9)
+    res.put("k", df, frame_buffers(df))
+    res.put("k", df, frame_buffers(df))
+    assert len(res) == 1
+    assert res.used == sum(frame_buffers(df).values())
+
+
+def test_only_declared_path_args_are_stamped(tmp_path, monkeypatch):
+    data = tmp_path / "data.csv"
+    data.write_text("a\n1\n")
+
+    def fn(path_str, query):
+        return None
+
+    stats = []
+    real_stat = os.stat
+    monkeypatch.setattr(cache_store.os, "stat", lambda p, *a, **k: stats.append(str(p)) or real_stat(p, *a, **k))
+    k1 = make_key(fn, (str(data), str(data)), path_positions=(0,))
+    assert stats == [str(data)]
+
+    data.write_text("a\n1\n2\n")  # 경로 인자 파일이 바뀌면 새 키
+    assert make_key(fn, (str(data), str(data)), path_positions=(0,)) != k1
+
+
+def test_cached_rejects_unknown_path_arg():
+    with pytest.raises(ValueError):
+        cached(paths=("missing",))(lambda path_str: None)
+
+
+def test_disk_prune_removes_stale_refs_and_unreferenced_objects(tmp_path):
+    store = DiskStore(tmp_path, budget_bytes=10**9, max_age_s=3600)
+    store.put("keep", _frame(10))
+    store.put("stale", _frame(20))
+    store.put("shared", _frame(10))  # keep과 같은 내용 → 같은 object
+
+    now = time.time() + 2 * 3600  # 두 시간 뒤: 유예 시간도 지남
+    os.utime(tmp_path / "refs" / "keep", (now, now))
+    os.utime(tmp_path / "refs" / "shared", (now, now))
+    removed = store.prune(now=now)
+
+    assert removed["refs"] == 1 and removed["objects"] == 1
+    assert sorted(p.name for p in (tmp_path / "refs").iterdir()) == ["keep", "shared"]
+    assert len(list((tmp_path / "objects").glob("*/*.arrow"))) == 1
+    store.resident = ResidentSet(10**9)  # 매핑 캐시를 비우고 디스크에서 다시 읽기
+    assert store.get("keep") is not None and store.get("stale") is None
+
+
+def test_disk_prune_keeps_recent_unreferenced_objects(tmp_path):
+    store = DiskStore(tmp_path, budget_bytes=10**9)
+    store.put("k", _frame(10))
+    (tmp_path / "refs" / "k").unlink()
+    assert store.prune()["objects"] == 0  # 방금 쓴 object (put 진행 중일 수 있음)
+
+
+def test_key_follows_module_constants(tmp_path, monkeypatch):
+    """바이트코드가 같아도 모듈 상수가 바뀌면 새 키 (disk 캐시는 배포 후에도 남으므로)"""
+    mod = tmp_path / "cache_mod.py"
+    mod.write_text("LIMIT = 1\n\ndef fn(x):\n    return LIMIT\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    m = importlib.import_module("cache_mod")
+    k1 = make_key(m.fn, (1,))
+
+    mod.write_text("LIMIT = 2\n\ndef fn(x):\n    return LIMIT\n")
+    m = importlib.reload(m)
+    assert make_key(m.fn, (1,)) != k1
+
+    k2 = make_key(m.fn, (1,))
+    monkeypatch.setattr(cache_store, "CACHE_SCHEMA", cache_store.CACHE_SCHEMA + 1)
+    cache_store.code_fingerprint.cache_clear()
+    assert make_key(m.fn, (1,)) != k2
+    cache_store.code_fingerprint.cache_clear()
+
+
+def test_key_locks_do_not_accumulate(tmp_path):
+    store = DiskStore(tmp_path, budget_bytes=10**9)
+    for i in range(20):
+        with store.lock(f"k{i}"):
+            assert len(store._thread_locks) == 1
+    assert len(store._thread_locks) == 0
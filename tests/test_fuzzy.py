@@ -0,0 +1,69 @@
+# tests/test_fuzzy.py
+"""fuzzy: 비트 병렬 편집거리와 BK-tree 검색을 단순 DP·전수 비교와 대조"""
+import random
+
+import pytest
+
+from fuzzy import BKTree, NameIndex, levenshtein
+
+
+def _dp(a: str, b: str) -> int:
+    """교과서 DP 편집거리 (기준값)"""
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+def _random_word(rng, n, alphabet="abcde "):
+    return "".join(rng.choice(alphabet) for _ in range(n))
+
+
+@pytest.mark.parametrize("a, b", [
+    ("", ""), ("", "abc"), ("abc", ""), ("a", "a"), ("a", "b"),
+    ("kitten", "sitting"), ("flaw", "lawn"), ("abc", "cba"),
+    ("a" * 64, "a" * 63 + "b"), ("a" * 65, "b" * 65), ("x" * 70, "x" * 64),
+])
+def test_levenshtein_known_pairs(a, b):
+    assert levenshtein(a, b) == _dp(a, b)
+    assert levenshtein(b, a) == _dp(a, b)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_levenshtein_matches_dp(seed):
+    """짧은 문자열부터 64자(기계어 한 단어)를 넘는 문자열까지"""
+    rng = random.Random(seed)
+    for _ in range(50):
+        a = _random_word(rng, rng.randrange(0, 90))
+        b = _random_word(rng, rng.randrange(0, 90))
+        assert levenshtein(a, b) == _dp(a, b), (a, b)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_bktree_matches_brute_force(seed):
+    rng = random.Random(seed)
+    words = {_random_word(rng, rng.randrange(0, 12), "abcd") for _ in range(300)}
+    words |= {_random_word(rng, rng.randrange(60, 80), "ab") for _ in range(20)}
+    tree = BKTree(sorted(words))
+    assert tree.size == len(words)
+    queries = [""] + [_random_word(rng, rng.randrange(0, 12), "abcd") for _ in range(30)]
+    queries += [_random_word(rng, 70, "ab") for _ in range(5)]
+    for q in queries:
+        dists = sorted((_dp(q, w), w) for w in words)
+        for k in (0, 1, 2, 3):
+            assert tree.search(q, k) == [(d, w) for d, w in dists if d <= k], (q, k)
+
+
+def test_empty_tree():
+    assert BKTree().search("abc", 2) == []
+
+
+def test_name_index_ignores_author_and_case():
+    index = NameIndex(["Aspergillus niger Tiegh.", "aspergillus niger", "Penicillium notatum", None, "nan"])
+    hits = index.lookup("Aspergilus nigr", k=2)
+    assert [(h["거리"], h["학명키"]) for h in hits] == [(2, "aspergillus niger")]
+    assert hits[0]["학명"] == ["Aspergillus niger Tiegh.", "aspergillus niger"]
+    assert index.lookup("", k=2) == []
@@ -0,0 +1,81 @@
+# tests/test_snapshots.py
+"""snapshots: 릴리스 간 추가·삭제·상태 변경 계산(diff_items)과 수집(ingest_releases)"""
+import random
+
+import pandas as pd
+import pytest
+
+import snapshots
+from snapshots import diff_items, release_items
+
+
+def _release(rows):
+    return release_items(pd.DataFrame(rows, columns=["분류군", "국명", "학명", "분양가능여부"]))
+
+
+def _changes(out):
+    cols = ["변경", "학명", "이전 상태", "새 상태", "건수"]
+    return {tuple(None if pd.isna(v) else v for v in row) for row in out[cols].itertuples(index=False)}
+
+
+@pytest.mark.parametrize("seed", range(50))
+@pytest.mark.parametrize("k", [1, 2])
+def test_status_change_with_addition(seed, k):
+    """상태 변경 + 추가가 함께 있는 릴리스 (해시 값에 따라 예전 구현은 약 절반 확률로 실패)"""
+    rng = random.Random(seed)
+    names = [f"Genus{rng.randrange(10**6)} species{i}" for i in range(5)]
+    old = [("균류", "", n, "가능") for n in names[:3]] * k
+    new = ([("균류", "", names[0], "불가능")] * k + [("균류", "", n, "가능") for n in names[1:3]] * k
+           + [("균류", "", names[3], "가능")])
+    out = diff_items(_release(old), _release(new))
+    assert _changes(out) == {
+        ("상태 변경", names[0], "가능", "불가능", k),
+        ("추가", names[3], None, "가능", 1),
+    }
+
+
+def test_partial_status_change_leaves_remainder():
+    """3건 중 2건만 상태가 바뀌고 1건은 삭제된 경우"""
+    old = [("균류", "", "Aspergillus niger", "가능")] * 3
+    new = [("균류", "", "Aspergillus niger", "불가능")] * 2
+    out = diff_items(_release(old), _release(new))
+    assert _changes(out) == {
+        ("상태 변경", "Aspergillus niger", "가능", "불가능", 2),
+        ("삭제", "Aspergillus niger", "가능", None, 1),
+    }
+
+
+def test_identical_releases_have_no_changes():
+    rows = [("균류", "", "Aspergillus niger", "가능"), ("세균류", "", "Bacillus subtilis", "가능")]
+    assert diff_items(_release(rows), _release(rows)).empty
+
+
+def test_two_distinct_tuples():
+    """고유 튜플이 딱 두 개인 릴리스 (정수 해시 인덱스는 RangeIndex 추론에서 넘쳤음)"""
+    old = _release([("B", "", "S3", "가능"), ("A", "x", "S3", "가능")])
+    assert len(old) == 2 and list(old["n"]) == [1, 1]
+    new = _release([("B", "", "S3", "불가능"), ("A", "x", "S3", "가능")])
+    assert _changes(diff_items(old, new)) == {("상태 변경", "S3", "가능", "불가능", 1)}
+
+
+def test_ingest_drops_removed_releases(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshots, "DB_PATH", tmp_path / "snapshots.db")
+    data = tmp_path / "data"
+    data.mkdir()
+    for day, names in (("20240101", "ab"), ("20240201", "abc"), ("20240301", "abcd")):
+        pd.DataFrame({"분류군": "균류", "국명": "", "학명": list(names), "분양가능여부": "가능"}).to_csv(
+            data / f"균주_{day}.csv", index=False)
+    snapshots.ingest_releases(data)
+    assert list(snapshots.release_history("균주")["릴리스"]) == ["2024-01-01", "2024-02-01", "2024-03-01"]
+
+    (data / "균주_20240201.csv").unlink()
+    done = snapshots.ingest_releases(data)
+    assert [(d["from"], d["to"], d["추가"]) for d in done] == [("2024-01-01", "2024-03-01", 2)]
+    history = snapshots.release_history("균주")
+    assert list(history["릴리스"]) == ["2024-01-01", "2024-03-01"]
+    assert list(history["이전 릴리스"].fillna("")) == ["", "2024-01-01"]
+
+    for p in data.iterdir():
+        p.unlink()
+    snapshots.ingest_releases(data)
+    assert snapshots.collections() == []
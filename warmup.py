@@ -0,0 +1,148 @@
+# warmup.py
+"""서버 프로세스 시작 시 캐시 예열 (백그라운드 스레드 풀)
+
+프로세스에서 처음 실행되는 페이지가 start_warmup()을 호출하면, data/ 의 모든 데이터를
+읽고 학명 색인과 데이터 품질 점검, 페이지 1~3 기본 보기의 집계·차트 명세, 지역별 어린이집·보육교사 큐브, 관리자 대시보드 집계를 미리
+계산해 둔다. 데이터 로드·전처리·집계·품질 점검은 cache_store(프로세스 메모리, DASHBOARD_CACHE_DIR를
+지정하면 공유 디스크)에, 학명 색인·차트 명세·큐브·관리자 집계는 Streamlit 캐시에 남으므로 이후 방문자는
+첫 요청부터 캐시를 그대로 사용한다. 보기 정의와 표시 옵션 기본값은 페이지와 같은 catalog.CATALOG_VIEWS를 쓴다.
+진행 상황은 WarmupStatus로 확인한다.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import streamlit as st
+
+from analytics import log_date_range
+from catalog import (CATALOG_FILES, CATALOG_VIEWS, DEFAULT_STYLE, DEFAULT_TOP_N, NO_SEARCH, count_by, cross_counts,
+                     cross_pairs, load_table, sci_name_index)
+from charts import bar_chart_spec, cross_heat_spec
+from metrics import start_exporter
+from quality import quality_report
+from regional import CHILDCARE_FILES, TEACHER_FILE, load_childcare_cube, load_teacher_cube
+from rollups import hourly_heatmap, session_report, update_rollups, visit_rollups
+from snapshots import (collection_label, discover_releases, holdings_counts, refresh_snapshots,
+                       release_signature)
+
+DATA_DIR = Path("data")
+THREAD_PREFIX = "warmup"
+
+_log = logging.getLogger(__name__)
+
+
+class _QuietWarmupThreads(logging.Filter):
+    """예열 스레드에는 ScriptRunContext가 없으므로 관련 경고를 숨김"""
+
+    def filter(self, record):
+        return not threading.current_thread().name.startswith(THREAD_PREFIX)
+
+
+logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(_QuietWarmupThreads())
+
+
+class WarmupStatus:
+    """예열 작업별 상태 (대기 → 실행 → 완료/실패)와 소요 시간"""
+
+    def __init__(self, names):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.finished_at = None
+        self.tasks = {n: {"상태": "대기", "소요(초)": None, "오류": ""} for n in names}
+
+    def _update(self, name, **fields):
+        with self._lock:
+            self.tasks[name].update(fields)
+            if self.finished_at is None and all(t["상태"] in ("완료", "실패") for t in self.tasks.values()):
+                self.finished_at = time.time()
+
+    @property
+    def ready(self) -> bool:
+        return self.finished_at is not None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.time()) - self.started_at
+
+    def rows(self) -> list[dict]:
+        with self._lock:
+            return [{"작업": n, **t} for n, t in self.tasks.items()]
+
+
+def _warm_catalog(name):
+    path = CATALOG_FILES[name]
+    view = CATALOG_VIEWS[name]
+    clean_cols = view["clean"]  # 기본 데이터 파일은 표준 컬럼 이름을 그대로 씀
+    load_table(path)
+    sci_name_index(path, "학명")
+    quality_report(path)
+    for col in view["counts"]:
+        cnt, _ = count_by(path, clean_cols, NO_SEARCH, col)
+        for pct in (False, True):
+            bar_chart_spec(cnt, col, "건수", top=DEFAULT_TOP_N, pct=pct, **DEFAULT_STYLE)
+    for (row_col, col_col), (pairs, opts) in view["crosses"].items():
+        cross = cross_counts(path, clean_cols, NO_SEARCH, (row_col, col_col)).head(cross_pairs(pairs, DEFAULT_TOP_N))
+        cross_heat_spec(cross, row_col, col_col, label_font=DEFAULT_STYLE["label_font"],
+                        bar_size=DEFAULT_STYLE["bar_size"], **opts)
+
+
+def _warm_holdings(collection):
+    sig = release_signature(collection)
+    for by in ("분류군", "학명"):
+        holdings_counts(collection, sig, by)
+
+
+def _warm_admin():
+    update_rollups()  # 프로세스 시작 전에 쌓인 로그를 집계 테이블에 반영
+    first, last = log_date_range()
+    if first is not None:
+        visit_rollups(first, last)
+        session_report(first, last)
+        hourly_heatmap(first, last)
+
+
+def _build_tasks() -> dict:
+    tasks = {}
+    known_paths = set(CATALOG_FILES.values()) | set(CHILDCARE_FILES.values()) | {TEACHER_FILE}
+    for p in sorted(DATA_DIR.glob("*.csv")):
+        if str(p.as_posix()) not in known_paths:
+            tasks[f"데이터 로드: {p.name}"] = (load_table, (p.as_posix(),))
+    for name in CATALOG_VIEWS:
+        tasks[f"기본 보기: {name}"] = (_warm_catalog, (name,))
+    tasks["지역별 어린이집 큐브"] = (load_childcare_cube, ())
+    tasks["보육교사 자격급수 큐브"] = (load_teacher_cube, ())
+    tasks["소재 리스트 변경 이력 수집"] = (refresh_snapshots, ())
+    for collection in discover_releases():
+        tasks[f"보유 현황 추이: {collection_label(collection)}"] = (_warm_holdings, (collection,))
+    tasks["관리자 대시보드 집계"] = (_warm_admin, ())
+    return tasks
+
+
+def _run(status, name, fn, args):
+    status._update(name, 상태="실행")
+    t0 = time.perf_counter()
+    try:
+        fn(*args)
+        status._update(name, 상태="완료", **{"소요(초)": round(time.perf_counter() - t0, 3)})
+    except Exception as e:  # 예열 실패는 첫 방문 시 다시 계산되므로 기록만 남김
+        status._update(name, 상태="실패", 오류=str(e), **{"소요(초)": round(time.perf_counter() - t0, 3)})
+    if status.ready:
+        _log.info("cache warm-up finished in %.2fs", status.elapsed)
+
+
+@st.cache_resource(show_spinner=False)
+def start_warmup(max_workers: int = 4) -> WarmupStatus:
+    """프로세스당 한 번 예열을 시작하고 상태 객체를 반환 (이후 호출은 같은 객체)
+
+    DASHBOARD_METRICS_PORT가 설정되어 있으면 지표 엔드포인트도 이때 함께 시작한다.
+    """
+    start_exporter()
+    tasks = _build_tasks()
+    status = WarmupStatus(tasks)
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=THREAD_PREFIX)
+    for name, (fn, args) in tasks.items():
+        pool.submit(_run, status, name, fn, args)
+    pool.shutdown(wait=False)
+    return status
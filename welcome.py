@@ -1,8 +1,11 @@
 import streamlit as st
 from analytics import log_visit
+from warmup import start_warmup
+from metrics import end_render
 
 st.set_page_config(page_title="DNA의 정원: 생명의 코드 수집기록", page_icon="📰", layout="wide")
 log_visit("홈")
+start_warmup()  # 프로세스 첫 실행 시 백그라운드 캐시 예열
 
 # ─────────────────────────────
 # 헤더
@@ -158,3 +161,5 @@ st.write("-" * 50)
 # - 로컬 이미지 사용 시: 앱 루트에 /images 배치 + 상대경로 사용
 # - 외부 이미지 사용 시: 저작권 및 출처 표기 필수
 # ─────────────────────────────
+
+end_render()  # 페이지 실행 시간 기록 (metrics)